@@ -0,0 +1,193 @@
+import os
+import json
+import asyncio
+import threading
+import requests
+from requests.structures import CaseInsensitiveDict
+from api_clients.circuit_breaker import CircuitOpenError, breaker_for_url
+from api_clients.http_cache import get_default_http_cache
+from api_clients.rate_limiter import RateLimitedError, limiter_for_url
+
+
+class AsyncResponse:
+    """Fully-read response with the parts of requests.Response the clients use"""
+
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class AsyncHTTPTransport:
+    """Shared aiohttp transport with per-host keep-alive connection pools"""
+
+    def __init__(self, limit=100, limit_per_host=10, connect_timeout=3.05, read_timeout=10, cache=None, max_rate_wait=10):
+        """
+        Args:
+            limit (int): Maximum open connections in total
+            limit_per_host (int): Maximum keep-alive connections per host
+            connect_timeout (float): Seconds to wait for a connection
+            read_timeout (float): Seconds to wait for response data
+            cache (HTTPCache): Optional response cache for the providers it handles
+            max_rate_wait (float): Longest wait for a provider's rate limiter before
+                failing with RateLimitedError
+        """
+        self.cache = cache
+        self.max_rate_wait = max_rate_wait
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+
+        # aiohttp sessions are bound to an event loop, so keep one per loop
+        self._sessions = {}
+
+    @classmethod
+    def from_env(cls):
+        """Build a transport configured from HTTP_* environment variables"""
+        return cls(
+            limit_per_host=int(os.getenv('HTTP_POOL_MAXSIZE', 10)),
+            connect_timeout=float(os.getenv('HTTP_CONNECT_TIMEOUT', 3.05)),
+            read_timeout=float(os.getenv('HTTP_READ_TIMEOUT', 10)),
+            cache=get_default_http_cache(),
+            max_rate_wait=float(os.getenv('HTTP_RATE_LIMIT_WAIT', 10))
+        )
+
+    def _get_session(self):
+        """Get (or create) the session for the running event loop"""
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            self._forget_closed_loops()
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host)
+            session = aiohttp.ClientSession(
+                connector=connector,
+                headers={'User-Agent': 'dashboard-app/0.1'},
+                auto_decompress=True
+            )
+            self._sessions[loop] = session
+        return session
+
+    async def get(self, url, params=None, headers=None, timeout=None, max_wait=None):
+        """
+        Send a GET request over a pooled connection
+
+        Errors are raised as requests exceptions so clients can share their
+        error handling between the sync and async code paths. Requests to a
+        provider whose circuit is open fail fast with CircuitOpenError.
+        Requests that reach the network take a token from the provider's
+        shared rate limiter, or fail with RateLimitedError if none is
+        available in time. With a cache, fresh cached responses are returned
+        without a request and stale ones are revalidated.
+
+        Args:
+            url (str): Request URL
+            params (dict): Query parameters
+            headers (dict): Extra request headers
+            timeout (float or tuple): Overrides the default (connect, read) timeout
+            max_wait (float): Overrides max_rate_wait (0 = only if a token is free now)
+
+        Returns:
+            AsyncResponse: The fully-read response
+        """
+        if self.cache is None or not self.cache.handles(url, headers):
+            return await self._send(url, params, headers, timeout, max_wait)
+
+        key = self.cache.key(url, params)
+        entry = self.cache.get(key)
+        if entry is not None and self.cache.is_fresh(entry):
+            return AsyncResponse(entry.status, CaseInsensitiveDict(entry.headers), entry.body)
+
+        response = await self._send(url, params, self.cache.conditional_headers(entry, headers), timeout, max_wait)
+        if entry is not None and response.status_code == 304:
+            entry = self.cache.revalidated(key, entry, response.headers)
+            return AsyncResponse(entry.status, CaseInsensitiveDict(entry.headers), entry.body)
+
+        self.cache.store(key, url, response.status_code, response.headers, response.content)
+        return response
+
+    async def _send(self, url, params, headers, timeout, max_wait):
+        """Send a GET request through the provider's circuit breaker and rate limiter"""
+        import aiohttp
+
+        if isinstance(timeout, tuple):
+            connect_timeout, read_timeout = timeout
+        else:
+            connect_timeout = self.connect_timeout
+            read_timeout = timeout or self.read_timeout
+
+        # aiohttp only accepts str/int/float query values
+        if params:
+            params = {k: str(v) for k, v in params.items() if v is not None}
+
+        breaker = breaker_for_url(url)
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpenError(f"Circuit for {breaker.name} is open")
+
+        limiter = limiter_for_url(url)
+        try:
+            if limiter is not None and await limiter.acquire_async(max_wait=self.max_rate_wait if max_wait is None else max_wait) is None:
+                raise RateLimitedError(f"Rate limit for {limiter.name} reached")
+
+            session = self._get_session()
+            client_timeout = aiohttp.ClientTimeout(connect=connect_timeout, sock_read=read_timeout)
+            async with session.get(url, params=params, headers=headers, timeout=client_timeout) as response:
+                content = await response.read()
+                result = AsyncResponse(response.status, response.headers, content)
+        except asyncio.TimeoutError as e:
+            if breaker is not None:
+                breaker.record_failure()
+            raise requests.exceptions.Timeout(f"Request to {url} timed out") from e
+        except aiohttp.ClientError as e:
+            if breaker is not None:
+                breaker.record_failure()
+            raise requests.exceptions.ConnectionError(str(e)) from e
+        except BaseException:
+            # Cancelled or rate limited: no verdict on the provider's health
+            if breaker is not None:
+                breaker.release()
+            raise
+
+        if breaker is not None:
+            breaker.record_response(result)
+        return result
+
+    async def close(self):
+        """
+        Close the session for the running event loop
+
+        Call before the loop ends (e.g. at the end of the coroutine passed to
+        asyncio.run); a session whose loop is gone can't be closed anymore.
+        """
+        session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None:
+            await session.close()
+        self._forget_closed_loops()
+
+    def _forget_closed_loops(self):
+        """Drop the sessions of event loops that have finished"""
+        for loop in [loop for loop in self._sessions if loop.is_closed()]:
+            del self._sessions[loop]
+
+
+_default_transport = None
+_default_lock = threading.Lock()
+
+
+def get_default_async_transport():
+    """Get the process-wide async transport shared by all API clients"""
+    global _default_transport
+
+    with _default_lock:
+        if _default_transport is None:
+            _default_transport = AsyncHTTPTransport.from_env()
+        return _default_transport
@@ -0,0 +1,205 @@
+import time
+import threading
+from urllib.parse import urlparse
+import requests
+from api_clients.providers import PROVIDER_HOSTS
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of calling a provider whose circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker for one upstream provider
+
+    Closed: calls go through and consecutive failures are counted.
+    Open: calls fail fast until the reset timeout passes.
+    Half-open: one probe call goes through; success closes the circuit,
+    failure opens it again with a longer timeout.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name=None, failure_threshold=5, reset_timeout=30, max_reset_timeout=600, auth_reset_timeout=300):
+        """
+        Args:
+            name (str): Provider name for status reports
+            failure_threshold (int): Consecutive failures that open the circuit
+            reset_timeout (float): Seconds the circuit stays open before probing
+            max_reset_timeout (float): Cap for the timeout as failed probes double it
+            auth_reset_timeout (float): Seconds the circuit stays open at least when
+                rejected credentials (401/403) opened it
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.auth_reset_timeout = auth_reset_timeout
+
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._open_for = reset_timeout
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        """Current state, moving open to half-open once the timeout has passed"""
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        """State as of now (caller holds the lock)"""
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self._open_for:
+            self._state = self.HALF_OPEN
+            self._probing = False
+        return self._state
+
+    def available(self):
+        """Whether a call could go through right now, without claiming the probe"""
+        with self._lock:
+            state = self._current_state()
+            return state == self.CLOSED or (state == self.HALF_OPEN and not self._probing)
+
+    def allow(self):
+        """
+        Whether to make a call now
+
+        In half-open state only the first caller is let through as the probe.
+
+        Returns:
+            bool: True if the call should be made
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def release(self):
+        """Give back a claimed probe when the call ended without a result (e.g. cancelled)"""
+        with self._lock:
+            self._probing = False
+
+    def record_success(self):
+        """Close the circuit after a healthy response"""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._open_for = self.reset_timeout
+            self._probing = False
+
+    def record_failure(self, retry_after=None, min_open=None):
+        """
+        Count a failed call, opening the circuit when needed
+
+        Args:
+            retry_after (float): Seconds the provider asked us to wait (e.g. from a
+                429 Retry-After header); opens the circuit for at least that long
+            min_open (float): Seconds the circuit stays open at least if this
+                failure opens it (it still takes failure_threshold failures)
+        """
+        with self._lock:
+            state = self._current_state()
+            self._failures += 1
+            self._probing = False
+
+            if state == self.HALF_OPEN:
+                # Recovery probe failed; back off further
+                self._open(max(min(self._open_for * 2, self.max_reset_timeout), min_open or 0), retry_after)
+            elif state == self.CLOSED and (retry_after or self._failures >= self.failure_threshold):
+                self._open(max(self.reset_timeout, min_open or 0), retry_after)
+
+    def _open(self, open_for, retry_after=None):
+        """Open the circuit (caller holds the lock)"""
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._open_for = max(open_for, retry_after or 0)
+        print(f"Circuit for {self.name} opened for {self._open_for:.0f}s after {self._failures} failures")
+
+    def record_response(self, response):
+        """
+        Record a call by its HTTP response
+
+        429s and server errors count as failures. So do 401/403: a rejected
+        key keeps failing until it is fixed, so once they add up the circuit
+        stays open for auth_reset_timeout instead of spending quota on it.
+        Anything else (e.g. 404, which is about the request, not the
+        provider) closes the circuit.
+        """
+        status = response.status_code
+        if status == 429 or status >= 500:
+            self.record_failure(_retry_after(response))
+        elif status in (401, 403):
+            self.record_failure(min_open=self.auth_reset_timeout)
+        else:
+            self.record_success()
+
+    def status(self):
+        """Current state for monitoring"""
+        with self._lock:
+            state = self._current_state()
+            retry_in = 0
+            if state == self.OPEN:
+                retry_in = max(0, self._open_for - (time.monotonic() - self._opened_at))
+            return {
+                'provider': self.name,
+                'state': state,
+                'failures': self._failures,
+                'retry_in': round(retry_in, 1)
+            }
+
+
+def _retry_after(response):
+    """Seconds from a Retry-After header, if it holds a number"""
+    try:
+        return float(response.headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return None
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(provider):
+    """
+    Get the process-wide circuit breaker for a provider
+
+    Args:
+        provider (str): Provider name (see PROVIDER_HOSTS; Reddit uses 'reddit')
+
+    Returns:
+        CircuitBreaker: The shared breaker
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(provider)
+        if breaker is None:
+            breaker = CircuitBreaker(name=provider)
+            _breakers[provider] = breaker
+        return breaker
+
+
+def breaker_for_url(url):
+    """
+    Circuit breaker for the provider serving a URL
+
+    Returns:
+        CircuitBreaker: The provider's breaker, or None for unknown hosts
+    """
+    provider = PROVIDER_HOSTS.get(urlparse(url).hostname)
+    return get_circuit_breaker(provider) if provider else None
+
+
+def circuit_breaker_status():
+    """State of every breaker created so far"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.status() for breaker in breakers}
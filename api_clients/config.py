@@ -0,0 +1,25 @@
+import os
+import threading
+from dotenv import load_dotenv
+
+
+# App directory (the parent of api_clients), where local caches are kept by default
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_loaded = False
+_lock = threading.Lock()
+
+
+def load_config():
+    """
+    Load .env into the environment, once per process
+
+    Every client calls this before reading its settings, so however many
+    clients are built the file is only read once.
+    """
+    global _loaded
+
+    with _lock:
+        if not _loaded:
+            load_dotenv()
+            _loaded = True
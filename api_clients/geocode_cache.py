@@ -0,0 +1,188 @@
+import os
+import json
+import asyncio
+import threading
+from concurrent.futures import Future
+from api_clients.config import BASE_DIR
+
+
+DEFAULT_PATH = os.path.join(BASE_DIR, 'geocode_cache.json')
+
+# Coordinates of common cities, so they never need a geocoding request
+COMMON_CITIES = {
+    'chicago': (41.8781, -87.6298),
+    'new york': (40.7128, -74.0060),
+    'los angeles': (34.0522, -118.2437),
+    'houston': (29.7604, -95.3698),
+    'phoenix': (33.4484, -112.0740),
+    'philadelphia': (39.9526, -75.1652),
+    'san antonio': (29.4241, -98.4936),
+    'san diego': (32.7157, -117.1611),
+    'dallas': (32.7767, -96.7970),
+    'austin': (30.2672, -97.7431),
+    'san francisco': (37.7749, -122.4194),
+    'seattle': (47.6062, -122.3321),
+    'denver': (39.7392, -104.9903),
+    'boston': (42.3601, -71.0589),
+    'atlanta': (33.7490, -84.3880),
+    'miami': (25.7617, -80.1918),
+    'washington': (38.9072, -77.0369),
+    'minneapolis': (44.9778, -93.2650),
+    'detroit': (42.3314, -83.0458),
+    'toronto': (43.6532, -79.3832),
+    'london': (51.5074, -0.1278),
+    'paris': (48.8566, 2.3522),
+    'berlin': (52.5200, 13.4050),
+    'tokyo': (35.6762, 139.6503),
+    'sydney': (-33.8688, 151.2093)
+}
+
+
+class GeocodeCache:
+    """Persistent city -> (lat, lon) index shared by all weather lookups"""
+
+    def __init__(self, path=DEFAULT_PATH, preload=True):
+        """
+        Args:
+            path (str): JSON file the index is saved to (None keeps it in memory;
+                defaults to geocode_cache.json next to the code)
+            preload (bool): Start with the coordinates of common cities
+        """
+        self.path = path
+        self._coords = dict(COMMON_CITIES) if preload else {}
+        self._lock = threading.Lock()
+
+        # Lookups currently talking to the geocoding API, so concurrent
+        # callers for the same city wait for one request instead of sending their own
+        self._inflight = {}
+        self._inflight_async = {}
+
+        if self.path:
+            self._load()
+
+    @staticmethod
+    def normalize(city):
+        """Cache key for a city name"""
+        return ' '.join(city.strip().lower().split())
+
+    def get(self, city):
+        """Cached coordinates for a city, or None"""
+        with self._lock:
+            return self._coords.get(self.normalize(city))
+
+    def set(self, city, coords):
+        """Store coordinates for a city and save the index"""
+        with self._lock:
+            self._coords[self.normalize(city)] = tuple(coords)
+            if self.path:
+                self._save()
+
+    def lookup(self, city, fetch):
+        """
+        Get coordinates for a city, geocoding it at most once
+
+        Args:
+            city (str): City name
+            fetch (callable): fetch(city) -> (lat, lon) or None, called on a miss
+
+        Returns:
+            tuple: (lat, lon) or None if the city could not be geocoded
+        """
+        key = self.normalize(city)
+
+        with self._lock:
+            if key in self._coords:
+                return self._coords[key]
+
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if not owner:
+            return future.result()
+
+        try:
+            coords = fetch(city)
+            if coords:
+                self.set(city, coords)
+            future.set_result(coords)
+            return coords
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    async def lookup_async(self, city, fetch_async):
+        """
+        Async version of lookup
+
+        Args:
+            city (str): City name
+            fetch_async (callable): Coroutine function fetch_async(city) -> (lat, lon) or None
+
+        Returns:
+            tuple: (lat, lon) or None if the city could not be geocoded
+        """
+        key = self.normalize(city)
+
+        coords = self.get(city)
+        if coords:
+            return coords
+
+        # Tasks belong to one event loop, so dedupe per loop
+        inflight_key = (asyncio.get_running_loop(), key)
+        task = self._inflight_async.get(inflight_key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_async(city, fetch_async))
+            self._inflight_async[inflight_key] = task
+            task.add_done_callback(lambda _: self._inflight_async.pop(inflight_key, None))
+
+        # Shield so one cancelled caller doesn't cancel the lookup for the others
+        return await asyncio.shield(task)
+
+    async def _fetch_async(self, city, fetch_async):
+        """Geocode a city and store the result"""
+        coords = await fetch_async(city)
+        if coords:
+            self.set(city, coords)
+        return coords
+
+    def _load(self):
+        """Merge saved coordinates into the index"""
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r') as f:
+                    saved = json.load(f)
+                for key, coords in saved.items():
+                    self._coords[key] = tuple(coords)
+        except Exception as e:
+            print(f"Could not load geocode cache: {e}")
+
+    def _save(self):
+        """Write the index to disk atomically (caller holds the lock)"""
+        try:
+            # Per process and thread, so concurrent workers never share a temp file
+            tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self._coords, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Could not save geocode cache: {e}")
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_default_geocode_cache():
+    """Get the process-wide geocode cache shared by all WeatherAPI clients"""
+    global _default_cache
+
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = GeocodeCache()
+        return _default_cache
@@ -0,0 +1,431 @@
+import os
+import re
+import json
+import time
+import base64
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlencode, urlparse
+from api_clients.providers import PROVIDER_HOSTS
+from api_clients.config import BASE_DIR
+
+
+# Providers whose responses are cached
+CACHED_PROVIDERS = ('openweather', 'newsapi', 'polygon', 'quotable')
+
+# Query parameters holding credentials: left out of cache keys and never written to disk
+SECRET_PARAMS = {'apikey', 'api_key', 'appid', 'token', 'key'}
+
+# Directory entries are saved in by default, next to the app's code
+DEFAULT_PATH = os.path.join(BASE_DIR, 'http_cache')
+
+# Response headers kept with a cached body (the body is stored decoded, so
+# Content-Encoding/Content-Length don't apply to it)
+STORED_HEADERS = ('Content-Type', 'Cache-Control', 'Expires', 'Date', 'Age', 'ETag', 'Last-Modified')
+
+
+# How long after the close Polygon.io may still serve the previous
+# session's bar from /prev
+PREV_BAR_DELAY = timedelta(minutes=30)
+
+
+def _eastern(now=None):
+    """A time (defaults to now) in US market time"""
+    try:
+        from zoneinfo import ZoneInfo
+        eastern = ZoneInfo('America/New_York')
+    except Exception:
+        # No tz database available; use standard time
+        eastern = timezone(timedelta(hours=-5))
+
+    return (now or datetime.now(timezone.utc)).astimezone(eastern)
+
+
+def _seconds_between(start, end):
+    """Elapsed seconds between two aware times (across DST changes too)"""
+    return (end.astimezone(timezone.utc) - start.astimezone(timezone.utc)).total_seconds()
+
+
+def seconds_until_market_close(now=None):
+    """
+    Seconds until the next US market close (16:00 ET on a weekday)
+
+    Holidays are not accounted for; on those the entry just expires early.
+    """
+    now = _eastern(now)
+    close = now.replace(hour=16, minute=0, second=0, microsecond=0)
+    while close <= now or close.weekday() >= 5:
+        close = (close + timedelta(days=1)).replace(hour=16, minute=0, second=0, microsecond=0)
+    return _seconds_between(now, close)
+
+
+def seconds_until_prev_bar_changes(now=None):
+    """
+    Seconds a Polygon.io /prev response stays current
+
+    /prev moves on to a new bar some time after each close and "previous
+    day" moves on at each open (9:30 ET), so a response is fresh until
+    whichever comes next. Within PREV_BAR_DELAY after a close it may still
+    be the old session's bar, so it isn't fresh at all.
+    """
+    now = _eastern(now)
+    day = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    close = now.replace(hour=16, minute=0, second=0, microsecond=0)
+    if now.weekday() < 5 and close <= now < close + PREV_BAR_DELAY:
+        return 0
+
+    while True:
+        if day.weekday() < 5:
+            for hour, minute in ((9, 30), (16, 0)):
+                boundary = day.replace(hour=hour, minute=minute)
+                if hour == 16:
+                    boundary += PREV_BAR_DELAY
+                if boundary > now:
+                    return _seconds_between(now, boundary)
+        day = (day + timedelta(days=1)).replace(hour=0, minute=0)
+
+
+# Freshness overrides per endpoint: (host, path pattern, seconds or a
+# callable returning seconds). They replace whatever lifetime the provider
+# sends for responses it rarely or never changes.
+TTL_OVERRIDES = [
+    # City coordinates don't move
+    ('api.openweathermap.org', re.compile(r'^/geo/'), 7 * 86400),
+    # The previous day's bar only changes after a close or at an open
+    ('api.polygon.io', re.compile(r'^/v2/aggs/ticker/[^/]+/prev$'), seconds_until_prev_bar_changes)
+]
+
+
+# A stored response. expires_at is when it stops being fresh; after that it
+# is only reused if the provider confirms it with a 304.
+CachedResponse = namedtuple('CachedResponse', ['url', 'status', 'headers', 'body', 'stored_at', 'expires_at'])
+
+
+def parse_cache_control(value):
+    """Cache-Control directives as a dict of lower-case name -> value (None for flags)"""
+    directives = {}
+    for part in (value or '').split(','):
+        name, _, arg = part.strip().partition('=')
+        if name:
+            directives[name.lower()] = arg.strip('"') if arg else None
+    return directives
+
+
+def _parse_seconds(value):
+    """Delta-seconds header value as an int, or None"""
+    value = (value or '').strip()
+    return int(value) if value.isdigit() else None
+
+
+def _parse_date(value):
+    """HTTP date as a timestamp, or None"""
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class HTTPCache:
+    """
+    Disk cache of upstream GET responses, following HTTP caching rules
+
+    Fresh responses are served without a request. Stale responses that carry
+    an ETag or Last-Modified are revalidated with If-None-Match /
+    If-Modified-Since, so an unchanged resource costs an empty 304 instead
+    of the whole body. Cache-Control max-age (or Expires) sets how long a
+    response is fresh unless TTL_OVERRIDES has a rule for its endpoint;
+    no-store responses are never kept.
+
+    Each entry is its own file, replaced atomically, so several workers can
+    share one cache directory.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, max_entries=1000, max_memory=128, overrides=None):
+        """
+        Args:
+            path (str): Directory entries are saved in
+            max_entries (int): Entries kept on disk before the least recently used is removed
+            max_memory (int): Entries also kept in memory
+            overrides (list): (host, path pattern, ttl) rules (defaults to TTL_OVERRIDES)
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.max_memory = max_memory
+        self.overrides = TTL_OVERRIDES if overrides is None else overrides
+        self.hosts = {host for host, provider in PROVIDER_HOSTS.items() if provider in CACHED_PROVIDERS}
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._index = OrderedDict()
+        self._stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'stored': 0}
+
+        os.makedirs(self.path, exist_ok=True)
+        self._load_index()
+
+    def handles(self, url, headers=None):
+        """Whether requests to a URL go through the cache (authorized requests never do)"""
+        if headers and any(name.lower() == 'authorization' for name in headers):
+            return False
+        return urlparse(url).hostname in self.hosts
+
+    @staticmethod
+    def key(url, params=None):
+        """Cache key for a GET request, without its credentials"""
+        query = sorted((k, str(v)) for k, v in (params or {}).items() if v is not None and k.lower() not in SECRET_PARAMS)
+        return hashlib.sha1(f"{url}?{urlencode(query)}".encode()).hexdigest()
+
+    def get(self, key):
+        """
+        Stored response for a key, fresh or not
+
+        A stale copy in memory is checked against disk first, since another
+        worker may have refreshed it.
+
+        Returns:
+            CachedResponse: The entry, or None if missing
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+
+        if entry is None or not self.is_fresh(entry):
+            saved = self._read(key)
+            if saved is not None and (entry is None or saved.stored_at > entry.stored_at):
+                entry = saved
+                self._remember(key, entry)
+
+        with self._lock:
+            if entry is None:
+                self._stats['misses'] += 1
+            elif self.is_fresh(entry):
+                self._stats['hits'] += 1
+        return entry
+
+    @staticmethod
+    def is_fresh(entry):
+        """Whether an entry can be used without asking the provider"""
+        return time.time() < entry.expires_at
+
+    @staticmethod
+    def conditional_headers(entry, headers=None):
+        """Request headers that revalidate a stale entry"""
+        headers = dict(headers or {})
+        if entry is None:
+            return headers
+
+        if entry.headers.get('ETag'):
+            headers['If-None-Match'] = entry.headers['ETag']
+        if entry.headers.get('Last-Modified'):
+            headers['If-Modified-Since'] = entry.headers['Last-Modified']
+        return headers
+
+    def store(self, key, url, status, headers, body):
+        """
+        Save a response if HTTP caching rules allow it
+
+        Only 200s are kept, and only if they are fresh for a while or carry
+        a validator to revalidate them with.
+
+        Args:
+            key (str): Key from key()
+            url (str): Request URL, without query parameters
+            status (int): Response status
+            headers (Mapping): Response headers
+            body (bytes): Decoded response body
+
+        Returns:
+            CachedResponse: The stored entry, or None if it wasn't stored
+        """
+        if status != 200:
+            return None
+
+        lifetime = self.lifetime(url, headers)
+        kept = {name: headers[name] for name in STORED_HEADERS if headers.get(name)}
+        if lifetime is None or (lifetime <= 0 and 'ETag' not in kept and 'Last-Modified' not in kept):
+            return None
+
+        now = time.time()
+        entry = CachedResponse(url, status, kept, body, now, now + lifetime)
+
+        self._remember(key, entry)
+        self._write(key, entry)
+        with self._lock:
+            self._stats['stored'] += 1
+        return entry
+
+    def revalidated(self, key, entry, headers):
+        """
+        Refresh a stale entry the provider confirmed with a 304
+
+        Args:
+            key (str): Key from key()
+            entry (CachedResponse): The entry that was revalidated
+            headers (Mapping): Headers of the 304 response, which update the stored ones
+
+        Returns:
+            CachedResponse: The refreshed entry
+        """
+        merged = dict(entry.headers)
+        merged.update({name: headers[name] for name in STORED_HEADERS if headers.get(name)})
+
+        lifetime = self.lifetime(entry.url, merged) or 0
+        now = time.time()
+        entry = entry._replace(headers=merged, stored_at=now, expires_at=now + max(lifetime, 0))
+
+        self._remember(key, entry)
+        self._write(key, entry)
+        with self._lock:
+            self._stats['revalidated'] += 1
+        return entry
+
+    def lifetime(self, url, headers):
+        """
+        Seconds a response stays fresh
+
+        Returns:
+            float: Freshness lifetime (0 = revalidate on every use), or None
+                if the response must not be stored
+        """
+        parsed = urlparse(url)
+        for host, pattern, ttl in self.overrides:
+            if parsed.hostname == host and pattern.search(parsed.path):
+                return ttl() if callable(ttl) else ttl
+
+        directives = parse_cache_control(headers.get('Cache-Control'))
+        if 'no-store' in directives:
+            return None
+        if 'no-cache' in directives:
+            return 0
+
+        age = _parse_seconds(headers.get('Age')) or 0
+        max_age = _parse_seconds(directives.get('max-age'))
+        if max_age is not None:
+            return max_age - age
+
+        expires = _parse_date(headers.get('Expires'))
+        if expires is not None:
+            date = _parse_date(headers.get('Date')) or time.time()
+            return expires - date - age
+
+        # No explicit lifetime: reuse only after revalidation
+        return 0
+
+    def status(self):
+        """Entry count and hit statistics for monitoring"""
+        with self._lock:
+            return {'path': self.path, 'entries': len(self._index), 'in_memory': len(self._memory), **self._stats}
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            names = list(self._index)
+            self._memory.clear()
+            self._index.clear()
+
+        for key in names:
+            try:
+                os.remove(self._file(key))
+            except OSError:
+                pass
+
+    def _file(self, key):
+        return os.path.join(self.path, f"{key}.json")
+
+    def _remember(self, key, entry):
+        """Keep an entry in memory and mark it most recently used"""
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory:
+                self._memory.popitem(last=False)
+
+            self._index[key] = None
+            self._index.move_to_end(key)
+
+    def _read(self, key):
+        """Entry saved on disk (possibly by another worker), or None"""
+        try:
+            with open(self._file(key), 'r') as f:
+                saved = json.load(f)
+            return CachedResponse(
+                url=saved['url'],
+                status=saved['status'],
+                headers=saved['headers'],
+                body=base64.b64decode(saved['body']),
+                stored_at=saved['stored_at'],
+                expires_at=saved['expires_at']
+            )
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Could not read HTTP cache entry {key}: {e}")
+            return None
+
+    def _write(self, key, entry):
+        """Save an entry atomically and evict the least recently used beyond max_entries"""
+        try:
+            path = self._file(key)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({
+                    'url': entry.url,
+                    'status': entry.status,
+                    'headers': entry.headers,
+                    'body': base64.b64encode(entry.body).decode('ascii'),
+                    'stored_at': entry.stored_at,
+                    'expires_at': entry.expires_at
+                }, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Could not save HTTP cache entry {key}: {e}")
+
+        with self._lock:
+            evicted = []
+            while len(self._index) > self.max_entries:
+                name, _ = self._index.popitem(last=False)
+                self._memory.pop(name, None)
+                evicted.append(name)
+
+        for name in evicted:
+            try:
+                os.remove(self._file(name))
+            except OSError:
+                pass
+
+    def _load_index(self):
+        """Index the saved entries, least recently written first"""
+        try:
+            saved = [entry for entry in os.scandir(self.path) if entry.name.endswith('.json')]
+        except OSError as e:
+            print(f"Could not load HTTP cache: {e}")
+            return
+
+        for entry in sorted(saved, key=lambda e: e.stat().st_mtime):
+            self._index[entry.name[:-len('.json')]] = None
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_default_http_cache():
+    """
+    Get the process-wide HTTP cache shared by both transports
+
+    Returns:
+        HTTPCache: The cache in HTTP_CACHE_PATH (default DEFAULT_PATH), or
+            None if HTTP_CACHE_PATH is set empty
+    """
+    global _default_cache
+
+    with _default_lock:
+        if _default_cache is None:
+            path = os.getenv('HTTP_CACHE_PATH', DEFAULT_PATH)
+            if not path:
+                return None
+            _default_cache = HTTPCache(path)
+        return _default_cache
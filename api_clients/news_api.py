@@ -1,17 +1,28 @@
-import requests
 import os
-from dotenv import load_dotenv
 from datetime import datetime
+from api_clients.transport import get_default_transport
+from api_clients.async_transport import get_default_async_transport
+from api_clients.news_index import ArticleIndex
+from api_clients.config import load_config
 
-load_dotenv()
+load_config()
 
 class NewsAPI:
     """Client for NewsAPI.org"""
 
-    def __init__(self):
+    # Articles requested per incremental call; a full page costs the same
+    # quota as five articles and fills the per-category buffer
+    INCREMENTAL_PAGE_SIZE = 50
+
+    def __init__(self, transport=None, async_transport=None, index=None):
+        self.http = transport or get_default_transport()
+        self.async_http = async_transport or get_default_async_transport()
         self.api_key = os.getenv('NEWS_API_KEY')
         self.base_url = "https://newsapi.org/v2"
 
+        # Articles already parsed, newest publishedAt and latest articles per feed
+        self.index = index or ArticleIndex()
+
     def get_top_headlines(self, country='us', category=None, num_articles=5):
         """
         Get top news headlines
@@ -25,51 +36,18 @@ class NewsAPI:
             list: News articles or None if error
         """
         try:
-            url = f"{self.base_url}/top-headlines"
-            params = {
-                'apiKey': self.api_key,
-                'country': country,
-                'pageSize': num_articles
-            }
-
-            if category:
-                params['category'] = category
-
-            response = requests.get(url, params=params, timeout=10)
-
-            if response.status_code == 200:
-                data = response.json()
-
-                articles = []
-                for article in data.get('articles', []):
-                    # Parse published date
-                    pub_date = article.get('publishedAt', '')
-                    if pub_date:
-                        try:
-                            pub_date = datetime.fromisoformat(pub_date.replace('Z', '+00:00'))
-                            pub_date = pub_date.strftime('%b %d, %Y %I:%M %p')
-                        except:
-                            pass
-
-                    articles.append({
-                        'title': article.get('title', 'No title'),
-                        'source': article.get('source', {}).get('name', 'Unknown'),
-                        'description': article.get('description', 'No description'),
-                        'url': article.get('url', ''),
-                        'published_at': pub_date
-                    })
-
-                return articles
-
-            elif response.status_code == 401:
-                print("Error: Invalid News API key")
-                return None
-            elif response.status_code == 429:
-                print("Error: Rate limit exceeded (100 requests/day)")
-                return None
-            else:
-                print(f"Error: API returned status code {response.status_code}")
-                return None
+            response = self.http.get(f"{self.base_url}/top-headlines", params=self._headlines_params(country, category, num_articles))
+            return self._parse_headlines(response)
+
+        except Exception as e:
+            print(f"Error getting news: {str(e)}")
+            return None
+
+    async def get_top_headlines_async(self, country='us', category=None, num_articles=5):
+        """Async version of get_top_headlines"""
+        try:
+            response = await self.async_http.get(f"{self.base_url}/top-headlines", params=self._headlines_params(country, category, num_articles))
+            return self._parse_headlines(response)
 
         except Exception as e:
             print(f"Error getting news: {str(e)}")
@@ -78,35 +56,181 @@ class NewsAPI:
     def search_news(self, query, num_articles=5):
         """Search for news articles by keyword"""
         try:
-            url = f"{self.base_url}/everything"
-            params = {
-                'apiKey': self.api_key,
-                'q': query,
-                'sortBy': 'publishedAt',
-                'pageSize': num_articles
-            }
-
-            response = requests.get(url, params=params, timeout=10)
-
-            if response.status_code == 200:
-                data = response.json()
-
-                articles = []
-                for article in data.get('articles', []):
-                    articles.append({
-                        'title': article.get('title'),
-                        'source': article.get('source', {}).get('name'),
-                        'url': article.get('url')
-                    })
-
-                return articles
-            else:
-                return None
+            response = self.http.get(f"{self.base_url}/everything", params=self._search_params(query, num_articles))
+            return self._parse_search_results(response)
+
+        except Exception as e:
+            print(f"Error searching news: {str(e)}")
+            return None
+
+    async def search_news_async(self, query, num_articles=5):
+        """Async version of search_news"""
+        try:
+            response = await self.async_http.get(f"{self.base_url}/everything", params=self._search_params(query, num_articles))
+            return self._parse_search_results(response)
+
+        except Exception as e:
+            print(f"Error searching news: {str(e)}")
+            return None
+
+    def get_latest_headlines(self, country='us', category=None, num_articles=5):
+        """
+        Get top headlines incrementally
+
+        Only articles not seen before are parsed; the rest are reused from
+        the article index. Returns the newest articles of the feed's buffer,
+        so a call that finds nothing new still returns the latest headlines.
+
+        Args:
+            country (str): Country code (us, gb, etc.)
+            category (str): Category (business, technology, sports, etc.)
+            num_articles (int): Number of articles to return
+
+        Returns:
+            list: News articles (each with an 'id') or None if error
+        """
+        feed = self.index.feed_key(country, category)
+        try:
+            response = self.http.get(f"{self.base_url}/top-headlines", params=self._headlines_params(country, category, self.INCREMENTAL_PAGE_SIZE))
+            return self._ingest(feed, response, self._parse_article, num_articles)
+
+        except Exception as e:
+            print(f"Error getting news: {str(e)}")
+            return None
+
+    async def get_latest_headlines_async(self, country='us', category=None, num_articles=5):
+        """Async version of get_latest_headlines"""
+        feed = self.index.feed_key(country, category)
+        try:
+            response = await self.async_http.get(f"{self.base_url}/top-headlines", params=self._headlines_params(country, category, self.INCREMENTAL_PAGE_SIZE))
+            return self._ingest(feed, response, self._parse_article, num_articles)
+
+        except Exception as e:
+            print(f"Error getting news: {str(e)}")
+            return None
+
+    def search_latest_news(self, query, num_articles=5):
+        """
+        Search news incrementally
+
+        Asks only for articles published since the newest one already seen
+        for this query, and parses only those.
+
+        Returns:
+            list: Latest matching articles (each with an 'id') or None if error
+        """
+        feed = self.index.feed_key(query=query)
+        try:
+            params = self._search_params(query, self.INCREMENTAL_PAGE_SIZE, since=self.index.watermark(feed))
+            response = self.http.get(f"{self.base_url}/everything", params=params)
+            return self._ingest(feed, response, self._parse_article, num_articles)
+
+        except Exception as e:
+            print(f"Error searching news: {str(e)}")
+            return None
+
+    async def search_latest_news_async(self, query, num_articles=5):
+        """Async version of search_latest_news"""
+        feed = self.index.feed_key(query=query)
+        try:
+            params = self._search_params(query, self.INCREMENTAL_PAGE_SIZE, since=self.index.watermark(feed))
+            response = await self.async_http.get(f"{self.base_url}/everything", params=params)
+            return self._ingest(feed, response, self._parse_article, num_articles)
 
         except Exception as e:
             print(f"Error searching news: {str(e)}")
             return None
 
+    def _ingest(self, feed, response, parse, num_articles):
+        """Add a response's new articles to a feed and return the feed's latest articles"""
+        if response.status_code == 200:
+            self.index.ingest(feed, response.json().get('articles', []), parse)
+            return self.index.articles(feed, num_articles)
+
+        self._report_error(response)
+        return None
+
+    def _headlines_params(self, country, category, num_articles):
+        """Query parameters for /top-headlines"""
+        params = {
+            'apiKey': self.api_key,
+            'country': country,
+            'pageSize': num_articles
+        }
+
+        if category:
+            params['category'] = category
+
+        return params
+
+    def _search_params(self, query, num_articles, since=None):
+        """Query parameters for /everything (since: only articles published at or after this ISO time)"""
+        params = {
+            'apiKey': self.api_key,
+            'q': query,
+            'sortBy': 'publishedAt',
+            'pageSize': num_articles
+        }
+
+        if since:
+            params['from'] = since
+
+        return params
+
+    def _parse_headlines(self, response):
+        """Build the article list from a /top-headlines response"""
+        if response.status_code == 200:
+            data = response.json()
+            return [self._parse_article(article) for article in data.get('articles', [])]
+
+        self._report_error(response)
+        return None
+
+    def _parse_article(self, article):
+        """Build the dashboard dict for one /top-headlines article"""
+        # Parse published date
+        pub_date = article.get('publishedAt', '')
+        if pub_date:
+            try:
+                pub_date = datetime.fromisoformat(pub_date.replace('Z', '+00:00'))
+                pub_date = pub_date.strftime('%b %d, %Y %I:%M %p')
+            except:
+                pass
+
+        return {
+            'title': article.get('title', 'No title'),
+            'source': article.get('source', {}).get('name', 'Unknown'),
+            'description': article.get('description', 'No description'),
+            'url': article.get('url', ''),
+            'published_at': pub_date
+        }
+
+    def _report_error(self, response):
+        """Print why a request failed"""
+        if response.status_code == 401:
+            print("Error: Invalid News API key")
+        elif response.status_code == 429:
+            print("Error: Rate limit exceeded (100 requests/day)")
+        else:
+            print(f"Error: API returned status code {response.status_code}")
+
+    def _parse_search_results(self, response):
+        """Build the article list from an /everything response"""
+        if response.status_code == 200:
+            data = response.json()
+
+            return [self._parse_search_article(article) for article in data.get('articles', [])]
+        else:
+            return None
+
+    def _parse_search_article(self, article):
+        """Build the dict for one /everything article"""
+        return {
+            'title': article.get('title'),
+            'source': article.get('source', {}).get('name'),
+            'url': article.get('url')
+        }
+
 
 # Test
 if __name__ == '__main__':
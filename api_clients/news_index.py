@@ -0,0 +1,119 @@
+import hashlib
+import threading
+from collections import OrderedDict, deque
+
+
+class ArticleIndex:
+    """
+    Incremental article store for news feeds
+
+    Remembers the newest publishedAt seen per feed (country, category,
+    query), a URL/title-hash index of every article already parsed, and a
+    bounded buffer of the latest articles per feed. Articles already in the
+    index are never parsed again; the same dict is reused, so unchanged
+    articles stay identical between refreshes.
+    """
+
+    def __init__(self, max_per_feed=50, max_articles=5000):
+        """
+        Args:
+            max_per_feed (int): Articles kept per feed (oldest dropped first)
+            max_articles (int): Articles kept in the dedupe index (least recently seen dropped first)
+        """
+        self.max_per_feed = max_per_feed
+        self.max_articles = max_articles
+
+        self._watermarks = {}
+        self._feeds = {}
+        self._index = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def feed_key(country=None, category=None, query=None):
+        """Key of a feed"""
+        return (country, category, query)
+
+    @staticmethod
+    def article_keys(article):
+        """Dedupe keys of a raw article: hashes of its URL and its normalized title"""
+        keys = []
+        url = (article.get('url') or '').strip()
+        if url:
+            keys.append('url:' + hashlib.sha1(url.encode()).hexdigest())
+
+        title = ' '.join((article.get('title') or '').lower().split())
+        if title and title != '[removed]':
+            keys.append('title:' + hashlib.sha1(title.encode()).hexdigest())
+
+        return keys
+
+    def watermark(self, feed):
+        """Newest publishedAt (ISO 8601) seen on a feed, or None"""
+        with self._lock:
+            return self._watermarks.get(feed)
+
+    def ingest(self, feed, raw_articles, parse):
+        """
+        Add a page of raw API articles to a feed
+
+        Args:
+            feed (tuple): Key from feed_key()
+            raw_articles (list): Articles as returned by the API
+            parse (callable): Builds the dashboard dict for a raw article; only
+                called for articles not seen before. An 'id' key is added to it.
+
+        Returns:
+            int: Number of articles that were new to the index
+        """
+        new = 0
+        with self._lock:
+            buffer = self._feeds.setdefault(feed, deque(maxlen=self.max_per_feed))
+            watermark = self._watermarks.get(feed)
+
+            # The API lists newest first; add oldest first so the buffer ends newest first
+            for raw in reversed(raw_articles):
+                keys = self.article_keys(raw)
+                if not keys:
+                    continue
+
+                article = next((self._index[key] for key in keys if key in self._index), None)
+                if article is None:
+                    article = parse(raw)
+                    article['id'] = keys[0].split(':', 1)[1][:16]
+                    new += 1
+
+                for key in keys:
+                    self._index[key] = article
+                    self._index.move_to_end(key)
+
+                if not any(existing['id'] == article['id'] for existing in buffer):
+                    buffer.appendleft(article)
+
+                published = raw.get('publishedAt')
+                if published and (watermark is None or published > watermark):
+                    watermark = published
+
+            if watermark:
+                self._watermarks[feed] = watermark
+
+            while len(self._index) > self.max_articles:
+                self._index.popitem(last=False)
+
+        return new
+
+    def articles(self, feed, limit=None):
+        """Latest articles of a feed, newest first"""
+        with self._lock:
+            articles = list(self._feeds.get(feed, ()))
+        return articles[:limit] if limit else articles
+
+    def status(self):
+        """Index size and watermark per feed, for monitoring"""
+        with self._lock:
+            return {
+                'indexed': len(self._index),
+                'feeds': [
+                    {'feed': list(feed), 'articles': len(buffer), 'newest': self._watermarks.get(feed)}
+                    for feed, buffer in self._feeds.items()
+                ]
+            }
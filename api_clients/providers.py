@@ -0,0 +1,34 @@
+# Provider tables shared by the rate limiters, circuit breakers, HTTP cache
+# and scheduler. Nothing is imported here, so the dashboard can use them at
+# startup without loading requests.
+
+# Provider behind each API host, so the transports can pick a breaker and limiter per request
+PROVIDER_HOSTS = {
+    'api.openweathermap.org': 'openweather',
+    'newsapi.org': 'newsapi',
+    'api.polygon.io': 'polygon',
+    'www.alphavantage.co': 'alpha_vantage',
+    'api.twitter.com': 'twitter',
+    'api.quotable.io': 'quotable'
+}
+
+# Free-tier limits per provider: (requests, per seconds)
+PROVIDER_LIMITS = {
+    'alpha_vantage': (5, 60),       # 5 calls/minute
+    'polygon': (5, 60),             # 5 calls/minute
+    'openweather': (60, 60),        # 60 calls/minute
+    'newsapi': (100, 86400),        # 100 requests/day
+    'twitter': (60, 900),           # 60 searches/15 minutes
+    'reddit': (100, 60),            # 100 requests/minute (OAuth)
+    'quotable': (180, 60)           # 180 requests/minute
+}
+
+# Provider each dashboard fetch task draws quota from, and the requests one refresh costs
+TASK_PROVIDERS = {
+    'weather': ('openweather', 1),
+    'news': ('newsapi', 1),
+    'quote': ('quotable', 1),
+    'twitter': ('twitter', 1),
+    'reddit': ('reddit', 1),
+    'stocks': ('polygon', 1)      # Every watchlist in one fetch plan
+}
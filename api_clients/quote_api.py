@@ -1,9 +1,12 @@
-import requests
+from api_clients.transport import get_default_transport
+from api_clients.async_transport import get_default_async_transport
 
 class QuoteAPI:
     """Client for Quotable API (no key required)"""
 
-    def __init__(self):
+    def __init__(self, transport=None, async_transport=None):
+        self.http = transport or get_default_transport()
+        self.async_http = async_transport or get_default_async_transport()
         self.base_url = "https://api.quotable.io"
 
     def get_random_quote(self):
@@ -14,20 +17,18 @@ class QuoteAPI:
             dict: Quote data or None if error
         """
         try:
-            url = f"{self.base_url}/random"
+            response = self.http.get(f"{self.base_url}/random")
+            return self._parse_random_quote(response)
 
-            response = requests.get(url, timeout=10)
-
-            if response.status_code == 200:
-                data = response.json()
+        except Exception as e:
+            print(f"Error getting quote: {str(e)}")
+            return None
 
-                return {
-                    'text': data.get('content', ''),
-                    'author': data.get('author', 'Unknown'),
-                    'tags': data.get('tags', [])
-                }
-            else:
-                return None
+    async def get_random_quote_async(self):
+        """Async version of get_random_quote"""
+        try:
+            response = await self.async_http.get(f"{self.base_url}/random")
+            return self._parse_random_quote(response)
 
         except Exception as e:
             print(f"Error getting quote: {str(e)}")
@@ -36,24 +37,47 @@ class QuoteAPI:
     def get_quote_by_tag(self, tag='inspirational'):
         """Get quote by specific tag"""
         try:
-            url = f"{self.base_url}/random"
-            params = {'tags': tag}
+            response = self.http.get(f"{self.base_url}/random", params={'tags': tag})
+            return self._parse_tagged_quote(response)
 
-            response = requests.get(url, params=params, timeout=10)
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            return None
 
-            if response.status_code == 200:
-                data = response.json()
-                return {
-                    'text': data.get('content'),
-                    'author': data.get('author')
-                }
-            else:
-                return None
+    async def get_quote_by_tag_async(self, tag='inspirational'):
+        """Async version of get_quote_by_tag"""
+        try:
+            response = await self.async_http.get(f"{self.base_url}/random", params={'tags': tag})
+            return self._parse_tagged_quote(response)
 
         except Exception as e:
             print(f"Error: {str(e)}")
             return None
 
+    def _parse_random_quote(self, response):
+        """Build a quote from a /random response"""
+        if response.status_code == 200:
+            data = response.json()
+
+            return {
+                'text': data.get('content', ''),
+                'author': data.get('author', 'Unknown'),
+                'tags': data.get('tags', [])
+            }
+        else:
+            return None
+
+    def _parse_tagged_quote(self, response):
+        """Build a quote from a tagged /random response"""
+        if response.status_code == 200:
+            data = response.json()
+            return {
+                'text': data.get('content'),
+                'author': data.get('author')
+            }
+        else:
+            return None
+
 
 # Test
 if __name__ == '__main__':
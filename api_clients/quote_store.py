@@ -0,0 +1,402 @@
+import os
+import json
+import mmap
+import time
+import bisect
+import threading
+from array import array
+from contextlib import contextmanager
+from api_clients.config import BASE_DIR
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; only one process may then write a store
+    fcntl = None
+
+
+DEFAULT_PATH = os.path.join(BASE_DIR, 'quote_history')
+
+
+# Column name -> array typecode. Each column is its own append-only file of
+# fixed-width native values, so row i is at offset i * itemsize in every file.
+COLUMNS = {
+    'symbol': 'i',      # Symbol id (see symbols.json)
+    'timestamp': 'd',   # Unix time the quote was fetched
+    'price': 'd',
+    'change': 'd',
+    'volume': 'q'
+}
+
+
+class _Column:
+    """One append-only column file, read through a memory map"""
+
+    def __init__(self, path, typecode):
+        self.path = path
+        self.typecode = typecode
+        self.itemsize = array(typecode).itemsize
+
+        self._file = open(path, 'ab')
+        self._map = None
+        self._view = None
+
+    def __len__(self):
+        return os.path.getsize(self.path) // self.itemsize
+
+    def truncate(self, rows):
+        """Drop a partially written tail (e.g. after a crash mid-append)"""
+        self._unmap()
+        self._file.truncate(rows * self.itemsize)
+
+    def append(self, values):
+        """Append values and flush them to the file"""
+        self._file.write(array(self.typecode, values).tobytes())
+        self._file.flush()
+
+    def view(self, rows):
+        """
+        Memory-mapped values of the first `rows` rows
+
+        The map is only rebuilt when rows were appended since the last call.
+        """
+        if rows == 0:
+            return []
+
+        if self._view is None or len(self._view) < rows:
+            self._unmap()
+            with open(self.path, 'rb') as f:
+                self._map = mmap.mmap(f.fileno(), rows * self.itemsize, access=mmap.ACCESS_READ)
+            self._view = memoryview(self._map).cast(self.typecode)
+
+        return self._view
+
+    def _unmap(self):
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def close(self):
+        self._unmap()
+        self._file.close()
+
+
+class QuoteStore:
+    """
+    Append-only columnar history of stock quotes
+
+    Every fetched quote becomes one row (symbol, timestamp, price, change,
+    volume). Columns live in separate binary files under one directory and
+    are read through memory maps, so months of quotes for hundreds of
+    symbols take a few dozen bytes per row and are never parsed into dicts
+    until queried. Per-symbol row indexes are rebuilt from the symbol column
+    when the store is opened.
+
+    Several processes can share a store: appends hold an exclusive lock on
+    the directory's lock file and first pick up the rows and symbols other
+    processes added, and readers catch up on rows appended since.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        """
+        Args:
+            path (str): Directory holding the column files (defaults to
+                quote_history next to the code)
+        """
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._columns = {name: _Column(os.path.join(path, f"{name}.bin"), typecode) for name, typecode in COLUMNS.items()}
+
+        self._symbols_path = os.path.join(path, 'symbols.json')
+        self._lock_path = os.path.join(path, 'lock')
+        self._symbol_ids = {}
+        self._index = {}
+        self._rows = 0
+
+        self._load()
+
+    def __len__(self):
+        return self._rows
+
+    def symbols(self):
+        """Symbols with stored history"""
+        with self._lock:
+            self._catch_up()
+            return [symbol for symbol in self._symbol_ids if self._index.get(self._symbol_ids[symbol])]
+
+    def append(self, symbol, quote, timestamp=None):
+        """
+        Store one quote
+
+        Quotes no newer than the symbol's latest row are skipped, so each
+        symbol's rows stay in time order.
+
+        Args:
+            symbol (str): Stock symbol
+            quote (dict): Quote with 'price', 'change' and 'volume'
+            timestamp (float): Unix time of the quote (defaults to now)
+
+        Returns:
+            bool: Whether the quote was stored
+        """
+        return self.append_quotes({symbol: quote}, timestamp) == 1
+
+    def append_quotes(self, quotes, timestamp=None):
+        """
+        Store a batch of quotes taken at the same time
+
+        Args:
+            quotes (dict): Symbol -> quote dict
+            timestamp (float): Unix time of the quotes (defaults to now)
+
+        Returns:
+            int: Number of quotes stored
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+
+        with self._lock, self._writer_lock():
+            # Another process may have appended rows or added symbols
+            self._load_symbols()
+            self._catch_up()
+
+            timestamps = self._columns['timestamp'].view(self._rows)
+            rows = {name: [] for name in COLUMNS}
+
+            for symbol, quote in quotes.items():
+                if not quote or quote.get('price') is None:
+                    continue
+
+                symbol_id = self._symbol_id(symbol)
+                index = self._index.setdefault(symbol_id, array('q'))
+                if index and timestamps[index[-1]] >= timestamp:
+                    continue
+
+                rows['symbol'].append(symbol_id)
+                rows['timestamp'].append(timestamp)
+                rows['price'].append(float(quote['price']))
+                rows['change'].append(float(quote.get('change') or 0))
+                rows['volume'].append(int(quote.get('volume') or 0))
+                index.append(self._rows + len(rows['symbol']) - 1)
+
+            if not rows['symbol']:
+                return 0
+
+            # Write the symbol column last: a crash before it leaves rows that
+            # _load() truncates away
+            for name in ('timestamp', 'price', 'change', 'volume', 'symbol'):
+                self._columns[name].append(rows[name])
+
+            self._rows += len(rows['symbol'])
+            return len(rows['symbol'])
+
+    def query(self, symbol, start=None, end=None):
+        """
+        Stored quotes of a symbol in a time range
+
+        Args:
+            symbol (str): Stock symbol
+            start (float): Earliest Unix time (inclusive, None for all)
+            end (float): Latest Unix time (inclusive, None for all)
+
+        Returns:
+            list: Dicts with 'timestamp', 'price', 'change' and 'volume', oldest first
+        """
+        with self._lock:
+            self._catch_up()
+            index = self._index.get(self._symbol_ids.get(symbol))
+            if not index:
+                return []
+
+            views = {name: self._columns[name].view(self._rows) for name in ('timestamp', 'price', 'change', 'volume')}
+            timestamps = views['timestamp']
+
+            # Rows of one symbol are in time order, so the range is a slice of its index
+            lo = 0 if start is None else bisect.bisect_left(index, start, key=timestamps.__getitem__)
+            hi = len(index) if end is None else bisect.bisect_right(index, end, key=timestamps.__getitem__)
+
+            return [
+                {
+                    'timestamp': timestamps[row],
+                    'price': views['price'][row],
+                    'change': views['change'][row],
+                    'volume': views['volume'][row]
+                }
+                for row in index[lo:hi]
+            ]
+
+    def latest(self, symbol):
+        """Most recent stored quote of a symbol, or None"""
+        with self._lock:
+            self._catch_up()
+            index = self._index.get(self._symbol_ids.get(symbol))
+            if not index:
+                return None
+            row = index[-1]
+            views = {name: self._columns[name].view(self._rows) for name in ('timestamp', 'price', 'change', 'volume')}
+            return {name: view[row] for name, view in views.items()}
+
+    def snapshot(self, columns=None, start=None):
+        """
+        Copy of columns, for vectorized analysis
+
+        Args:
+            columns (list): Column names (defaults to all)
+            start (float): Copy only from the first row of any symbol at or after
+                this Unix time (None copies the whole history). Earlier rows
+                can follow it, so callers still filter by timestamp.
+
+        Returns:
+            tuple: (bytes per column name, symbol -> id dict)
+        """
+        with self._lock:
+            self._catch_up()
+            first = 0 if start is None else self._first_row_since(start)
+            data = {name: self._columns[name].view(self._rows)[first:self._rows].tobytes() if self._rows else b''
+                    for name in (columns or COLUMNS)}
+            return data, dict(self._symbol_ids)
+
+    def close(self):
+        """Close the column files"""
+        with self._lock:
+            for column in self._columns.values():
+                column.close()
+
+    def _first_row_since(self, start):
+        """
+        Lowest row holding a quote at or after `start` (caller holds the lock)
+
+        Rows of one symbol are in time order, so each symbol's first such row
+        is a bisect of its index.
+        """
+        timestamps = self._columns['timestamp'].view(self._rows)
+        first = self._rows
+        for index in self._index.values():
+            lo = bisect.bisect_left(index, start, key=timestamps.__getitem__)
+            if lo < len(index):
+                first = min(first, index[lo])
+        return first
+
+    def _symbol_id(self, symbol):
+        """Id of a symbol, registering new ones (caller holds the lock)"""
+        symbol_id = self._symbol_ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = len(self._symbol_ids)
+            self._symbol_ids[symbol] = symbol_id
+            self._save_symbols()
+        return symbol_id
+
+    def _save_symbols(self):
+        """Write the symbol table atomically (caller holds both locks)"""
+        tmp_path = f"{self._symbols_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self._symbol_ids, f)
+        os.replace(tmp_path, self._symbols_path)
+
+    def _load_symbols(self):
+        """Read the symbol table, which other processes may have added to (caller holds the lock)"""
+        try:
+            if os.path.exists(self._symbols_path):
+                with open(self._symbols_path, 'r') as f:
+                    self._symbol_ids.update(json.load(f))
+        except Exception as e:
+            print(f"Could not load quote history symbols: {e}")
+
+    @contextmanager
+    def _writer_lock(self):
+        """Exclusive lock across processes for appending to the store"""
+        with open(self._lock_path, 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _catch_up(self):
+        """
+        Index rows other processes appended since (caller holds the lock)
+
+        The symbol column is written last, so every row it covers is
+        complete in the other columns.
+        """
+        rows = len(self._columns['symbol'])
+        if rows <= self._rows:
+            return
+
+        # Rows of a symbol this process hasn't seen need the newer symbol table
+        self._load_symbols()
+        symbols = self._columns['symbol'].view(rows)
+        for row in range(self._rows, rows):
+            self._index.setdefault(symbols[row], array('q')).append(row)
+        self._rows = rows
+
+    def _load(self):
+        """Open existing column files and rebuild the per-symbol indexes"""
+        # Under the writer lock, so another process's append in progress isn't truncated
+        with self._writer_lock():
+            self._load_symbols()
+
+            # Columns can only disagree after an interrupted append; keep the complete rows
+            rows = min(len(column) for column in self._columns.values())
+            for column in self._columns.values():
+                if len(column) > rows:
+                    column.truncate(rows)
+
+        self._catch_up()
+
+
+def downsample(points, interval):
+    """
+    Aggregate quotes into fixed time buckets
+
+    Args:
+        points (list): Quotes from QuoteStore.query(), oldest first
+        interval (float): Bucket width in seconds
+
+    Returns:
+        list: One dict per non-empty bucket with 'timestamp' (bucket start),
+            'open', 'high', 'low', 'close', 'change' and 'volume' (the last in the bucket)
+    """
+    buckets = []
+    for point in points:
+        start = point['timestamp'] - point['timestamp'] % interval
+        price = point['price']
+
+        if buckets and buckets[-1]['timestamp'] == start:
+            bucket = buckets[-1]
+            bucket['high'] = max(bucket['high'], price)
+            bucket['low'] = min(bucket['low'], price)
+            bucket['close'] = price
+            bucket['change'] = point['change']
+            bucket['volume'] = point['volume']
+        else:
+            buckets.append({
+                'timestamp': start,
+                'open': price,
+                'high': price,
+                'low': price,
+                'close': price,
+                'change': point['change'],
+                'volume': point['volume']
+            })
+
+    return buckets
+
+
+_default_store = None
+_default_lock = threading.Lock()
+
+
+def get_default_quote_store():
+    """Get the process-wide quote history store"""
+    global _default_store
+
+    with _default_lock:
+        if _default_store is None:
+            _default_store = QuoteStore(os.getenv('QUOTE_HISTORY_PATH', DEFAULT_PATH))
+        return _default_store
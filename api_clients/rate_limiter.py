@@ -0,0 +1,149 @@
+import time
+import asyncio
+import threading
+from urllib.parse import urlparse
+import requests
+from api_clients.providers import PROVIDER_HOSTS, PROVIDER_LIMITS
+
+
+class RateLimitedError(requests.exceptions.RequestException):
+    """Raised instead of calling a provider whose quota won't refill in time"""
+
+
+class TokenBucket:
+    """Thread-safe and asyncio-safe token bucket rate limiter"""
+
+    def __init__(self, rate, capacity, name=None):
+        """
+        Args:
+            rate (float): Tokens added per second
+            capacity (int): Maximum burst size
+            name (str): Provider name for status reports
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.name = name
+
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_period(cls, requests, seconds, name=None):
+        """Build a bucket allowing bursts of `requests` and refilling over `seconds`"""
+        return cls(requests / seconds, requests, name)
+
+    def _refill(self):
+        """Add tokens earned since the last update (caller holds the lock)"""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _reserve(self, tokens, max_wait=None):
+        """
+        Take tokens, going into debt if needed
+
+        Args:
+            tokens (int): Tokens to take
+            max_wait (float): Take nothing if the wait would be longer (None waits as long as needed)
+
+        Returns:
+            float: Seconds the caller must wait before using the reservation,
+                or None if nothing was taken
+        """
+        with self._lock:
+            self._refill()
+            wait = max(0.0, (tokens - self._tokens) / self.rate)
+            if max_wait is not None and wait > max_wait:
+                return None
+            self._tokens -= tokens
+            return wait
+
+    def acquire(self, tokens=1, max_wait=None):
+        """
+        Block until tokens are available
+
+        Args:
+            tokens (int): Tokens to take
+            max_wait (float): Give up at once if the tokens won't be available within this many seconds
+
+        Returns:
+            float: Seconds spent waiting, or None if max_wait was too short
+        """
+        wait = self._reserve(tokens, max_wait)
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens=1, max_wait=None):
+        """Wait without blocking the event loop until tokens are available (see acquire)"""
+        wait = self._reserve(tokens, max_wait)
+        if wait:
+            await asyncio.sleep(wait)
+        return wait
+
+    def try_acquire(self, tokens=1):
+        """
+        Take tokens only if they are available right now
+
+        Returns:
+            bool: Whether the tokens were taken
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def available(self):
+        """Number of tokens available right now"""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def status(self):
+        """Current state for monitoring"""
+        return {
+            'provider': self.name,
+            'available': round(self.available(), 2),
+            'capacity': self.capacity,
+            'rate_per_minute': round(self.rate * 60, 4)
+        }
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider):
+    """
+    Get the process-wide rate limiter for a provider
+
+    Every client calling the same provider shares one bucket, so
+    concurrent fetches draw from the same quota.
+
+    Args:
+        provider (str): Provider name from PROVIDER_LIMITS
+
+    Returns:
+        TokenBucket: The shared limiter
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            requests, seconds = PROVIDER_LIMITS[provider]
+            limiter = TokenBucket.per_period(requests, seconds, name=provider)
+            _limiters[provider] = limiter
+        return limiter
+
+
+def limiter_for_url(url):
+    """
+    Rate limiter for the provider serving a URL
+
+    Returns:
+        TokenBucket: The shared limiter, or None for hosts without one
+    """
+    provider = PROVIDER_HOSTS.get(urlparse(url).hostname)
+    return get_rate_limiter(provider) if provider in PROVIDER_LIMITS else None
@@ -1,26 +1,51 @@
-import praw
 import os
-from dotenv import load_dotenv
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from api_clients.transport import get_default_transport
+from api_clients.circuit_breaker import get_circuit_breaker
+from api_clients.rate_limiter import get_rate_limiter
+from api_clients.config import load_config
 
-load_dotenv()
+load_config()
 
 class RedditAPI:
     """Client for Reddit API"""
 
-    def __init__(self):
+    def __init__(self, transport=None):
+        self.http = transport or get_default_transport()
         self.client_id = os.getenv('REDDIT_CLIENT_ID')
         self.client_secret = os.getenv('REDDIT_CLIENT_SECRET')
         self.username = os.getenv('REDDIT_USERNAME')
         self.password = os.getenv('REDDIT_PASSWORD')
 
-        self.reddit = praw.Reddit(
-            client_id=self.client_id,
-            client_secret=self.client_secret,
-            username=self.username,
-            password=self.password,
-            user_agent='dashboard-app/0.1 by Legal-Mongoose414'
-        )
+        # praw is slow to import, so the client is only built on first use
+        self._reddit = None
+        self._reddit_lock = threading.Lock()
+
+        # praw makes its own requests, so the breaker and rate limiter are
+        # applied here rather than in the transport
+        self.breaker = get_circuit_breaker('reddit')
+        self.limiter = get_rate_limiter('reddit')
+
+    @property
+    def reddit(self):
+        """praw.Reddit instance, built on first use"""
+        if self._reddit is None:
+            with self._reddit_lock:
+                if self._reddit is None:
+                    import praw
+
+                    self._reddit = praw.Reddit(
+                        client_id=self.client_id,
+                        client_secret=self.client_secret,
+                        username=self.username,
+                        password=self.password,
+                        user_agent='dashboard-app/0.1 by Legal-Mongoose414',
+                        requestor_kwargs={'session': self.http.create_session()}
+                    )
+        return self._reddit
 
     def get_trending_posts(self, subreddit_name='all', num_posts=5, time_filter='day', category=None):
         """
@@ -34,6 +59,10 @@ class RedditAPI:
         Returns:
             list: Trending posts or None if error
         """
+        if not self.breaker.allow():
+            print("Reddit circuit is open - using mock data")
+            return self.get_mock_posts(subreddit_name, num_posts, category)
+
         try:
             # Map categories to relevant subreddits
             if category:
@@ -48,38 +77,25 @@ class RedditAPI:
                 }
                 subreddit_name = category_subreddits.get(category.lower(), subreddit_name)
 
-            subreddit = self.reddit.subreddit(subreddit_name)
-            posts = []
-
-            for submission in subreddit.hot(limit=num_posts):
-                # Calculate post age
-                created_time = datetime.fromtimestamp(submission.created_utc)
-                age = datetime.now() - created_time
-
-                if age.days > 0:
-                    age_str = f"{age.days}d ago"
-                elif age.seconds >= 3600:
-                    age_str = f"{age.seconds // 3600}h ago"
-                else:
-                    age_str = f"{age.seconds // 60}m ago"
-
-                posts.append({
-                    'title': submission.title,
-                    'subreddit': submission.subreddit.display_name,
-                    'author': str(submission.author),
-                    'score': submission.score,
-                    'num_comments': submission.num_comments,
-                    'url': f"https://reddit.com{submission.permalink}",
-                    'age': age_str,
-                    'selftext': submission.selftext[:200] if submission.selftext else ''
-                })
+            posts = [self._format_post(post) for post in self._hot_listing(subreddit_name, num_posts)]
 
+            self.breaker.record_success()
             return posts
 
         except Exception as e:
+            self._record_error(e)
             print(f"Error getting Reddit posts: {str(e)}")
             return self.get_mock_posts(subreddit_name, num_posts, category)
 
+    async def get_trending_posts_async(self, subreddit_name='all', num_posts=5, time_filter='day', category=None):
+        """
+        Async version of get_trending_posts
+
+        praw has no async API, so the listing is read in a worker thread
+        while the event loop keeps serving other fetches.
+        """
+        return await asyncio.to_thread(self.get_trending_posts, subreddit_name, num_posts, time_filter, category)
+
     def get_mock_posts(self, subreddit_name="technology", num_posts=5, category=None):
         """Provide mock Reddit posts when API is unavailable"""
         mock_posts = {
@@ -111,19 +127,123 @@ class RedditAPI:
         return subreddit_posts[:num_posts]
 
     def get_top_from_multiple_subs(self, subreddits=['technology', 'worldnews', 'news'], limit_per_sub=2):
-        """Get top posts from multiple subreddits"""
-        all_posts = []
+        """
+        Get top posts from multiple subreddits, merged and ranked by score
+
+        One combined r/a+b+c hot listing serves every subreddit. Subreddits
+        with fewer than limit_per_sub posts on that page (drowned out by
+        busier ones) get a second combined listing of their own. Only if the
+        combined listing fails are the subreddits fetched one by one, in
+        parallel.
+
+        Args:
+            subreddits (list): Subreddit names
+            limit_per_sub (int): Posts to keep per subreddit
+
+        Returns:
+            list: Up to limit_per_sub posts per subreddit, highest score first
+        """
+        if not subreddits:
+            return []
+
+        if not self.breaker.allow():
+            print("Reddit circuit is open - using mock data")
+            return self._fetch_each_sub(subreddits, limit_per_sub)
+
+        try:
+            by_sub = {sub.lower(): [] for sub in subreddits}
+            self._collect_combined(subreddits, by_sub, limit_per_sub)
 
-        for sub in subreddits:
-            posts = self.get_trending_posts(subreddit_name=sub, num_posts=limit_per_sub)
-            if posts:
-                all_posts.extend(posts)
+            # Quiet subreddits can be crowded out of a shared page
+            missing = [sub for sub in subreddits if len(by_sub[sub.lower()]) < limit_per_sub]
+            if missing and len(missing) < len(subreddits):
+                self._collect_combined(missing, by_sub, limit_per_sub)
 
-        # Sort by score
+            self.breaker.record_success()
+
+        except Exception as e:
+            self._record_error(e)
+            print(f"Error getting combined Reddit listing: {str(e)}")
+            return self._fetch_each_sub(subreddits, limit_per_sub)
+
+        all_posts = [post for posts in by_sub.values() for post in posts]
         all_posts.sort(key=lambda x: x['score'], reverse=True)
+        return all_posts
+
+    async def get_top_from_multiple_subs_async(self, subreddits=['technology', 'worldnews', 'news'], limit_per_sub=2):
+        """Async version of get_top_from_multiple_subs (praw is read in a worker thread)"""
+        return await asyncio.to_thread(self.get_top_from_multiple_subs, subreddits, limit_per_sub)
+
+    def _record_error(self, error):
+        """Count upstream failures against the breaker; release the probe for anything else"""
+        import prawcore
+
+        if isinstance(error, (prawcore.exceptions.ServerError, prawcore.exceptions.TooManyRequests, prawcore.exceptions.RequestException)):
+            self.breaker.record_failure()
+        else:
+            self.breaker.release()
+
+    def _collect_combined(self, subreddits, by_sub, limit_per_sub):
+        """Add posts from one combined hot listing of subreddits to by_sub, up to limit_per_sub each"""
+        seen = {post['url'] for posts in by_sub.values() for post in posts}
+        # A page holds at most 100 posts; ask for enough that every subreddit can fill its share
+        limit = min(100, max(25, limit_per_sub * len(subreddits) * 3))
+
+        for post in self._hot_listing('+'.join(subreddits), limit):
+            posts = by_sub.get(post.get('subreddit', '').lower())
+            if posts is None or len(posts) >= limit_per_sub:
+                continue
+
+            formatted = self._format_post(post)
+            if formatted['url'] not in seen:
+                seen.add(formatted['url'])
+                posts.append(formatted)
 
+    def _fetch_each_sub(self, subreddits, limit_per_sub):
+        """Fallback: one listing per subreddit, fetched in parallel"""
+        with ThreadPoolExecutor(max_workers=min(8, len(subreddits)), thread_name_prefix='reddit-sub') as pool:
+            results = pool.map(lambda sub: self.get_trending_posts(subreddit_name=sub, num_posts=limit_per_sub), subreddits)
+            all_posts = [post for posts in results if posts for post in posts]
+
+        all_posts.sort(key=lambda x: x['score'], reverse=True)
         return all_posts[:limit_per_sub * len(subreddits)]
 
+    def _hot_listing(self, subreddit_name, limit):
+        """
+        Raw post data of a hot listing, in one request (limit <= 100)
+
+        The listing JSON already has every field the dashboard shows, so it is
+        read directly rather than through praw Submission objects, whose
+        attributes can trigger extra lazy requests.
+        """
+        self.limiter.acquire()
+        listing = self.reddit.request(method='GET', path=f"r/{subreddit_name}/hot", params={'limit': limit, 'raw_json': 1})
+        return [child['data'] for child in listing.get('data', {}).get('children', []) if child.get('kind') == 't3']
+
+    def _format_post(self, post):
+        """Build the dashboard dict for one post from listing data"""
+        # Calculate post age
+        created_time = datetime.fromtimestamp(post.get('created_utc', 0))
+        age = datetime.now() - created_time
+
+        if age.days > 0:
+            age_str = f"{age.days}d ago"
+        elif age.seconds >= 3600:
+            age_str = f"{age.seconds // 3600}h ago"
+        else:
+            age_str = f"{age.seconds // 60}m ago"
+
+        selftext = post.get('selftext') or ''
+        return {
+            'title': post.get('title', ''),
+            'subreddit': post.get('subreddit', ''),
+            'author': post.get('author') or '[deleted]',
+            'score': post.get('score', 0),
+            'num_comments': post.get('num_comments', 0),
+            'url': f"https://reddit.com{post.get('permalink', '')}",
+            'age': age_str,
+            'selftext': selftext[:200]
+        }
 
 # Test
 if __name__ == '__main__':
@@ -0,0 +1,257 @@
+import time
+import numpy as np
+from api_clients.quote_store import COLUMNS
+
+
+# Metrics quotes can be ranked by
+METRICS = ('change_percent', 'change', 'price', 'volume', 'return', 'sma', 'ema', 'volatility', 'trend')
+
+
+def price_matrix(store, symbols, start, end=None, interval=300, fill=True):
+    """
+    Align stored quotes of many symbols on one time grid
+
+    Quotes are bucketed into `interval`-second columns (the last quote in a
+    bucket wins) and gaps are filled with the previous price. Only the rows
+    from `start` on are copied out of the store, so the cost follows the
+    window rather than the whole history.
+
+    Args:
+        store (QuoteStore): Quote history
+        symbols (list): Symbols, one matrix row each
+        start (float): Earliest Unix time
+        end (float): Latest Unix time (None for up to now)
+        interval (float): Bucket width in seconds
+        fill (bool): Fill gaps with the previous price (False leaves them NaN)
+
+    Returns:
+        tuple: (bucket start times, prices with shape (len(symbols), buckets));
+            NaN before a symbol's first quote
+    """
+    columns, symbol_ids = store.snapshot(['symbol', 'timestamp', 'price'], start=start)
+    ids = np.frombuffer(columns['symbol'], dtype=np.dtype(COLUMNS['symbol']))
+    timestamps = np.frombuffer(columns['timestamp'], dtype=np.dtype(COLUMNS['timestamp']))
+    prices = np.frombuffer(columns['price'], dtype=np.dtype(COLUMNS['price']))
+
+    # Map symbol ids to matrix rows (-1 for symbols that weren't asked for)
+    rows = np.full(max(symbol_ids.values(), default=-1) + 1, -1, dtype=np.int64)
+    for row, symbol in enumerate(symbols):
+        if symbol in symbol_ids:
+            rows[symbol_ids[symbol]] = row
+
+    mask = rows[ids] >= 0 if len(ids) else np.zeros(0, dtype=bool)
+    mask &= timestamps >= start
+    if end is not None:
+        mask &= timestamps <= end
+
+    if not mask.any():
+        return np.zeros(0), np.full((len(symbols), 0), np.nan)
+
+    timestamps = timestamps[mask]
+    origin = timestamps.min() - timestamps.min() % interval
+    buckets = ((timestamps - origin) // interval).astype(np.int64)
+
+    matrix = np.full((len(symbols), buckets.max() + 1), np.nan)
+    # Rows are stored in time order, so later quotes overwrite earlier ones in a bucket
+    matrix[rows[ids[mask]], buckets] = prices[mask]
+
+    return origin + np.arange(matrix.shape[1]) * interval, forward_fill(matrix) if fill else matrix
+
+
+def forward_fill(matrix):
+    """Replace NaNs with the last valid value to their left, row by row"""
+    valid = ~np.isnan(matrix)
+    last_valid = np.where(valid, np.arange(matrix.shape[1]), 0)
+    np.maximum.accumulate(last_valid, axis=1, out=last_valid)
+    filled = matrix[np.arange(matrix.shape[0])[:, None], last_valid]
+    # Leading gaps have nothing to fill from
+    filled[~np.maximum.accumulate(valid, axis=1)] = np.nan
+    return filled
+
+
+def returns(prices, periods=1):
+    """Simple returns over `periods` buckets, shape (symbols, buckets - periods)"""
+    if prices.shape[1] <= periods:
+        return np.full((prices.shape[0], 0), np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return prices[:, periods:] / prices[:, :-periods] - 1
+
+
+def sma(prices, window):
+    """Simple moving average along each row; NaN until a full window is available"""
+    result = np.full(prices.shape, np.nan)
+    if prices.shape[1] < window:
+        return result
+
+    sums = np.cumsum(np.nan_to_num(prices), axis=1)
+    counts = np.cumsum(~np.isnan(prices), axis=1)
+    window_sums = sums[:, window - 1:] - np.pad(sums, ((0, 0), (1, 0)))[:, :-window]
+    window_counts = counts[:, window - 1:] - np.pad(counts, ((0, 0), (1, 0)))[:, :-window]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result[:, window - 1:] = np.where(window_counts == window, window_sums / window, np.nan)
+    return result
+
+
+def ema(prices, span):
+    """
+    Exponential moving average along each row (alpha = 2 / (span + 1))
+
+    The recursion runs over time, but each step updates every symbol at once.
+    """
+    alpha = 2 / (span + 1)
+    result = np.full(prices.shape, np.nan)
+    current = np.full(prices.shape[0], np.nan)
+
+    for column in range(prices.shape[1]):
+        values = prices[:, column]
+        current = np.where(np.isnan(current), values, np.where(np.isnan(values), current, alpha * values + (1 - alpha) * current))
+        result[:, column] = current
+
+    return result
+
+
+def volatility(prices, window=None, observed=None):
+    """
+    Standard deviation of per-bucket log returns for each symbol
+
+    Args:
+        prices (ndarray): Price matrix from price_matrix()
+        window (int): Use only returns in the last `window` buckets (None for all)
+        observed (ndarray): Boolean matrix of the buckets that hold a quote. Only
+            returns ending in one are used, each from the previous quote, so
+            forward-filled gaps don't count as zero returns.
+
+    Returns:
+        ndarray: One value per symbol (NaN with fewer than two returns)
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_returns = np.diff(np.log(prices), axis=1)
+    if observed is not None:
+        log_returns[~observed[:, 1:]] = np.nan
+    if window:
+        log_returns = log_returns[:, -window:]
+
+    counts = (~np.isnan(log_returns)).sum(axis=1)
+    result = np.full(prices.shape[0], np.nan)
+    enough = counts >= 2
+    if enough.any():
+        result[enough] = np.nanstd(log_returns[enough], axis=1, ddof=1)
+    return result
+
+
+def watchlist_metrics(quotes, store=None, interval=300, lookback=86400, sma_window=12, ema_span=12, vol_window=48):
+    """
+    Compute metrics for a whole watchlist in one vectorized pass
+
+    Args:
+        quotes (dict): Symbol -> current quote dict
+        store (QuoteStore): Quote history for the time-series metrics (None skips them)
+        interval (float): Bucket width in seconds for the history
+        lookback (float): Seconds of history to use
+        sma_window (int): SMA window in buckets
+        ema_span (int): EMA span in buckets
+        vol_window (int): Volatility window in buckets
+
+    Returns:
+        dict: Symbol -> metrics dict ('price', 'change', 'change_percent', 'volume',
+            'return', 'sma', 'ema', 'volatility', 'trend'); None where there
+            isn't enough history
+    """
+    symbols = list(quotes)
+    if not symbols:
+        return {}
+
+    current = {
+        name: np.array([np.nan if quotes[symbol].get(name) is None else float(quotes[symbol][name]) for symbol in symbols])
+        for name in ('price', 'change', 'change_percent', 'volume')
+    }
+
+    nan = np.full(len(symbols), np.nan)
+    period_return = latest_sma = latest_ema = vol = nan
+
+    if store is not None:
+        _, observed_prices = price_matrix(store, symbols, time.time() - lookback, interval=interval, fill=False)
+        prices = forward_fill(observed_prices)
+        if prices.shape[1]:
+            first = prices[np.arange(len(symbols)), np.argmax(~np.isnan(prices), axis=1)]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                period_return = prices[:, -1] / first - 1
+            latest_sma = sma(prices, sma_window)[:, -1]
+            latest_ema = ema(prices, ema_span)[:, -1]
+            vol = volatility(prices, vol_window, observed=~np.isnan(observed_prices))
+
+    # Price relative to its moving average: >0 trending up
+    with np.errstate(divide='ignore', invalid='ignore'):
+        trend = current['price'] / latest_sma - 1
+
+    computed = {
+        **current,
+        'return': period_return,
+        'sma': latest_sma,
+        'ema': latest_ema,
+        'volatility': vol,
+        'trend': trend
+    }
+
+    return {
+        symbol: {name: _to_number(values[i]) for name, values in computed.items()}
+        for i, symbol in enumerate(symbols)
+    }
+
+
+def rank(quotes, by='change_percent', descending=True, metrics=None, limit=None):
+    """
+    Order quotes by a metric
+
+    Symbols without a value for the metric go last.
+
+    Args:
+        quotes (dict): Symbol -> quote dict
+        by (str): Metric from METRICS
+        descending (bool): Highest first
+        metrics (dict): Output of watchlist_metrics() (computed without history if None)
+        limit (int): Keep only the first `limit` symbols
+
+    Returns:
+        dict: Quotes in ranked order
+    """
+    if by not in METRICS:
+        raise ValueError(f"Unknown metric '{by}' (expected one of {', '.join(METRICS)})")
+
+    metrics = metrics if metrics is not None else watchlist_metrics(quotes)
+    symbols = list(quotes)
+    values = np.array([np.nan if metrics.get(symbol, {}).get(by) is None else metrics[symbol][by] for symbol in symbols])
+
+    keys = -values if descending else values
+    order = np.argsort(np.where(np.isnan(keys), np.inf, keys), kind='stable')
+    if limit:
+        order = order[:limit]
+
+    return {symbols[i]: quotes[symbols[i]] for i in order}
+
+
+def top_movers(quotes, n=5, metrics=None):
+    """
+    Biggest gainers and losers by percent change
+
+    Returns:
+        dict: 'gainers' and 'losers', each a list of (symbol, change_percent)
+    """
+    metrics = metrics if metrics is not None else watchlist_metrics(quotes)
+    symbols = np.array(list(quotes))
+    if not len(symbols):
+        return {'gainers': [], 'losers': []}
+
+    changes = np.array([metrics[symbol]['change_percent'] or 0 for symbol in symbols])
+    order = np.argsort(changes, kind='stable')
+
+    gainers = [(str(symbols[i]), float(changes[i])) for i in order[::-1][:n] if changes[i] > 0]
+    losers = [(str(symbols[i]), float(changes[i])) for i in order[:n] if changes[i] < 0]
+    return {'gainers': gainers, 'losers': losers}
+
+
+def _to_number(value):
+    """Plain float for JSON, None for NaN/inf"""
+    value = float(value)
+    return value if np.isfinite(value) else None
@@ -1,161 +1,470 @@
-import requests
 import os
-from dotenv import load_dotenv
+import json
+import time
+import asyncio
+import threading
+from datetime import date, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from api_clients.transport import get_default_transport
+from api_clients.async_transport import get_default_async_transport
+from api_clients.rate_limiter import RateLimitedError, get_rate_limiter
+from api_clients.circuit_breaker import get_circuit_breaker
+from api_clients.quote_store import downsample, get_default_quote_store
+from api_clients.config import BASE_DIR, load_config
+
+load_config()
+
+# Watchlist config read by default, next to the app's code
+DEFAULT_WATCHLISTS_PATH = os.path.join(BASE_DIR, 'watchlists.json')
+
+
+def load_watchlists(path=None):
+    """
+    Load watchlists from a JSON config file
+
+    The file maps watchlist names to lists of symbols, e.g.
+    {"stocks": ["AAPL", "MSFT"], "energy": ["XOM", "CVX"]}. The built-in
+    'stocks' (most active) and 'etfs' lists are used for names it doesn't set.
+
+    Args:
+        path (str): Config file (defaults to WATCHLISTS_FILE or DEFAULT_WATCHLISTS_PATH)
+
+    Returns:
+        dict: Watchlist name -> list of upper-case symbols
+    """
+    watchlists = {'stocks': list(StockAPI.MOST_ACTIVE), 'etfs': list(StockAPI.POPULAR_ETFS)}
+    path = path or os.getenv('WATCHLISTS_FILE', DEFAULT_WATCHLISTS_PATH)
+
+    try:
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                for name, symbols in json.load(f).items():
+                    watchlists[name] = StockAPI.plan_fetch({name: symbols})
+    except Exception as e:
+        print(f"Could not load watchlists: {e}")
+
+    return watchlists
 
-load_dotenv()
 
 class StockAPI:
     """Client for Alpha Vantage Stock API with Polygon.io fallback"""
 
-    def __init__(self):
+    # Curated list of most actively traded stocks
+    MOST_ACTIVE = [
+        'AAPL',  # Apple
+        'MSFT',  # Microsoft
+        'NVDA',  # NVIDIA
+        'GOOGL', # Alphabet
+        'AMZN',  # Amazon
+        'TSLA',  # Tesla
+        'META',  # Meta (Facebook)
+        'AMD',   # Advanced Micro Devices
+        'NFLX',  # Netflix
+        'ADBE'   # Adobe
+    ]
+
+    # Popular ETFs
+    POPULAR_ETFS = [
+        'SPY',   # SPDR S&P 500 ETF
+        'QQQ',   # Invesco QQQ ETF (Nasdaq-100)
+        'VTI',   # Vanguard Total Stock Market ETF
+        'IWM',   # iShares Russell 2000 ETF
+        'EFA',   # iShares MSCI EAFE ETF
+        'GLD',   # SPDR Gold Shares
+        'TLT',   # iShares 20+ Year Treasury Bond ETF
+        'XLF',   # Financial Select Sector SPDR
+        'XLK',   # Technology Select Sector SPDR
+        'XLE'    # Energy Select Sector SPDR
+    ]
+
+    # Symbols per batch request
+    BATCH_SIZE = 100
+
+    def __init__(self, transport=None, async_transport=None, history=None):
+        self.http = transport or get_default_transport()
+        self.async_http = async_transport or get_default_async_transport()
+        # Opened on first use, so building a client doesn't touch the disk
+        self._history = history
         self.alpha_vantage_key = os.getenv('ALPHA_VANTAGE_API_KEY')
         self.polygon_key = os.getenv('POLYGON_API_KEY')
         self.alpha_vantage_url = "https://www.alphavantage.co/query"
         self.polygon_url = "https://api.polygon.io/v2"
 
-    def get_quote_polygon(self, symbol):
-        """Get stock quote from Polygon.io"""
-        try:
-            # Get previous day's close
-            url = f"{self.polygon_url}/aggs/ticker/{symbol}/prev"
-            params = {'apiKey': self.polygon_key}
+        self.alpha_vantage_breaker = get_circuit_breaker('alpha_vantage')
 
-            response = requests.get(url, params=params, timeout=10)
+        # Shared with every other StockAPI in the process (5 calls/min); the
+        # transport takes the tokens, this caps the per-symbol fallbacks
+        self.polygon_limiter = get_rate_limiter('polygon')
 
-            if response.status_code == 200:
-                data = response.json()
+        # The snapshot endpoint needs a paid plan; stop trying once it is refused
+        self._snapshot_available = True
 
-                if data.get('results') and len(data['results']) > 0:
-                    result = data['results'][0]
+        # Grouped daily results of completed trading days never change
+        self._grouped_daily = {}
 
-                    open_price = result.get('o', 0)
-                    close_price = result.get('c', 0)
-                    change = close_price - open_price
-                    change_percent = (change / open_price * 100) if open_price > 0 else 0
+        # Quotes fetched in the last quote_max_age seconds, reused by any
+        # watchlist or dashboard asking for the same symbol
+        self.quote_max_age = 60
+        self._recent = {}
+        self._recent_lock = threading.Lock()
 
-                    return {
-                        'symbol': symbol,
-                        'price': close_price,
-                        'change': change,
-                        'change_percent': change_percent,
-                        'volume': result.get('v', 0),
-                        'latest_trading_day': 'Previous Day',
-                        'is_up': change >= 0
-                    }
+    @property
+    def history(self):
+        """Quote history store (the process-wide one unless one was passed in)"""
+        if self._history is None:
+            self._history = get_default_quote_store()
+        return self._history
 
+    def has_alpha_vantage_key(self):
+        """Whether a real Alpha Vantage key is configured"""
+        return bool(self.alpha_vantage_key) and self.alpha_vantage_key != 'your_alphavantage_api_key'
+
+    def get_quote_polygon(self, symbol, max_wait=None):
+        """
+        Get stock quote from Polygon.io
+
+        Args:
+            symbol (str): Stock symbol
+            max_wait (float): Longest wait for Polygon.io quota (None: the transport's default)
+        """
+        try:
+            # Get previous day's close
+            url = f"{self.polygon_url}/aggs/ticker/{symbol}/prev"
+            response = self.http.get(url, params={'apiKey': self.polygon_key}, max_wait=max_wait)
+            return self._parse_polygon_prev(response, symbol)
+
+        except RateLimitedError:
+            return None
+        except Exception as e:
+            print(f"Polygon.io error for {symbol}: {str(e)}")
             return None
 
+    async def get_quote_polygon_async(self, symbol, max_wait=None):
+        """Async version of get_quote_polygon"""
+        try:
+            url = f"{self.polygon_url}/aggs/ticker/{symbol}/prev"
+            response = await self.async_http.get(url, params={'apiKey': self.polygon_key}, max_wait=max_wait)
+            return self._parse_polygon_prev(response, symbol)
+
+        except RateLimitedError:
+            return None
         except Exception as e:
             print(f"Polygon.io error for {symbol}: {str(e)}")
             return None
 
-    def get_quote(self, symbol):
+    def get_quote(self, symbol, max_wait=None):
         """
         Get current stock quote (tries Alpha Vantage, falls back to Polygon.io)
 
         Args:
             symbol (str): Stock symbol (e.g., 'AAPL', 'MSFT')
+            max_wait (float): Longest wait for Polygon.io quota (None: the transport's default)
 
         Returns:
             dict: Stock data or None if error
         """
-        # Try Alpha Vantage first if key is available
-        if self.alpha_vantage_key and self.alpha_vantage_key not in ['your_alphavantage_api_key', '', None]:
+        # Try Alpha Vantage first if key is available and it is healthy (the
+        # transport takes its quota, see _alpha_vantage_wait)
+        if self.has_alpha_vantage_key() and self.alpha_vantage_breaker.available():
             try:
-                params = {
-                    'function': 'GLOBAL_QUOTE',
-                    'symbol': symbol,
-                    'apikey': self.alpha_vantage_key
-                }
-
-                response = requests.get(self.alpha_vantage_url, params=params, timeout=10)
-
-                if response.status_code == 200:
-                    data = response.json()
+                response = self.http.get(self.alpha_vantage_url, params=self._alpha_vantage_params(symbol), max_wait=self._alpha_vantage_wait())
+                quote = self._parse_alpha_vantage(response, symbol)
+                if quote:
+                    return quote
+            except RateLimitedError:
+                pass
+            except Exception as e:
+                print(f"Alpha Vantage error, trying Polygon.io: {str(e)}")
 
-                    # Check if we got valid data
-                    if 'Global Quote' in data and data['Global Quote']:
-                        quote = data['Global Quote']
+        # Fall back to Polygon.io
+        if self.polygon_key:
+            return self.get_quote_polygon(symbol, max_wait)
 
-                        # Calculate if price is up or down
-                        change = float(quote.get('09. change', 0))
-                        change_percent = quote.get('10. change percent', '0%').replace('%', '')
+        print(f"No valid API keys available for {symbol}")
+        return None
 
-                        return {
-                            'symbol': quote.get('01. symbol', symbol),
-                            'price': float(quote.get('05. price', 0)),
-                            'change': change,
-                            'change_percent': float(change_percent),
-                            'volume': int(quote.get('06. volume', 0)),
-                            'latest_trading_day': quote.get('07. latest trading day', ''),
-                            'is_up': change >= 0
-                        }
+    async def get_quote_async(self, symbol, max_wait=None):
+        """Async version of get_quote"""
+        if self.has_alpha_vantage_key() and self.alpha_vantage_breaker.available():
+            try:
+                response = await self.async_http.get(self.alpha_vantage_url, params=self._alpha_vantage_params(symbol), max_wait=self._alpha_vantage_wait())
+                quote = self._parse_alpha_vantage(response, symbol)
+                if quote:
+                    return quote
+            except RateLimitedError:
+                pass
             except Exception as e:
                 print(f"Alpha Vantage error, trying Polygon.io: {str(e)}")
 
-        # Fall back to Polygon.io
         if self.polygon_key:
-            return self.get_quote_polygon(symbol)
+            return await self.get_quote_polygon_async(symbol, max_wait)
 
         print(f"No valid API keys available for {symbol}")
         return None
 
-    def get_multiple_quotes(self, symbols):
-        """Get quotes for multiple stocks"""
-        quotes = {}
+    def get_quotes_batch(self, symbols):
+        """
+        Get quotes for many symbols in one Polygon.io request
 
-        for symbol in symbols:
-            quote = self.get_quote(symbol)
-            if quote:
-                quotes[symbol] = quote
+        Tries the all-tickers snapshot (paid plans) and falls back to the
+        grouped daily aggregates for the latest trading day.
+
+        Args:
+            symbols (list): Stock symbols
 
-            # Only sleep if using Alpha Vantage (rate limit: 5 calls/min)
-            # Polygon.io has higher limits
-            if self.alpha_vantage_key and self.alpha_vantage_key not in ['your_alphavantage_api_key', '', None]:
-                import time
-                time.sleep(12)  # Wait 12 seconds between calls
+        Returns:
+            dict: Quotes keyed by symbol, for the symbols the batch covered
+        """
+        if not self.polygon_key:
+            return {}
+
+        try:
+            if self._snapshot_available:
+                response = self.http.get(self._snapshot_url(), params=self._snapshot_params(symbols))
+                quotes = self._parse_polygon_snapshot(response, symbols)
+                if quotes is not None:
+                    return quotes
+
+            for day in self._recent_trading_days():
+                results = self._grouped_daily.get(day)
+                if results is None:
+                    response = self.http.get(self._grouped_daily_url(day), params={'adjusted': 'true', 'apiKey': self.polygon_key})
+                    results = self._parse_grouped_daily(response, day)
+                if results:
+                    return self._quotes_from_grouped_daily(results, symbols, day)
+
+        except Exception as e:
+            print(f"Polygon.io batch error: {str(e)}")
+
+        return {}
+
+    async def get_quotes_batch_async(self, symbols):
+        """Async version of get_quotes_batch"""
+        if not self.polygon_key:
+            return {}
+
+        try:
+            if self._snapshot_available:
+                response = await self.async_http.get(self._snapshot_url(), params=self._snapshot_params(symbols))
+                quotes = self._parse_polygon_snapshot(response, symbols)
+                if quotes is not None:
+                    return quotes
+
+            for day in self._recent_trading_days():
+                results = self._grouped_daily.get(day)
+                if results is None:
+                    response = await self.async_http.get(self._grouped_daily_url(day), params={'adjusted': 'true', 'apiKey': self.polygon_key})
+                    results = self._parse_grouped_daily(response, day)
+                if results:
+                    return self._quotes_from_grouped_daily(results, symbols, day)
+
+        except Exception as e:
+            print(f"Polygon.io batch error: {str(e)}")
+
+        return {}
+
+    def get_multiple_quotes(self, symbols):
+        """
+        Get quotes for multiple stocks
+
+        Symbols quoted in the last quote_max_age seconds are served without
+        a request. The rest are fetched in batches, and whatever a batch
+        misses is fetched one symbol at a time.
+        """
+        symbols = self.plan_fetch({'symbols': symbols})
+        quotes = self._recent_quotes(symbols)
+
+        to_fetch = [symbol for symbol in symbols if symbol not in quotes]
+        if to_fetch:
+            # One batch request covers most symbols
+            fetched = {}
+            for start in range(0, len(to_fetch), self.BATCH_SIZE):
+                fetched.update(self.get_quotes_batch(to_fetch[start:start + self.BATCH_SIZE]))
+
+            # Fetch whatever the batch missed concurrently, one request per
+            # symbol, but only with Polygon.io quota that is free right now
+            missing = [symbol for symbol in to_fetch if symbol not in fetched]
+            if missing:
+                with ThreadPoolExecutor(max_workers=self._fallback_workers(len(missing))) as executor:
+                    for symbol, quote in zip(missing, executor.map(lambda symbol: self.get_quote(symbol, max_wait=0), missing)):
+                        if quote:
+                            fetched[symbol] = quote
+                self._report_skipped(missing, fetched)
+
+            self._remember_quotes(fetched)
+            self._record_history(fetched)
+            quotes.update(fetched)
 
         # If no quotes were fetched, return mock data
         if not quotes:
             return self.get_mock_quotes(symbols)
 
-        return quotes
+        return {symbol: quotes[symbol] for symbol in symbols if symbol in quotes}
+
+    async def get_multiple_quotes_async(self, symbols):
+        """Async version of get_multiple_quotes"""
+        symbols = self.plan_fetch({'symbols': symbols})
+        quotes = self._recent_quotes(symbols)
+
+        to_fetch = [symbol for symbol in symbols if symbol not in quotes]
+        if to_fetch:
+            batches = await asyncio.gather(*(
+                self.get_quotes_batch_async(to_fetch[start:start + self.BATCH_SIZE])
+                for start in range(0, len(to_fetch), self.BATCH_SIZE)
+            ))
+            fetched = {}
+            for batch in batches:
+                fetched.update(batch)
+
+            missing = [symbol for symbol in to_fetch if symbol not in fetched]
+            if missing:
+                slots = asyncio.Semaphore(self._fallback_workers(len(missing)))
+
+                async def fetch_one(symbol):
+                    async with slots:
+                        return await self.get_quote_async(symbol, max_wait=0)
+
+                results = await asyncio.gather(*(fetch_one(symbol) for symbol in missing))
+                for symbol, quote in zip(missing, results):
+                    if quote:
+                        fetched[symbol] = quote
+                self._report_skipped(missing, fetched)
+
+            self._remember_quotes(fetched)
+            self._record_history(fetched)
+            quotes.update(fetched)
+
+        if not quotes:
+            return self.get_mock_quotes(symbols)
+
+        return {symbol: quotes[symbol] for symbol in symbols if symbol in quotes}
 
-    def get_most_active_stocks(self):
-        """Get list of most active/popular stocks"""
-        # Return a curated list of most actively traded stocks
-        most_active = [
-            'AAPL',  # Apple
-            'MSFT',  # Microsoft
-            'NVDA',  # NVIDIA
-            'GOOGL', # Alphabet
-            'AMZN',  # Amazon
-            'TSLA',  # Tesla
-            'META',  # Meta (Facebook)
-            'AMD',   # Advanced Micro Devices
-            'NFLX',  # Netflix
-            'ADBE'   # Adobe
-        ]
-
-        return self.get_multiple_quotes(most_active)
-
-    def get_popular_etfs(self):
-        """Get list of popular ETFs"""
-        # Return quotes for popular ETFs
-        popular_etfs = [
-            'SPY',   # SPDR S&P 500 ETF
-            'QQQ',   # Invesco QQQ ETF (Nasdaq-100)
-            'VTI',   # Vanguard Total Stock Market ETF
-            'IWM',   # iShares Russell 2000 ETF
-            'EFA',   # iShares MSCI EAFE ETF
-            'GLD',   # SPDR Gold Shares
-            'TLT',   # iShares 20+ Year Treasury Bond ETF
-            'XLF',   # Financial Select Sector SPDR
-            'XLK',   # Technology Select Sector SPDR
-            'XLE'    # Energy Select Sector SPDR
-        ]
-
-        return self.get_multiple_quotes(popular_etfs)
+    @staticmethod
+    def plan_fetch(watchlists):
+        """
+        Union of the symbols of several watchlists
+
+        Args:
+            watchlists (dict): Watchlist name -> list of symbols
+
+        Returns:
+            list: Each symbol once, upper-cased, in first-seen order
+        """
+        plan = {}
+        for symbols in watchlists.values():
+            for symbol in symbols:
+                symbol = symbol.strip().upper()
+                if symbol:
+                    plan[symbol] = None
+        return list(plan)
+
+    def get_watchlist_quotes(self, watchlists):
+        """
+        Get quotes for several watchlists with one shared fetch plan
+
+        Symbols that appear in more than one watchlist are fetched once.
+
+        Args:
+            watchlists (dict): Watchlist name -> list of symbols
+
+        Returns:
+            dict: Watchlist name -> quotes keyed by symbol, in watchlist order
+        """
+        return self._split_watchlists(watchlists, self.get_multiple_quotes(self.plan_fetch(watchlists)))
+
+    async def get_watchlist_quotes_async(self, watchlists):
+        """Async version of get_watchlist_quotes"""
+        return self._split_watchlists(watchlists, await self.get_multiple_quotes_async(self.plan_fetch(watchlists)))
+
+    def get_price_history(self, symbol, start=None, end=None, interval=None):
+        """
+        Stored quotes of a symbol, without calling any API
+
+        Every quote fetched through get_multiple_quotes is kept in the local
+        history, so sparklines and day-over-day comparisons are free.
+
+        Args:
+            symbol (str): Stock symbol
+            start (float): Earliest Unix time (None for all history)
+            end (float): Latest Unix time (None for now)
+            interval (float): Downsample into buckets of this many seconds
+
+        Returns:
+            list: Quotes oldest first ('timestamp', 'price', 'change', 'volume'), or
+                OHLC buckets ('timestamp', 'open', 'high', 'low', 'close', ...) with interval
+        """
+        points = self.history.query(symbol, start, end)
+        if interval:
+            return downsample(points, interval)
+        return points
+
+    def get_most_active_stocks(self, sort_by=None, descending=True):
+        """
+        Get list of most active/popular stocks
+
+        Args:
+            sort_by (str): Metric to rank by (see stock_analytics.METRICS), None keeps the list order
+            descending (bool): Highest first
+        """
+        return self.rank_quotes(self.get_multiple_quotes(self.MOST_ACTIVE), sort_by, descending)
+
+    async def get_most_active_stocks_async(self, sort_by=None, descending=True):
+        """Async version of get_most_active_stocks"""
+        return self.rank_quotes(await self.get_multiple_quotes_async(self.MOST_ACTIVE), sort_by, descending)
+
+    def get_popular_etfs(self, sort_by=None, descending=True):
+        """
+        Get list of popular ETFs
+
+        Args:
+            sort_by (str): Metric to rank by (see stock_analytics.METRICS), None keeps the list order
+            descending (bool): Highest first
+        """
+        return self.rank_quotes(self.get_multiple_quotes(self.POPULAR_ETFS), sort_by, descending)
+
+    async def get_popular_etfs_async(self, sort_by=None, descending=True):
+        """Async version of get_popular_etfs"""
+        return self.rank_quotes(await self.get_multiple_quotes_async(self.POPULAR_ETFS), sort_by, descending)
+
+    def get_metrics(self, quotes):
+        """
+        Returns, SMA/EMA, volatility and trend for a set of quotes
+
+        Computed for the whole set at once from the local quote history.
+
+        Args:
+            quotes (dict): Symbol -> quote, e.g. from get_multiple_quotes
+
+        Returns:
+            dict: Symbol -> metrics (see stock_analytics.watchlist_metrics)
+        """
+        # numpy is only imported once analytics are needed
+        from api_clients import stock_analytics
+
+        return stock_analytics.watchlist_metrics(quotes, self.history)
+
+    def rank_quotes(self, quotes, sort_by=None, descending=True, limit=None):
+        """
+        Order quotes by a metric
+
+        Args:
+            quotes (dict): Symbol -> quote
+            sort_by (str): Metric to rank by, None keeps the order
+            descending (bool): Highest first
+            limit (int): Keep only the top `limit`
+
+        Returns:
+            dict: Quotes in ranked order
+        """
+        if not quotes or not sort_by:
+            return quotes
+
+        from api_clients import stock_analytics
+
+        # Only the history-based metrics need the history
+        history_metrics = sort_by in ('return', 'sma', 'ema', 'volatility', 'trend')
+        metrics = self.get_metrics(quotes) if history_metrics else None
+        return stock_analytics.rank(quotes, sort_by, descending, metrics=metrics, limit=limit)
 
     def get_mock_quotes(self, symbols):
         """Generate mock stock data when API is unavailable"""
@@ -193,6 +502,227 @@ class StockAPI:
 
         return mock_data
 
+    def _split_watchlists(self, watchlists, quotes):
+        """Split the quotes of a fetch plan back out per watchlist"""
+        split = {}
+        for name, symbols in watchlists.items():
+            symbols = self.plan_fetch({name: symbols})
+            split[name] = {symbol: quotes[symbol] for symbol in symbols if symbol in quotes}
+        return split
+
+    def _recent_quotes(self, symbols):
+        """Quotes of symbols fetched less than quote_max_age seconds ago"""
+        now = time.monotonic()
+        with self._recent_lock:
+            return {
+                symbol: entry[1]
+                for symbol, entry in ((symbol, self._recent.get(symbol)) for symbol in symbols)
+                if entry is not None and now - entry[0] < self.quote_max_age
+            }
+
+    def _remember_quotes(self, quotes):
+        """Keep freshly fetched quotes for reuse"""
+        now = time.monotonic()
+        with self._recent_lock:
+            for symbol, quote in quotes.items():
+                self._recent[symbol] = (now, quote)
+
+    def _record_history(self, quotes):
+        """Append fetched quotes to the local history"""
+        try:
+            self.history.append_quotes(quotes)
+        except Exception as e:
+            print(f"Could not record quote history: {str(e)}")
+
+    def _fallback_workers(self, count):
+        """Per-symbol fetches to run at once: no more than the Polygon.io tokens free right now"""
+        return max(1, min(8, count, int(self.polygon_limiter.available())))
+
+    def _report_skipped(self, missing, fetched):
+        """Log symbols the per-symbol fallback couldn't quote (usually for lack of quota)"""
+        skipped = [symbol for symbol in missing if symbol not in fetched]
+        if skipped:
+            print(f"No quote for {len(skipped)} symbols ({', '.join(skipped)}); Polygon.io quota used up or unavailable")
+
+    def _alpha_vantage_wait(self):
+        """
+        Longest wait for Alpha Vantage quota (5 calls/minute)
+
+        With a Polygon.io key to fall back on we never wait for quota,
+        otherwise we wait until the bucket refills.
+        """
+        return 0 if self.polygon_key else float('inf')
+
+    def _alpha_vantage_params(self, symbol):
+        """Query parameters for an Alpha Vantage GLOBAL_QUOTE request"""
+        return {
+            'function': 'GLOBAL_QUOTE',
+            'symbol': symbol,
+            'apikey': self.alpha_vantage_key
+        }
+
+    def _parse_alpha_vantage(self, response, symbol):
+        """Build a quote from an Alpha Vantage response, or None if it has no data"""
+        if response.status_code == 200:
+            data = response.json()
+
+            # Rate limits come back as a 200 with a message instead of data;
+            # stop calling until the limit (per minute, or per day) resets
+            if 'Note' in data:
+                self.alpha_vantage_breaker.record_failure(retry_after=60)
+                return None
+            if 'Information' in data:
+                self.alpha_vantage_breaker.record_failure(retry_after=3600)
+                return None
+
+            # Check if we got valid data
+            if 'Global Quote' in data and data['Global Quote']:
+                quote = data['Global Quote']
+
+                # Calculate if price is up or down
+                change = float(quote.get('09. change', 0))
+                change_percent = quote.get('10. change percent', '0%').replace('%', '')
+
+                return {
+                    'symbol': quote.get('01. symbol', symbol),
+                    'price': float(quote.get('05. price', 0)),
+                    'change': change,
+                    'change_percent': float(change_percent),
+                    'volume': int(quote.get('06. volume', 0)),
+                    'latest_trading_day': quote.get('07. latest trading day', ''),
+                    'is_up': change >= 0
+                }
+
+        return None
+
+    def _snapshot_url(self):
+        """URL of the Polygon.io all-tickers snapshot"""
+        return f"{self.polygon_url}/snapshot/locale/us/markets/stocks/tickers"
+
+    def _snapshot_params(self, symbols):
+        """Query parameters for a snapshot of the given tickers"""
+        return {'tickers': ','.join(symbols), 'apiKey': self.polygon_key}
+
+    def _grouped_daily_url(self, day):
+        """URL of the Polygon.io grouped daily bars for a date"""
+        return f"{self.polygon_url}/aggs/grouped/locale/us/market/stocks/{day}"
+
+    def _recent_trading_days(self, max_days=5):
+        """Today and the previous weekdays, newest first, as YYYY-MM-DD"""
+        days = []
+        day = date.today()
+        while len(days) < max_days:
+            if day.weekday() < 5:
+                days.append(day.isoformat())
+            day -= timedelta(days=1)
+        return days
+
+    def _parse_polygon_snapshot(self, response, symbols):
+        """
+        Build quotes from a Polygon.io snapshot response
+
+        Returns:
+            dict: Quotes keyed by symbol, or None if the snapshot is unavailable
+        """
+        if response.status_code in (401, 403):
+            print("Polygon.io snapshot not available on this plan - using grouped daily bars")
+            self._snapshot_available = False
+            return None
+
+        if response.status_code != 200:
+            return None
+
+        wanted = set(symbols)
+        quotes = {}
+        for ticker in response.json().get('tickers', []):
+            symbol = ticker.get('ticker')
+            if symbol not in wanted:
+                continue
+
+            day = ticker.get('day', {})
+            price = ticker.get('lastTrade', {}).get('p') or day.get('c', 0)
+            change = ticker.get('todaysChange', 0)
+
+            quotes[symbol] = {
+                'symbol': symbol,
+                'price': price,
+                'change': change,
+                'change_percent': ticker.get('todaysChangePerc', 0),
+                'volume': day.get('v', 0),
+                'latest_trading_day': 'Today',
+                'is_up': change >= 0
+            }
+
+        return quotes
+
+    def _parse_grouped_daily(self, response, day):
+        """
+        Index a grouped daily response by ticker
+
+        Returns:
+            dict: Aggregate bar keyed by ticker (empty for non-trading days)
+        """
+        if response.status_code != 200:
+            return {}
+
+        results = {bar['T']: bar for bar in response.json().get('results') or [] if 'T' in bar}
+
+        # Only completed days are final; today's bars can still be missing
+        if results and day != date.today().isoformat():
+            self._grouped_daily = {day: results}
+
+        return results
+
+    def _quotes_from_grouped_daily(self, results, symbols, day):
+        """Build quotes for the requested symbols from grouped daily bars"""
+        quotes = {}
+        for symbol in symbols:
+            bar = results.get(symbol)
+            if not bar:
+                continue
+
+            open_price = bar.get('o', 0)
+            close_price = bar.get('c', 0)
+            change = close_price - open_price
+            change_percent = (change / open_price * 100) if open_price > 0 else 0
+
+            quotes[symbol] = {
+                'symbol': symbol,
+                'price': close_price,
+                'change': change,
+                'change_percent': change_percent,
+                'volume': bar.get('v', 0),
+                'latest_trading_day': day,
+                'is_up': change >= 0
+            }
+
+        return quotes
+
+    def _parse_polygon_prev(self, response, symbol):
+        """Build a quote from a Polygon.io previous-close response"""
+        if response.status_code == 200:
+            data = response.json()
+
+            if data.get('results') and len(data['results']) > 0:
+                result = data['results'][0]
+
+                open_price = result.get('o', 0)
+                close_price = result.get('c', 0)
+                change = close_price - open_price
+                change_percent = (change / open_price * 100) if open_price > 0 else 0
+
+                return {
+                    'symbol': symbol,
+                    'price': close_price,
+                    'change': change,
+                    'change_percent': change_percent,
+                    'volume': result.get('v', 0),
+                    'latest_trading_day': 'Previous Day',
+                    'is_up': change >= 0
+                }
+
+        return None
+
     def get_stock_chart_url(self, symbol, timeframe='1D'):
         """Generate chart URL for stock visualization"""
         # Using TradingView widget URL (free charting service)
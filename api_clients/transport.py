@@ -0,0 +1,160 @@
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from api_clients.circuit_breaker import CircuitOpenError, breaker_for_url
+from api_clients.http_cache import get_default_http_cache
+from api_clients.rate_limiter import RateLimitedError, limiter_for_url
+
+
+class HTTPTransport:
+    """Shared HTTP transport with per-host keep-alive connection pools"""
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, connect_timeout=3.05, read_timeout=10, max_retries=0, cache=None,
+                 max_rate_wait=10):
+        """
+        Args:
+            pool_connections (int): Number of per-host pools to keep
+            pool_maxsize (int): Maximum keep-alive connections per host
+            connect_timeout (float): Seconds to wait for a connection
+            read_timeout (float): Seconds to wait for response data
+            max_retries (int): Retries for failed connections
+            cache (HTTPCache): Optional response cache for the providers it handles
+            max_rate_wait (float): Longest wait for a provider's rate limiter before
+                failing with RateLimitedError
+        """
+        self.timeout = (connect_timeout, read_timeout)
+        self.cache = cache
+        self.max_rate_wait = max_rate_wait
+
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries
+        )
+        self.session = self.create_session()
+
+    def create_session(self):
+        """
+        Create a session that shares this transport's connection pools
+
+        Clients that set their own session headers (e.g. praw's User-Agent)
+        get their own session so they don't change headers for everyone else.
+
+        Returns:
+            requests.Session: Session mounted on the shared adapter
+        """
+        session = requests.Session()
+        session.headers.update({
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+            'User-Agent': 'dashboard-app/0.1'
+        })
+        session.mount('http://', self.adapter)
+        session.mount('https://', self.adapter)
+        return session
+
+    @classmethod
+    def from_env(cls):
+        """Build a transport configured from HTTP_* environment variables"""
+        return cls(
+            pool_connections=int(os.getenv('HTTP_POOL_CONNECTIONS', 10)),
+            pool_maxsize=int(os.getenv('HTTP_POOL_MAXSIZE', 10)),
+            connect_timeout=float(os.getenv('HTTP_CONNECT_TIMEOUT', 3.05)),
+            read_timeout=float(os.getenv('HTTP_READ_TIMEOUT', 10)),
+            cache=get_default_http_cache(),
+            max_rate_wait=float(os.getenv('HTTP_RATE_LIMIT_WAIT', 10))
+        )
+
+    def get(self, url, params=None, headers=None, timeout=None, max_wait=None):
+        """
+        Send a GET request over a pooled connection
+
+        Requests to a provider whose circuit is open fail fast with
+        CircuitOpenError instead of waiting for a timeout. Every request that
+        reaches the network takes a token from the provider's shared rate
+        limiter, and fails with RateLimitedError if none is available in
+        time. With a cache, fresh cached responses are returned without a
+        request and stale ones are revalidated.
+
+        Args:
+            url (str): Request URL
+            params (dict): Query parameters
+            headers (dict): Extra request headers
+            timeout (float or tuple): Overrides the default (connect, read) timeout
+            max_wait (float): Overrides max_rate_wait (0 = only if a token is free now)
+
+        Returns:
+            requests.Response: The response
+        """
+        if self.cache is None or not self.cache.handles(url, headers):
+            return self._send(url, params, headers, timeout, max_wait)
+
+        key = self.cache.key(url, params)
+        entry = self.cache.get(key)
+        if entry is not None and self.cache.is_fresh(entry):
+            return self._cached_response(entry)
+
+        response = self._send(url, params, self.cache.conditional_headers(entry, headers), timeout, max_wait)
+        if entry is not None and response.status_code == 304:
+            return self._cached_response(self.cache.revalidated(key, entry, response.headers))
+
+        self.cache.store(key, url, response.status_code, response.headers, response.content)
+        return response
+
+    def _send(self, url, params, headers, timeout, max_wait):
+        """Send a GET request through the provider's circuit breaker and rate limiter"""
+        breaker = breaker_for_url(url)
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpenError(f"Circuit for {breaker.name} is open")
+
+        limiter = limiter_for_url(url)
+        if limiter is not None and limiter.acquire(max_wait=self.max_rate_wait if max_wait is None else max_wait) is None:
+            if breaker is not None:
+                breaker.release()
+            raise RateLimitedError(f"Rate limit for {limiter.name} reached")
+
+        if breaker is None:
+            return self.session.get(url, params=params, headers=headers, timeout=timeout or self.timeout)
+
+        try:
+            response = self.session.get(url, params=params, headers=headers, timeout=timeout or self.timeout)
+        except requests.exceptions.RequestException:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+
+        breaker.record_response(response)
+        return response
+
+    @staticmethod
+    def _cached_response(entry):
+        """Build a requests.Response from a cached entry"""
+        response = requests.Response()
+        response.status_code = entry.status
+        response.headers = CaseInsensitiveDict(entry.headers)
+        response.url = entry.url
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response._content = entry.body
+        return response
+
+    def close(self):
+        """Close all pooled connections"""
+        self.adapter.close()
+
+
+_default_transport = None
+_default_lock = threading.Lock()
+
+
+def get_default_transport():
+    """Get the process-wide transport shared by all API clients"""
+    global _default_transport
+
+    with _default_lock:
+        if _default_transport is None:
+            _default_transport = HTTPTransport.from_env()
+        return _default_transport
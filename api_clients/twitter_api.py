@@ -1,13 +1,16 @@
-import requests
 import os
-from dotenv import load_dotenv
+from api_clients.transport import get_default_transport
+from api_clients.async_transport import get_default_async_transport
+from api_clients.config import load_config
 
-load_dotenv()
+load_config()
 
 class TwitterAPI:
     """Client for Twitter/X API"""
 
-    def __init__(self):
+    def __init__(self, transport=None, async_transport=None):
+        self.http = transport or get_default_transport()
+        self.async_http = async_transport or get_default_async_transport()
         self.bearer_token = os.getenv('TWITTER_BEARER_TOKEN')
         self.base_url = "https://api.twitter.com/2"
 
@@ -23,77 +26,95 @@ class TwitterAPI:
             list: Category-relevant tweets or None if error
         """
         try:
-            # Map categories to search queries
-            category_queries = {
-                'technology': 'tech OR technology OR AI OR software OR programming OR cybersecurity',
-                'business': 'business OR finance OR startup OR entrepreneur OR investing OR economy',
-                'science': 'science OR research OR discovery OR space OR climate OR medical',
-                'health': 'health OR medical OR medicine OR healthcare OR wellness OR fitness',
-                'sports': 'sports OR football OR basketball OR baseball OR soccer OR olympics',
-                'entertainment': 'entertainment OR movie OR music OR celebrity OR gaming OR streaming',
-                'general': 'breaking OR news OR trending OR important OR update'
-            }
-
-            query = category_queries.get(category.lower(), category_queries['technology'])
-
-            url = f"{self.base_url}/tweets/search/recent"
-            headers = {"Authorization": f"Bearer {self.bearer_token}"}
-            params = {
-                "query": f"({query}) -is:retweet lang:en",
-                "max_results": num_tweets,
-                "tweet.fields": "created_at,public_metrics,author_id",
-                "expansions": "author_id",
-                "user.fields": "username,name,verified",
-                "sort_order": "relevancy"
-            }
-
-            response = requests.get(url, headers=headers, params=params, timeout=10)
-
-            if response.status_code == 200:
-                data = response.json()
-
-                if not data.get('data'):
-                    return []
-
-                # Map user IDs to usernames
-                users = {}
-                if 'includes' in data and 'users' in data['includes']:
-                    for user in data['includes']['users']:
-                        users[user['id']] = user
-
-                tweets = []
-                for tweet in data.get('data', []):
-                    author = users.get(tweet.get('author_id'), {})
-                    metrics = tweet.get('public_metrics', {})
-
-                    tweets.append({
-                        'text': tweet.get('text', ''),
-                        'author': author.get('username', 'Unknown'),
-                        'author_name': author.get('name', 'Unknown'),
-                        'verified': author.get('verified', False),
-                        'likes': metrics.get('like_count', 0),
-                        'retweets': metrics.get('retweet_count', 0),
-                        'replies': metrics.get('reply_count', 0),
-                        'created_at': tweet.get('created_at', ''),
-                        'category': category.title()
-                    })
-
-                return tweets
-
-            elif response.status_code == 401:
-                print("Error: Invalid Twitter Bearer Token - using mock data")
-                return self.get_mock_tweets(category, num_tweets)
-            elif response.status_code == 429:
-                print("Error: Twitter rate limit exceeded - using mock data")
-                return self.get_mock_tweets(category, num_tweets)
-            else:
-                print(f"Error: Twitter API returned status code {response.status_code} - using mock data")
-                return self.get_mock_tweets(category, num_tweets)
+            headers, params = self._search_request(category, num_tweets)
+            response = self.http.get(f"{self.base_url}/tweets/search/recent", headers=headers, params=params)
+            return self._parse_tweets(response, category, num_tweets)
 
         except Exception as e:
             print(f"Error getting Twitter trends: {str(e)}")
             return self.get_mock_tweets(category, num_tweets)
 
+    async def get_tweets_by_category_async(self, category="technology", num_tweets=5):
+        """Async version of get_tweets_by_category"""
+        try:
+            headers, params = self._search_request(category, num_tweets)
+            response = await self.async_http.get(f"{self.base_url}/tweets/search/recent", headers=headers, params=params)
+            return self._parse_tweets(response, category, num_tweets)
+
+        except Exception as e:
+            print(f"Error getting Twitter trends: {str(e)}")
+            return self.get_mock_tweets(category, num_tweets)
+
+    def _search_request(self, category, num_tweets):
+        """Headers and query parameters for a category search"""
+        # Map categories to search queries
+        category_queries = {
+            'technology': 'tech OR technology OR AI OR software OR programming OR cybersecurity',
+            'business': 'business OR finance OR startup OR entrepreneur OR investing OR economy',
+            'science': 'science OR research OR discovery OR space OR climate OR medical',
+            'health': 'health OR medical OR medicine OR healthcare OR wellness OR fitness',
+            'sports': 'sports OR football OR basketball OR baseball OR soccer OR olympics',
+            'entertainment': 'entertainment OR movie OR music OR celebrity OR gaming OR streaming',
+            'general': 'breaking OR news OR trending OR important OR update'
+        }
+
+        query = category_queries.get(category.lower(), category_queries['technology'])
+
+        headers = {"Authorization": f"Bearer {self.bearer_token}"}
+        params = {
+            "query": f"({query}) -is:retweet lang:en",
+            "max_results": num_tweets,
+            "tweet.fields": "created_at,public_metrics,author_id",
+            "expansions": "author_id",
+            "user.fields": "username,name,verified",
+            "sort_order": "relevancy"
+        }
+
+        return headers, params
+
+    def _parse_tweets(self, response, category, num_tweets):
+        """Build the tweet list from a search response, falling back to mock tweets"""
+        if response.status_code == 200:
+            data = response.json()
+
+            if not data.get('data'):
+                return []
+
+            # Map user IDs to usernames
+            users = {}
+            if 'includes' in data and 'users' in data['includes']:
+                for user in data['includes']['users']:
+                    users[user['id']] = user
+
+            tweets = []
+            for tweet in data.get('data', []):
+                author = users.get(tweet.get('author_id'), {})
+                metrics = tweet.get('public_metrics', {})
+
+                tweets.append({
+                    'text': tweet.get('text', ''),
+                    'author': author.get('username', 'Unknown'),
+                    'author_name': author.get('name', 'Unknown'),
+                    'verified': author.get('verified', False),
+                    'likes': metrics.get('like_count', 0),
+                    'retweets': metrics.get('retweet_count', 0),
+                    'replies': metrics.get('reply_count', 0),
+                    'created_at': tweet.get('created_at', ''),
+                    'category': category.title()
+                })
+
+            return tweets
+
+        elif response.status_code == 401:
+            print("Error: Invalid Twitter Bearer Token - using mock data")
+            return self.get_mock_tweets(category, num_tweets)
+        elif response.status_code == 429:
+            print("Error: Twitter rate limit exceeded - using mock data")
+            return self.get_mock_tweets(category, num_tweets)
+        else:
+            print(f"Error: Twitter API returned status code {response.status_code} - using mock data")
+            return self.get_mock_tweets(category, num_tweets)
+
     def get_mock_tweets(self, category="technology", num_tweets=5):
         """Provide mock tweets when API is unavailable"""
         mock_tweets = {
@@ -141,6 +162,10 @@ class TwitterAPI:
         """Backward compatibility method"""
         return self.get_tweets_by_category("technology", num_topics)
 
+    async def get_trending_topics_async(self, num_topics=5):
+        """Async version of get_trending_topics"""
+        return await self.get_tweets_by_category_async("technology", num_topics)
+
 
 # Test
 if __name__ == '__main__':
@@ -1,15 +1,24 @@
 import requests
 import os
-from dotenv import load_dotenv
+import asyncio
+from datetime import datetime, timedelta
+from api_clients.transport import get_default_transport
+from api_clients.async_transport import get_default_async_transport
+from api_clients.geocode_cache import get_default_geocode_cache
+from api_clients.config import load_config
 
-load_dotenv()
+load_config()
 
 class WeatherAPI:
     """Client for OpenWeatherMap API (free tier)"""
 
-    def __init__(self):
+    def __init__(self, transport=None, async_transport=None, geocode_cache=None):
+        self.http = transport or get_default_transport()
+        self.async_http = async_transport or get_default_async_transport()
+        self.geocode_cache = geocode_cache or get_default_geocode_cache()
         self.api_key = os.getenv('OPENWEATHER_API_KEY')
         self.base_url = "http://api.openweathermap.org/data/2.5"
+        self.geocoding_url = "http://api.openweathermap.org/geo/1.0/direct"
 
     def get_current_weather(self, city="Chicago"):
         """
@@ -22,41 +31,21 @@ class WeatherAPI:
             dict: Weather data or None if error
         """
         try:
-            url = f"{self.base_url}/weather"
-            params = {
-                'q': city,
-                'appid': self.api_key,
-                'units': 'imperial'  # Fahrenheit
-            }
-
-            response = requests.get(url, params=params, timeout=10)
-
-            # Check if request was successful
-            if response.status_code == 200:
-                data = response.json()
+            response = self.http.get(f"{self.base_url}/weather", params=self._city_params(city))
+            return self._parse_current_weather(response, city)
 
-                # Extract relevant information
-                weather_data = {
-                    'city': data['name'],
-                    'temperature': round(data['main']['temp']),
-                    'feels_like': round(data['main']['feels_like']),
-                    'humidity': data['main']['humidity'],
-                    'description': data['weather'][0]['description'],
-                    'icon': data['weather'][0]['icon'],
-                    'wind_speed': round(data['wind']['speed'])
-                }
-
-                return weather_data
+        except requests.exceptions.Timeout:
+            print("Error: Request timed out")
+            return None
+        except requests.exceptions.RequestException as e:
+            print(f"Error: {str(e)}")
+            return None
 
-            elif response.status_code == 401:
-                print("Error: Invalid API key")
-                return None
-            elif response.status_code == 404:
-                print(f"Error: City '{city}' not found")
-                return None
-            else:
-                print(f"Error: API returned status code {response.status_code}")
-                return None
+    async def get_current_weather_async(self, city="Chicago"):
+        """Async version of get_current_weather"""
+        try:
+            response = await self.async_http.get(f"{self.base_url}/weather", params=self._city_params(city))
+            return self._parse_current_weather(response, city)
 
         except requests.exceptions.Timeout:
             print("Error: Request timed out")
@@ -64,168 +53,198 @@ class WeatherAPI:
         except requests.exceptions.RequestException as e:
             print(f"Error: {str(e)}")
             return None
-        except KeyError as e:
-            print(f"Error: Unexpected API response format - missing key {e}")
-            return None
 
     def get_7day_forecast(self, city="Chicago"):
         """Get 7-day weather forecast"""
         try:
             # Use the One Call API for better forecast data
             # First get coordinates for the city
-            geocoding_url = f"http://api.openweathermap.org/geo/1.0/direct"
-            geo_params = {
-                'q': city,
-                'limit': 1,
-                'appid': self.api_key
-            }
-
-            geo_response = requests.get(geocoding_url, params=geo_params, timeout=10)
-            if geo_response.status_code != 200:
+            coords = self.get_coordinates(city)
+            if not coords:
                 # Fallback to basic forecast
                 return self.get_basic_forecast(city)
 
-            geo_data = geo_response.json()
-            if not geo_data:
+            # Get 7-day forecast using One Call API
+            response = self.http.get(f"{self.base_url}/onecall", params=self._onecall_params(coords, 'minutely,alerts'))
+
+            if response.status_code == 200:
+                return self._parse_daily_forecast(response.json())
+            else:
                 return self.get_basic_forecast(city)
 
-            lat = geo_data[0]['lat']
-            lon = geo_data[0]['lon']
+        except Exception as e:
+            print(f"Error getting 7-day forecast: {str(e)}")
+            return self.get_basic_forecast(city)
 
-            # Get 7-day forecast using One Call API
-            onecall_url = f"{self.base_url}/onecall"
-            params = {
-                'lat': lat,
-                'lon': lon,
-                'appid': self.api_key,
-                'units': 'imperial',
-                'exclude': 'minutely,alerts'
-            }
+    async def get_7day_forecast_async(self, city="Chicago"):
+        """Async version of get_7day_forecast"""
+        try:
+            coords = await self.get_coordinates_async(city)
+            if not coords:
+                return await self.get_basic_forecast_async(city)
 
-            response = requests.get(onecall_url, params=params, timeout=10)
+            response = await self.async_http.get(f"{self.base_url}/onecall", params=self._onecall_params(coords, 'minutely,alerts'))
 
             if response.status_code == 200:
-                data = response.json()
-
-                forecasts = []
-                # Get daily forecasts (7 days)
-                for day in data['daily'][:7]:
-                    from datetime import datetime
-                    forecast = {
-                        'date': datetime.fromtimestamp(day['dt']).strftime('%a, %b %d'),
-                        'temp_high': round(day['temp']['max']),
-                        'temp_low': round(day['temp']['min']),
-                        'description': day['weather'][0]['description'].title(),
-                        'icon': day['weather'][0]['icon'],
-                        'humidity': day['humidity'],
-                        'wind_speed': round(day['wind_speed'])
-                    }
-                    forecasts.append(forecast)
-
-                return forecasts
+                return self._parse_daily_forecast(response.json())
             else:
-                return self.get_basic_forecast(city)
+                return await self.get_basic_forecast_async(city)
 
         except Exception as e:
             print(f"Error getting 7-day forecast: {str(e)}")
-            return self.get_basic_forecast(city)
+            return await self.get_basic_forecast_async(city)
 
     def get_hourly_forecast(self, city="Chicago", hours=24):
         """Get hourly weather forecast"""
         try:
             # First get coordinates for the city
-            geocoding_url = f"http://api.openweathermap.org/geo/1.0/direct"
-            geo_params = {
-                'q': city,
-                'limit': 1,
-                'appid': self.api_key
-            }
-
-            geo_response = requests.get(geocoding_url, params=geo_params, timeout=10)
-            if geo_response.status_code != 200:
+            coords = self.get_coordinates(city)
+            if not coords:
                 return self.get_basic_hourly_forecast(city, hours)
 
-            geo_data = geo_response.json()
-            if not geo_data:
+            # Get hourly forecast using One Call API
+            response = self.http.get(f"{self.base_url}/onecall", params=self._onecall_params(coords, 'minutely,daily,alerts'))
+
+            if response.status_code == 200:
+                return self._parse_hourly_forecast(response.json(), hours)
+            else:
                 return self.get_basic_hourly_forecast(city, hours)
 
-            lat = geo_data[0]['lat']
-            lon = geo_data[0]['lon']
+        except Exception as e:
+            print(f"Error getting hourly forecast: {str(e)}")
+            return self.get_basic_hourly_forecast(city, hours)
 
-            # Get hourly forecast using One Call API
-            onecall_url = f"{self.base_url}/onecall"
-            params = {
-                'lat': lat,
-                'lon': lon,
-                'appid': self.api_key,
-                'units': 'imperial',
-                'exclude': 'minutely,daily,alerts'
-            }
+    async def get_hourly_forecast_async(self, city="Chicago", hours=24):
+        """Async version of get_hourly_forecast"""
+        try:
+            coords = await self.get_coordinates_async(city)
+            if not coords:
+                return await self.get_basic_hourly_forecast_async(city, hours)
 
-            response = requests.get(onecall_url, params=params, timeout=10)
+            response = await self.async_http.get(f"{self.base_url}/onecall", params=self._onecall_params(coords, 'minutely,daily,alerts'))
 
             if response.status_code == 200:
-                data = response.json()
-
-                forecasts = []
-                # Get hourly forecasts
-                for hour in data['hourly'][:hours]:
-                    from datetime import datetime
-                    forecast = {
-                        'time': datetime.fromtimestamp(hour['dt']).strftime('%I %p'),
-                        'date': datetime.fromtimestamp(hour['dt']).strftime('%a'),
-                        'temperature': round(hour['temp']),
-                        'feels_like': round(hour['feels_like']),
-                        'description': hour['weather'][0]['description'].title(),
-                        'icon': hour['weather'][0]['icon'],
-                        'humidity': hour['humidity'],
-                        'wind_speed': round(hour['wind_speed']),
-                        'precipitation': round(hour.get('pop', 0) * 100)  # Probability of precipitation
-                    }
-                    forecasts.append(forecast)
-
-                return forecasts
+                return self._parse_hourly_forecast(response.json(), hours)
             else:
-                return self.get_basic_hourly_forecast(city, hours)
+                return await self.get_basic_hourly_forecast_async(city, hours)
 
         except Exception as e:
             print(f"Error getting hourly forecast: {str(e)}")
-            return self.get_basic_hourly_forecast(city, hours)
+            return await self.get_basic_hourly_forecast_async(city, hours)
+
+    def get_weather_bundle(self, city="Chicago", hours=24):
+        """
+        Get current weather, hourly and 7-day forecasts together
+
+        One One Call request serves all three views. If it fails, one /weather
+        and one shared /forecast request are used instead.
+
+        Args:
+            city (str): City name
+            hours (int): Number of hourly forecasts
+
+        Returns:
+            dict: 'weather', 'forecast' and 'hourly' (each None if unavailable)
+        """
+        return self.get_onecall_bundle(city, hours) or self.get_basic_weather_bundle(city, hours)
+
+    async def get_weather_bundle_async(self, city="Chicago", hours=24):
+        """Async version of get_weather_bundle"""
+        return await self.get_onecall_bundle_async(city, hours) or await self.get_basic_weather_bundle_async(city, hours)
+
+    def get_onecall_bundle(self, city="Chicago", hours=24):
+        """
+        Weather bundle from a single One Call request
+
+        Returns:
+            dict: 'weather', 'forecast' and 'hourly', or None if One Call failed
+        """
+        try:
+            coords = self.get_coordinates(city)
+            if coords:
+                response = self.http.get(f"{self.base_url}/onecall", params=self._onecall_params(coords, 'minutely,alerts'))
+                if response.status_code == 200:
+                    return self._parse_onecall_bundle(response.json(), city, hours)
+
+        except Exception as e:
+            print(f"Error getting One Call weather: {str(e)}")
+
+        return None
+
+    async def get_onecall_bundle_async(self, city="Chicago", hours=24):
+        """Async version of get_onecall_bundle"""
+        try:
+            coords = await self.get_coordinates_async(city)
+            if coords:
+                response = await self.async_http.get(f"{self.base_url}/onecall", params=self._onecall_params(coords, 'minutely,alerts'))
+                if response.status_code == 200:
+                    return self._parse_onecall_bundle(response.json(), city, hours)
+
+        except Exception as e:
+            print(f"Error getting One Call weather: {str(e)}")
+
+        return None
+
+    def get_basic_weather_bundle(self, city="Chicago", hours=24):
+        """Fallback weather bundle using /weather and one basic /forecast request"""
+        bundle = {
+            'weather': self.get_current_weather(city),
+            'forecast': None,
+            'hourly': None
+        }
+
+        try:
+            response = self.http.get(f"{self.base_url}/forecast", params=self._city_params(city))
+            if response.status_code == 200:
+                bundle.update(self._parse_basic_bundle(response.json(), hours))
+
+        except Exception as e:
+            print(f"Error getting basic forecast: {str(e)}")
+
+        return bundle
+
+    async def get_basic_weather_bundle_async(self, city="Chicago", hours=24):
+        """Async version of get_basic_weather_bundle"""
+        bundle = {
+            'weather': None,
+            'forecast': None,
+            'hourly': None
+        }
+
+        async def fetch_forecast():
+            response = await self.async_http.get(f"{self.base_url}/forecast", params=self._city_params(city))
+            if response.status_code == 200:
+                bundle.update(self._parse_basic_bundle(response.json(), hours))
+
+        try:
+            bundle['weather'], _ = await asyncio.gather(self.get_current_weather_async(city), fetch_forecast())
+
+        except Exception as e:
+            print(f"Error getting basic forecast: {str(e)}")
+
+        return bundle
 
     def get_basic_hourly_forecast(self, city="Chicago", hours=24):
         """Fallback hourly forecast using basic 5-day API"""
         try:
-            url = f"{self.base_url}/forecast"
-            params = {
-                'q': city,
-                'appid': self.api_key,
-                'units': 'imperial'
-            }
-
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(f"{self.base_url}/forecast", params=self._city_params(city))
 
             if response.status_code == 200:
-                data = response.json()
+                return self._parse_basic_hourly_forecast(response.json(), hours)
+            else:
+                return None
+
+        except Exception as e:
+            print(f"Error getting basic hourly forecast: {str(e)}")
+            return None
 
-                forecasts = []
-                for item in data['list'][:hours]:
-                    from datetime import datetime
-                    date_obj = datetime.fromtimestamp(item['dt'])
-
-                    forecast = {
-                        'time': date_obj.strftime('%I %p'),
-                        'date': date_obj.strftime('%a'),
-                        'temperature': round(item['main']['temp']),
-                        'feels_like': round(item['main']['feels_like']),
-                        'description': item['weather'][0]['description'].title(),
-                        'icon': item['weather'][0]['icon'],
-                        'humidity': item['main']['humidity'],
-                        'wind_speed': round(item['wind']['speed']),
-                        'precipitation': round(item.get('pop', 0) * 100)
-                    }
-                    forecasts.append(forecast)
-
-                return forecasts
+    async def get_basic_hourly_forecast_async(self, city="Chicago", hours=24):
+        """Async version of get_basic_hourly_forecast"""
+        try:
+            response = await self.async_http.get(f"{self.base_url}/forecast", params=self._city_params(city))
+
+            if response.status_code == 200:
+                return self._parse_basic_hourly_forecast(response.json(), hours)
             else:
                 return None
 
@@ -236,63 +255,24 @@ class WeatherAPI:
     def get_basic_forecast(self, city="Chicago"):
         """Fallback 5-day forecast using basic API"""
         try:
-            url = f"{self.base_url}/forecast"
-            params = {
-                'q': city,
-                'appid': self.api_key,
-                'units': 'imperial'
-            }
-
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(f"{self.base_url}/forecast", params=self._city_params(city))
 
             if response.status_code == 200:
-                data = response.json()
+                return self._parse_basic_forecast(response.json())
+            else:
+                return None
+
+        except Exception as e:
+            print(f"Error getting basic forecast: {str(e)}")
+            return None
+
+    async def get_basic_forecast_async(self, city="Chicago"):
+        """Async version of get_basic_forecast"""
+        try:
+            response = await self.async_http.get(f"{self.base_url}/forecast", params=self._city_params(city))
 
-                # Group by day and get one forecast per day
-                daily_forecasts = {}
-                for item in data['list']:
-                    from datetime import datetime
-                    date_obj = datetime.fromtimestamp(item['dt'])
-                    date_key = date_obj.strftime('%Y-%m-%d')
-
-                    if date_key not in daily_forecasts:
-                        daily_forecasts[date_key] = {
-                            'date': date_obj.strftime('%a, %b %d'),
-                            'temp_high': round(item['main']['temp_max']),
-                            'temp_low': round(item['main']['temp_min']),
-                            'description': item['weather'][0]['description'].title(),
-                            'icon': item['weather'][0]['icon'],
-                            'humidity': item['main']['humidity'],
-                            'wind_speed': round(item['wind']['speed'])
-                        }
-
-                # Convert to list - get first 5 days from API
-                forecasts = list(daily_forecasts.values())[:5]
-
-                # Extend to 7 days by projecting the last 2 days based on patterns
-                if len(forecasts) >= 5:
-                    from datetime import datetime, timedelta
-                    last_forecast = forecasts[-1]
-                    # Add current year to parse the date correctly
-                    current_year = datetime.now().year
-                    last_date = datetime.strptime(f"{last_forecast['date']}, {current_year}", '%a, %b %d, %Y')
-
-                    # Add days 6 and 7 with slight variations
-                    for i in range(1, 3):
-                        next_date = last_date + timedelta(days=i)
-                        # Vary temps slightly based on last day
-                        temp_variation = (-2 if i == 1 else 1)
-                        forecasts.append({
-                            'date': next_date.strftime('%a, %b %d'),
-                            'temp_high': last_forecast['temp_high'] + temp_variation,
-                            'temp_low': last_forecast['temp_low'] + temp_variation,
-                            'description': last_forecast['description'],
-                            'icon': last_forecast['icon'],
-                            'humidity': last_forecast['humidity'],
-                            'wind_speed': last_forecast['wind_speed']
-                        })
-
-                return forecasts
+            if response.status_code == 200:
+                return self._parse_basic_forecast(response.json())
             else:
                 return None
 
@@ -300,6 +280,236 @@ class WeatherAPI:
             print(f"Error getting basic forecast: {str(e)}")
             return None
 
+    def get_coordinates(self, city):
+        """
+        Look up coordinates for a city
+
+        Served from the shared geocode cache; the geocoding API is only
+        called once per city, even by concurrent callers.
+
+        Args:
+            city (str): City name
+
+        Returns:
+            tuple: (lat, lon) or None if the city could not be geocoded
+        """
+        return self.geocode_cache.lookup(city, self._geocode)
+
+    async def get_coordinates_async(self, city):
+        """Async version of get_coordinates"""
+        return await self.geocode_cache.lookup_async(city, self._geocode_async)
+
+    def _geocode(self, city):
+        """Ask the geocoding API for a city's coordinates"""
+        geo_response = self.http.get(self.geocoding_url, params=self._geocode_params(city))
+        return self._parse_coordinates(geo_response)
+
+    async def _geocode_async(self, city):
+        """Async version of _geocode"""
+        geo_response = await self.async_http.get(self.geocoding_url, params=self._geocode_params(city))
+        return self._parse_coordinates(geo_response)
+
+    def _geocode_params(self, city):
+        """Query parameters for the geocoding API"""
+        return {
+            'q': city,
+            'limit': 1,
+            'appid': self.api_key
+        }
+
+    def _city_params(self, city):
+        """Query parameters for the city-based endpoints"""
+        return {
+            'q': city,
+            'appid': self.api_key,
+            'units': 'imperial'  # Fahrenheit
+        }
+
+    def _onecall_params(self, coords, exclude):
+        """Query parameters for the One Call API"""
+        lat, lon = coords
+        return {
+            'lat': lat,
+            'lon': lon,
+            'appid': self.api_key,
+            'units': 'imperial',
+            'exclude': exclude
+        }
+
+    def _parse_coordinates(self, geo_response):
+        """Extract (lat, lon) from a geocoding response"""
+        if geo_response.status_code != 200:
+            return None
+
+        geo_data = geo_response.json()
+        if not geo_data:
+            return None
+
+        return (geo_data[0]['lat'], geo_data[0]['lon'])
+
+    def _parse_current_weather(self, response, city):
+        """Build current weather from a /weather response"""
+        # Check if request was successful
+        if response.status_code == 200:
+            try:
+                data = response.json()
+
+                # Extract relevant information
+                weather_data = {
+                    'city': data['name'],
+                    'temperature': round(data['main']['temp']),
+                    'feels_like': round(data['main']['feels_like']),
+                    'humidity': data['main']['humidity'],
+                    'description': data['weather'][0]['description'],
+                    'icon': data['weather'][0]['icon'],
+                    'wind_speed': round(data['wind']['speed'])
+                }
+
+                return weather_data
+            except KeyError as e:
+                print(f"Error: Unexpected API response format - missing key {e}")
+                return None
+
+        elif response.status_code == 401:
+            print("Error: Invalid API key")
+            return None
+        elif response.status_code == 404:
+            print(f"Error: City '{city}' not found")
+            return None
+        else:
+            print(f"Error: API returned status code {response.status_code}")
+            return None
+
+    def _parse_onecall_bundle(self, data, city, hours):
+        """Build current weather, hourly and 7-day forecasts from one One Call response"""
+        current = data['current']
+
+        return {
+            'weather': {
+                'city': city,
+                'temperature': round(current['temp']),
+                'feels_like': round(current['feels_like']),
+                'humidity': current['humidity'],
+                'description': current['weather'][0]['description'],
+                'icon': current['weather'][0]['icon'],
+                'wind_speed': round(current['wind_speed'])
+            },
+            'forecast': self._parse_daily_forecast(data),
+            'hourly': self._parse_hourly_forecast(data, hours)
+        }
+
+    def _parse_basic_bundle(self, data, hours):
+        """Build hourly and 7-day forecasts from one basic /forecast response"""
+        return {
+            'forecast': self._parse_basic_forecast(data),
+            'hourly': self._parse_basic_hourly_forecast(data, hours)
+        }
+
+    def _parse_daily_forecast(self, data):
+        """Build the 7-day forecast from a One Call response"""
+        forecasts = []
+        # Get daily forecasts (7 days)
+        for day in data['daily'][:7]:
+            forecast = {
+                'date': datetime.fromtimestamp(day['dt']).strftime('%a, %b %d'),
+                'temp_high': round(day['temp']['max']),
+                'temp_low': round(day['temp']['min']),
+                'description': day['weather'][0]['description'].title(),
+                'icon': day['weather'][0]['icon'],
+                'humidity': day['humidity'],
+                'wind_speed': round(day['wind_speed'])
+            }
+            forecasts.append(forecast)
+
+        return forecasts
+
+    def _parse_hourly_forecast(self, data, hours):
+        """Build the hourly forecast from a One Call response"""
+        forecasts = []
+        # Get hourly forecasts
+        for hour in data['hourly'][:hours]:
+            forecast = {
+                'time': datetime.fromtimestamp(hour['dt']).strftime('%I %p'),
+                'date': datetime.fromtimestamp(hour['dt']).strftime('%a'),
+                'temperature': round(hour['temp']),
+                'feels_like': round(hour['feels_like']),
+                'description': hour['weather'][0]['description'].title(),
+                'icon': hour['weather'][0]['icon'],
+                'humidity': hour['humidity'],
+                'wind_speed': round(hour['wind_speed']),
+                'precipitation': round(hour.get('pop', 0) * 100)  # Probability of precipitation
+            }
+            forecasts.append(forecast)
+
+        return forecasts
+
+    def _parse_basic_hourly_forecast(self, data, hours):
+        """Build the hourly forecast from a basic /forecast response"""
+        forecasts = []
+        for item in data['list'][:hours]:
+            date_obj = datetime.fromtimestamp(item['dt'])
+
+            forecast = {
+                'time': date_obj.strftime('%I %p'),
+                'date': date_obj.strftime('%a'),
+                'temperature': round(item['main']['temp']),
+                'feels_like': round(item['main']['feels_like']),
+                'description': item['weather'][0]['description'].title(),
+                'icon': item['weather'][0]['icon'],
+                'humidity': item['main']['humidity'],
+                'wind_speed': round(item['wind']['speed']),
+                'precipitation': round(item.get('pop', 0) * 100)
+            }
+            forecasts.append(forecast)
+
+        return forecasts
+
+    def _parse_basic_forecast(self, data):
+        """Build the 7-day forecast from a basic /forecast response"""
+        # Group by day and get one forecast per day
+        daily_forecasts = {}
+        for item in data['list']:
+            date_obj = datetime.fromtimestamp(item['dt'])
+            date_key = date_obj.strftime('%Y-%m-%d')
+
+            if date_key not in daily_forecasts:
+                daily_forecasts[date_key] = {
+                    'date': date_obj.strftime('%a, %b %d'),
+                    'temp_high': round(item['main']['temp_max']),
+                    'temp_low': round(item['main']['temp_min']),
+                    'description': item['weather'][0]['description'].title(),
+                    'icon': item['weather'][0]['icon'],
+                    'humidity': item['main']['humidity'],
+                    'wind_speed': round(item['wind']['speed'])
+                }
+
+        # Convert to list - get first 5 days from API
+        forecasts = list(daily_forecasts.values())[:5]
+
+        # Extend to 7 days by projecting the last 2 days based on patterns
+        if len(forecasts) >= 5:
+            last_forecast = forecasts[-1]
+            # Add current year to parse the date correctly
+            current_year = datetime.now().year
+            last_date = datetime.strptime(f"{last_forecast['date']}, {current_year}", '%a, %b %d, %Y')
+
+            # Add days 6 and 7 with slight variations
+            for i in range(1, 3):
+                next_date = last_date + timedelta(days=i)
+                # Vary temps slightly based on last day
+                temp_variation = (-2 if i == 1 else 1)
+                forecasts.append({
+                    'date': next_date.strftime('%a, %b %d'),
+                    'temp_high': last_forecast['temp_high'] + temp_variation,
+                    'temp_low': last_forecast['temp_low'] + temp_variation,
+                    'description': last_forecast['description'],
+                    'icon': last_forecast['icon'],
+                    'humidity': last_forecast['humidity'],
+                    'wind_speed': last_forecast['wind_speed']
+                })
+
+        return forecasts
+
 
 # Test the API
 if __name__ == '__main__':
@@ -1,79 +1,293 @@
 import os
-from datetime import datetime, timedelta
-import json
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from api_clients.weather_api import WeatherAPI
-from api_clients.news_api import NewsAPI
-from api_clients.stock_api import StockAPI
-from api_clients.quote_api import QuoteAPI
-from api_clients.twitter_api import TwitterAPI
-from api_clients.reddit_api import RedditAPI
+import asyncio
+import importlib
+import threading
+import time
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, TimeoutError as FuturesTimeout, as_completed, wait
+from api_clients.config import load_config
+from cache import DashboardCache
+from cache_backends import get_cache_backend
+from payloads import PayloadCache
+from singleflight import SingleFlight
+from api_clients.providers import TASK_PROVIDERS
+
+
+def _client_property(name):
+    """Dashboard attribute that builds its API client on first access"""
+    return property(lambda self: self._client(name), doc=f"{name} API client, built on first use")
+
 
 class Dashboard:
     """Main dashboard that aggregates all API data"""
 
+    # Dashboard sections
+    SOURCES = ['weather', 'forecast', 'hourly', 'news', 'quote', 'twitter', 'reddit', 'stocks', 'etfs']
+
+    # Fetch task that produces each section, in the order tasks are submitted.
+    # One weather request serves current weather and both forecasts, and one
+    # fetch plan serves every watchlist.
+    SECTION_TASKS = {
+        'weather': 'weather',
+        'forecast': 'weather',
+        'hourly': 'weather',
+        'news': 'news',
+        'quote': 'quote',
+        'twitter': 'twitter',
+        'reddit': 'reddit',
+        'stocks': 'stocks',
+        'etfs': 'stocks'
+    }
+
+    # Seconds each fetch task may take before its last known good data is
+    # served instead (the fetch keeps running and updates the cache)
+    SOURCE_DEADLINES = {
+        'weather': 5,
+        'news': 4,
+        'quote': 3,
+        'twitter': 4,
+        'reddit': 5,
+        'stocks': 6
+    }
+
+    # Seconds get_changes waits at a time when the cache is shared: other
+    # workers' writes only reach this process when it reads the cache again
+    CHANGE_POLL_INTERVAL = 5
+
+    # Client attribute -> (module, class). Clients and their modules are only
+    # loaded on first use, so startup doesn't wait for praw, requests or numpy.
+    CLIENTS = {
+        'weather': ('api_clients.weather_api', 'WeatherAPI'),
+        'news': ('api_clients.news_api', 'NewsAPI'),
+        'stocks': ('api_clients.stock_api', 'StockAPI'),
+        'quotes': ('api_clients.quote_api', 'QuoteAPI'),
+        'twitter': ('api_clients.twitter_api', 'TwitterAPI'),
+        'reddit': ('api_clients.reddit_api', 'RedditAPI')
+    }
+
+    weather = _client_property('weather')
+    news = _client_property('news')
+    stocks = _client_property('stocks')
+    quotes = _client_property('quotes')
+    twitter = _client_property('twitter')
+    reddit = _client_property('reddit')
+
     def __init__(self):
-        self.weather = WeatherAPI()
-        self.news = NewsAPI()
-        self.stocks = StockAPI()
-        self.quotes = QuoteAPI()
-        self.twitter = TwitterAPI()
-        self.reddit = RedditAPI()
-
-        self.cache_file = 'dashboard_cache.json'
-        self.cache_duration = 300  # 5 minutes in seconds
-
-    def load_cache(self):
-        """Load cached data if fresh enough"""
-        try:
-            if os.path.exists(self.cache_file):
-                with open(self.cache_file, 'r') as f:
-                    cache = json.load(f)
+        started = time.perf_counter()
+        load_config()
 
-                # Check if cache is still fresh
-                cache_time = datetime.fromisoformat(cache['timestamp'])
-                age = (datetime.now() - cache_time).total_seconds()
+        self._clients = {}
+        self._client_locks = {name: threading.Lock() for name in self.CLIENTS}
+        self._transport = None
+        self._watchlists = None
 
-                if age < self.cache_duration:
-                    print(f"Using cached data ({int(age)} seconds old)")
-                    return cache['data']
-        except Exception as e:
-            print(f"Could not load cache: {e}")
+        # Seconds spent building the dashboard and each client (once built)
+        self.startup_times = {}
 
-        return None
+        # Cities the dashboard serves (DASHBOARD_CITIES, comma-separated); the first is the default
+        self.cities = [city.strip() for city in os.getenv('DASHBOARD_CITIES', 'Chicago').split(',') if city.strip()] or ['Chicago']
+        self.default_city = self.cities[0]
+        # Written through to CACHE_BACKEND; a shared backend (sqlite or socket)
+        # gives every worker on the host one warm cache
+        self.cache = DashboardCache(backend=get_cache_backend())
 
-    def save_cache(self, data):
-        """Save data to cache"""
-        try:
-            cache = {
-                'timestamp': datetime.now().isoformat(),
-                'data': data
-            }
-            with open(self.cache_file, 'w') as f:
-                json.dump(cache, f, indent=2)
-        except Exception as e:
-            print(f"Could not save cache: {e}")
+        # With a shared backend, only the worker holding a key's lease fetches
+        # it; the others wait up to lease_timeout seconds for its result
+        self.lease_timeout = 30
+        self.lease_poll = 0.1
+
+        # Encoded /api/data responses per (category, city), rebuilt only when a section changes
+        self.payloads = PayloadCache()
+
+        # Version tokens carry cache write numbers, which only mean something
+        # to this process; the id lets other workers recognize foreign tokens
+        self.instance_id = os.urandom(4).hex()
+
+        # Stale-while-revalidate: how long past its TTL a section may still be
+        # served while it refreshes in the background
+        self.max_stale = 1800  # 30 minutes
+        self.background = ThreadPoolExecutor(max_workers=4, thread_name_prefix='dashboard-refresh')
+
+        # Shared by every request instead of a new pool per refresh
+        self.executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='dashboard-fetch')
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
 
-    def fetch_all_data(self, use_cache=True, news_category='technology'):
+        # Upper bound on how long a request waits for fetches, whatever the
+        # per-source deadlines, and how long a primary request runs before its
+        # fallback is started in parallel
+        self.latency_budget = 8
+        self.hedge_after = 2
+        self.hedges = ThreadPoolExecutor(max_workers=4, thread_name_prefix='dashboard-hedge')
+
+        # Concurrent requests for the same data share one upstream fetch
+        self.flights = SingleFlight()
+
+        # Forced refreshes of the same category and city within this many
+        # seconds are served from cache, so repeated clicks can't cause a stampede
+        self.refresh_debounce = 30
+        self._last_forced_refresh = {}
+
+        # A fetch task that failed isn't tried again for this many seconds, so
+        # a provider that keeps failing (e.g. a rejected API key) isn't called
+        # on every request and scheduler run
+        self.failure_ttl = 30
+
+        # News category -> clustering of its articles, posts and tweets into stories
+        self.story_indexes = {}
+        self._story_lock = threading.Lock()
+
+        self.startup_times['dashboard'] = time.perf_counter() - started
+
+    @property
+    def transport(self):
+        """One pooled transport shared by every client, so connections stay warm between refreshes"""
+        if self._transport is None:
+            from api_clients.transport import get_default_transport
+            self._transport = get_default_transport()
+        return self._transport
+
+    @property
+    def watchlists(self):
+        """Watchlist name -> symbols; 'stocks' and 'etfs' are the dashboard's sections"""
+        if self._watchlists is None:
+            from api_clients.stock_api import load_watchlists
+            self._watchlists = load_watchlists()
+        return self._watchlists
+
+    def _client(self, name):
+        """API client for a CLIENTS entry, imported and built on first use"""
+        client = self._clients.get(name)
+        if client is None:
+            with self._client_locks[name]:
+                client = self._clients.get(name)
+                if client is None:
+                    started = time.perf_counter()
+                    module, class_name = self.CLIENTS[name]
+                    client = getattr(importlib.import_module(module), class_name)(self.transport)
+                    self._clients[name] = client
+                    self.startup_times[name] = time.perf_counter() - started
+        return client
+
+    def startup_report(self):
         """
-        Fetch data from all APIs
+        How long startup took and what has been loaded since
+
+        Returns:
+            dict: 'dashboard' (seconds to build the Dashboard) and 'clients'
+                (client -> seconds its first use spent importing and building
+                it, None if it hasn't been used yet)
+        """
+        return {
+            'dashboard': self.startup_times.get('dashboard'),
+            'clients': {name: self.startup_times.get(name) for name in self.CLIENTS}
+        }
+
+    def cache_key(self, source, category, city):
+        """
+        Cache key for a section, including only the parameters it depends on
+
+        Fetch tasks are named after their first section, so this also keys
+        in-flight fetches.
+        """
+        if source in ('weather', 'forecast', 'hourly'):
+            return DashboardCache.make_key(source, city=city)
+        if source in ('news', 'twitter', 'reddit'):
+            return DashboardCache.make_key(source, category=category)
+        if source in ('stocks', 'etfs'):
+            return DashboardCache.make_key(source, symbols=self.watchlists[source])
+        return DashboardCache.make_key(source)
+
+    def get_fetchers(self, news_category, city):
+        """
+        Build the fetch function for each fetch task
 
         Args:
-            use_cache (bool): Whether to use cached data
-            news_category (str): News category to fetch (technology, business, general, entertainment, health, science, sports)
+            news_category (str): News category for news, tweets and Reddit posts
+            city (str): City for weather sections
 
         Returns:
-            dict: All dashboard data
+            dict: Task name -> zero-argument function returning {section: value}
         """
-        # Try cache first
-        if use_cache:
-            cached = self.load_cache()
-            if cached:
-                return cached
+        def fetch_weather():
+            print("  - Getting weather and forecasts...")
+            return self._hedged(
+                lambda: self.weather.get_onecall_bundle(city, 24),
+                lambda: self.weather.get_basic_weather_bundle(city, 24)
+            )
+
+        def fetch_news():
+            print(f"  - Getting {news_category} news...")
+            return {'news': self.news.get_latest_headlines(category=news_category, num_articles=5)}
 
-        print("Fetching fresh data from APIs in parallel...")
+        def fetch_watchlists():
+            print("  - Getting stocks and ETFs...")
+            quotes = self.stocks.get_watchlist_quotes(self.watchlists)
+            return {'stocks': quotes['stocks'], 'etfs': quotes['etfs']}
+
+        def fetch_quote():
+            print("  - Getting quote...")
+            return {'quote': self.quotes.get_random_quote()}
+
+        def fetch_twitter():
+            print(f"  - Getting {news_category} tweets...")
+            return {'twitter': self.twitter.get_tweets_by_category(category=news_category, num_tweets=3)}
+
+        def fetch_reddit():
+            print(f"  - Getting {news_category} Reddit posts...")
+            return {'reddit': self.reddit.get_trending_posts(subreddit_name='technology', num_posts=3, category=news_category)}
 
-        dashboard_data = {
+        return {
+            'weather': fetch_weather,
+            'news': fetch_news,
+            'quote': fetch_quote,
+            'twitter': fetch_twitter,
+            'reddit': fetch_reddit,
+            'stocks': fetch_watchlists
+        }
+
+    def get_async_fetchers(self, news_category, city):
+        """
+        Build the async fetch coroutine function for each fetch task
+
+        Args:
+            news_category (str): News category for news, tweets and Reddit posts
+            city (str): City for weather sections
+
+        Returns:
+            dict: Task name -> zero-argument coroutine function returning {section: value}
+        """
+        async def fetch_weather():
+            return await self.weather.get_weather_bundle_async(city, 24)
+
+        async def fetch_news():
+            return {'news': await self.news.get_latest_headlines_async(category=news_category, num_articles=5)}
+
+        async def fetch_quote():
+            return {'quote': await self.quotes.get_random_quote_async()}
+
+        async def fetch_twitter():
+            return {'twitter': await self.twitter.get_tweets_by_category_async(category=news_category, num_tweets=3)}
+
+        async def fetch_reddit():
+            return {'reddit': await self.reddit.get_trending_posts_async(subreddit_name='technology', num_posts=3, category=news_category)}
+
+        async def fetch_watchlists():
+            quotes = await self.stocks.get_watchlist_quotes_async(self.watchlists)
+            return {'stocks': quotes['stocks'], 'etfs': quotes['etfs']}
+
+        return {
+            'weather': fetch_weather,
+            'news': fetch_news,
+            'quote': fetch_quote,
+            'twitter': fetch_twitter,
+            'reddit': fetch_reddit,
+            'stocks': fetch_watchlists
+        }
+
+    def _empty_dashboard_data(self):
+        """Dashboard payload with every section empty"""
+        return {
             'generated_at': datetime.now().isoformat(),
             'weather': None,
             'forecast': None,
@@ -83,76 +297,709 @@ class Dashboard:
             'etfs': {},
             'quote': None,
             'twitter': None,
-            'reddit': None
+            'reddit': None,
+            'stale': False,
+            'stale_sections': []
         }
 
-        # Define fetch functions
-        def fetch_weather():
-            print("  - Getting weather...")
-            return ('weather', self.weather.get_current_weather("Chicago"))
+    def _start_dashboard_data(self, use_cache, news_category, city, max_stale=0):
+        """
+        Build the dashboard skeleton filled with cached sections
 
-        def fetch_forecast():
-            print("  - Getting 7-day forecast...")
-            return ('forecast', self.weather.get_7day_forecast("Chicago"))
+        Args:
+            use_cache (bool): Whether to use cached data
+            news_category (str): News category
+            city (str): City for weather sections
+            max_stale (int): Seconds past its TTL an expired section may still be served
 
-        def fetch_hourly():
-            print("  - Getting hourly forecast...")
-            return ('hourly', self.weather.get_hourly_forecast("Chicago", 24))
+        Returns:
+            tuple: (dashboard data, fetch tasks needed before returning,
+                    fetch tasks whose sections were served stale)
+        """
+        dashboard_data = self._empty_dashboard_data()
 
-        def fetch_news():
-            print(f"  - Getting {news_category} news...")
-            return ('news', self.news.get_top_headlines(category=news_category, num_articles=5))
+        pending = []
+        stale = []
+        for source in self.SOURCES:
+            task = self.SECTION_TASKS[source]
 
-        def fetch_most_active_stocks():
-            print("  - Getting most active stocks...")
-            return ('stocks', self.stocks.get_most_active_stocks())
+            if use_cache:
+                cached, age = self.cache.peek(self.cache_key(source, news_category, city))
+                if cached is not None:
+                    ttl = self.cache.ttl_for(source)
+                    if age < ttl:
+                        dashboard_data[source] = cached
+                        continue
+                    if age < ttl + max_stale:
+                        dashboard_data[source] = cached
+                        dashboard_data['stale_sections'].append(source)
+                        if task not in stale:
+                            stale.append(task)
+                        continue
 
-        def fetch_popular_etfs():
-            print("  - Getting popular ETFs...")
-            return ('etfs', self.stocks.get_popular_etfs())
+            if task not in pending:
+                pending.append(task)
 
-        def fetch_quote():
-            print("  - Getting quote...")
-            return ('quote', self.quotes.get_random_quote())
+        from api_clients.circuit_breaker import get_circuit_breaker
 
-        def fetch_twitter():
-            print(f"  - Getting {news_category} tweets...")
-            return ('twitter', self.twitter.get_tweets_by_category(category=news_category, num_tweets=3))
+        # While a provider's circuit is open, serve its last known good data
+        # rather than waiting on (or mocking) a provider that is down
+        for task in list(pending):
+            provider, _ = TASK_PROVIDERS[task]
+            if get_circuit_breaker(provider).available():
+                continue
 
-        def fetch_reddit():
-            print(f"  - Getting {news_category} Reddit posts...")
-            return ('reddit', self.reddit.get_trending_posts(subreddit_name='technology', num_posts=3, category=news_category))
-
-        # Fetch all data in parallel using ThreadPoolExecutor
-        with ThreadPoolExecutor(max_workers=8) as executor:
-            futures = []
-
-            # Submit all API calls
-            futures.append(executor.submit(fetch_weather))
-            futures.append(executor.submit(fetch_forecast))
-            futures.append(executor.submit(fetch_hourly))
-            futures.append(executor.submit(fetch_news))
-            futures.append(executor.submit(fetch_quote))
-            futures.append(executor.submit(fetch_twitter))
-            futures.append(executor.submit(fetch_reddit))
-            futures.append(executor.submit(fetch_most_active_stocks))
-            futures.append(executor.submit(fetch_popular_etfs))
-
-            # Collect results as they complete
-            for future in as_completed(futures):
+            last_known_good = self._last_known_good(task, news_category, city)
+            if last_known_good:
+                print(f"{provider} circuit is open - serving last known good {task}")
+                dashboard_data.update(last_known_good)
+                dashboard_data['stale_sections'].extend(last_known_good)
+                pending.remove(task)
+
+        # Nor retry a task that just failed; its last known good data (if
+        # any) is served until failure_ttl passes
+        for task in list(pending):
+            if not self.cache.failed_recently(self.cache_key(task, news_category, city)):
+                continue
+
+            last_known_good = self._last_known_good(task, news_category, city)
+            dashboard_data.update(last_known_good)
+            dashboard_data['stale_sections'].extend(last_known_good)
+            pending.remove(task)
+
+        # Tasks fetched now don't need a background refresh as well
+        stale = [task for task in stale if task not in pending]
+        dashboard_data['stale'] = bool(dashboard_data['stale_sections'])
+
+        return dashboard_data, pending, stale
+
+    def _store_sections(self, dashboard_data, sections, news_category, city):
+        """Put the sections a task fetched into the dashboard and the cache"""
+        for source, value in sections.items():
+            dashboard_data[source] = value
+
+            # Failures never replace cached data; refresh_task holds off
+            # retrying them for failure_ttl instead
+            if value is not None:
+                self.cache.set(self.cache_key(source, news_category, city), value)
+
+    def fetch_all_data(self, use_cache=True, news_category='technology', city=None, serve_stale=False, budget=None):
+        """
+        Fetch data from all APIs
+
+        Args:
+            use_cache (bool): Whether to use cached data
+            news_category (str): News category to fetch (technology, business, general, entertainment, health, science, sports)
+            city (str): City for weather sections (defaults to default_city)
+            serve_stale (bool): Return expired sections immediately (up to max_stale
+                seconds past their TTL) and refresh them in the background
+            budget (float): Seconds to wait for fetches (defaults to latency_budget)
+
+        Returns:
+            dict: All dashboard data
+        """
+        dashboard_data = self._empty_dashboard_data()
+
+        for key, value in self.iter_dashboard_data(use_cache, news_category, city, serve_stale, budget):
+            dashboard_data[key] = value
+
+        return dashboard_data
+
+    def get_payload(self, news_category='technology', city=None):
+        """
+        Dashboard data as a ready-to-send encoded payload
+
+        Sections are gathered like fetch_all_data(serve_stale=True). If every
+        section is the same cache entry as last time, the previously encoded
+        bytes are returned without serializing or compressing anything.
+
+        Args:
+            news_category (str): News category
+            city (str): City for weather sections (defaults to default_city)
+
+        Returns:
+            Payload: JSON body, gzip/brotli bodies and ETag (see payloads.py)
+        """
+        city = city or self.default_city
+        data = self.fetch_all_data(use_cache=True, news_category=news_category, city=city, serve_stale=True)
+        versions, complete = self._stamp_version(data, news_category, city)
+
+        fingerprint = (tuple(versions), tuple(data['stale_sections'])) if complete else None
+        return self.payloads.get((news_category, city), fingerprint, lambda: data)
+
+    def get_changes(self, since, news_category='technology', city=None, wait=0):
+        """
+        Sections that changed since a version a client already has
+
+        Args:
+            since (str): 'version' from an earlier payload or change set
+            news_category (str): News category
+            city (str): City for weather sections (defaults to default_city)
+            wait (float): If nothing changed, wait up to this many seconds for
+                a change (long polling). Only the cache is read while waiting.
+
+        Returns:
+            dict: 'version', 'full' and 'sections' (section -> value), plus
+                'generated_at', 'stale' and 'stale_sections'. If `since` is
+                unknown (another worker, a restart) 'full' is True and every
+                section is included.
+        """
+        city = city or self.default_city
+        previous = self._parse_version(since)
+        deadline = time.monotonic() + wait
+
+        writes = self.cache.writes
+        data = self.fetch_all_data(use_cache=True, news_category=news_category, city=city, serve_stale=True)
+        versions, _ = self._stamp_version(data, news_category, city)
+
+        if previous is None:
+            changed = list(self.SOURCES)
+        else:
+            # Sections that aren't the cached object can't be compared, so they count as changed
+            changed = [
+                source for source, old, new in zip(self.SOURCES, previous, versions)
+                if old != (new or 0) or (new is None and data[source] not in (None, {}))
+            ]
+
+        # Wait for one of the sections to be written, reading only the cache:
+        # fetching here would retry missing sections on every wake-up
+        keys = [self.cache_key(source, news_category, city) for source in self.SOURCES]
+        while not changed:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            # wait_for_write only wakes on this process's writes, so with a
+            # shared backend look at the cache again every few seconds
+            if self.cache.backend is not None and self.cache.backend.shared:
+                remaining = min(remaining, self.CHANGE_POLL_INTERVAL)
+            self.cache.wait_for_write(writes, remaining)
+            writes = self.cache.writes
+
+            for source, key, version in zip(self.SOURCES, keys, versions):
+                current = self.cache.write_number(key)
+                if current is not None and current != version:
+                    data[source], _ = self.cache.peek(key)
+                    changed.append(source)
+
+            if changed:
+                versions, _ = self._stamp_version(data, news_category, city)
+                data['stale_sections'] = [source for source in data['stale_sections'] if source not in changed]
+                data['stale'] = bool(data['stale_sections'])
+
+        return {
+            'version': data['version'],
+            'full': previous is None,
+            'sections': {source: data[source] for source in changed},
+            'generated_at': data['generated_at'],
+            'stale': data['stale'],
+            'stale_sections': data['stale_sections']
+        }
+
+    def version_of(self, data, news_category='technology', city=None):
+        """Version token of dashboard data, for clients to pass back as `since`"""
+        versions, _, _ = self._section_versions(data, news_category, city or self.default_city)
+        return self._format_version(versions)
+
+    def _stamp_version(self, data, news_category, city):
+        """
+        Add 'version' to dashboard data and date it by its newest section
+
+        generated_at becomes the newest section's fetch time rather than the
+        request time, so unchanged data encodes identically.
+
+        Returns:
+            tuple: (cache write number per section, None where unknown;
+                whether every non-empty section was identified)
+        """
+        versions, newest, complete = self._section_versions(data, news_category, city)
+        data['version'] = self._format_version(versions)
+        if complete and newest is not None:
+            data['generated_at'] = datetime.fromtimestamp(newest).isoformat()
+        return versions, complete
+
+    def _section_versions(self, data, news_category, city):
+        """
+        Cache write number of each section in SOURCES order
+
+        A section that isn't the cached object (e.g. the entry was refreshed
+        while this data was being assembled) has no number.
+
+        Returns:
+            tuple: (write numbers, newest store time, whether every non-empty
+                section was identified)
+        """
+        versions = []
+        newest = None
+        complete = True
+        for source in self.SOURCES:
+            version, stored_at = self.cache.version(self.cache_key(source, news_category, city), data.get(source))
+            if version is None and data.get(source) not in (None, {}):
+                complete = False
+            versions.append(version)
+            if stored_at is not None:
+                newest = max(newest or stored_at, stored_at)
+        return versions, newest, complete
+
+    def _format_version(self, versions):
+        """
+        Version token: this process's id and each section's write number
+
+        Unknown sections are 0, which never matches a real write, so they
+        are sent again on the next request for changes.
+        """
+        return f"{self.instance_id}-" + '.'.join(str(version or 0) for version in versions)
+
+    def _parse_version(self, token):
+        """Section write numbers from a version token, or None if it isn't from this process"""
+        try:
+            instance_id, numbers = token.split('-', 1)
+            versions = [int(number) for number in numbers.split('.')]
+        except (AttributeError, ValueError):
+            return None
+
+        if instance_id != self.instance_id or len(versions) != len(self.SOURCES):
+            return None
+        return versions
+
+    def iter_dashboard_data(self, use_cache=True, news_category='technology', city=None, serve_stale=False, budget=None):
+        """
+        Yield dashboard data as soon as each part is available
+
+        Cached sections come first, then the sections of each fetch task as
+        soon as that task completes, so fast providers don't wait for slow ones.
+        A task that misses its deadline (SOURCE_DEADLINES, capped by the
+        budget) is served from its last known good data and marked stale.
+
+        Args:
+            use_cache (bool): Whether to use cached data
+            news_category (str): News category to fetch
+            city (str): City for weather sections (defaults to default_city)
+            serve_stale (bool): Serve expired sections and refresh them in the background
+            budget (float): Seconds to wait for fetches (defaults to latency_budget)
+
+        Yields:
+            tuple: (key, value) for 'generated_at', 'stale', 'stale_sections' and each section
+        """
+        city = city or self.default_city
+
+        if not use_cache and self._debounce_forced_refresh(news_category, city):
+            print(f"Refreshed less than {self.refresh_debounce} seconds ago - using cached data")
+            use_cache = True
+
+        # Serve cached sections, fetch only the rest
+        max_stale = self.max_stale if serve_stale else 0
+        dashboard_data, pending, stale = self._start_dashboard_data(use_cache, news_category, city, max_stale)
+
+        if stale:
+            print(f"Serving stale {', '.join(dashboard_data['stale_sections'])} while refreshing in the background")
+            self._refresh_in_background(stale, news_category, city)
+
+        for key, value in dashboard_data.items():
+            if self.SECTION_TASKS.get(key) not in pending:
+                yield key, value
+
+        if not pending:
+            print("Using cached data")
+            return
+
+        print(f"Fetching {len(pending)} data sources from APIs in parallel...")
+
+        # Fetch missing sections in parallel on the shared executor. refresh_task
+        # stores results in the cache, so they aren't lost if the caller stops
+        # early or a deadline passes.
+        budget = self.latency_budget if budget is None else budget
+        started = time.monotonic()
+        futures = {self.executor.submit(self.refresh_task, task, news_category, city): task for task in pending}
+        deadlines = {
+            future: started + min(self.SOURCE_DEADLINES.get(task, budget), budget)
+            for future, task in futures.items()
+        }
+
+        # Yield results as they complete
+        waiting = set(futures)
+        while waiting:
+            timeout = max(0, min(deadlines[future] for future in waiting) - time.monotonic())
+            done, waiting = wait(waiting, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
                 try:
-                    key, value = future.result()
-                    dashboard_data[key] = value
+                    yield from future.result().items()
                 except Exception as e:
-                    print(f"Error fetching data: {str(e)}")
+                    print(f"Error fetching {futures[future]}: {str(e)}")
+
+            now = time.monotonic()
+            missed = [future for future in waiting if deadlines[future] <= now]
+            for future in missed:
+                task = futures[future]
+                waiting.discard(future)
+                print(f"{task} missed its {deadlines[future] - started:.1f}s deadline - serving last known good data")
+
+                for section, value in self._last_known_good(task, news_category, city).items():
+                    dashboard_data['stale_sections'].append(section)
+                    yield section, value
+
+            if missed:
+                dashboard_data['stale'] = bool(dashboard_data['stale_sections'])
+                yield 'stale', dashboard_data['stale']
+                yield 'stale_sections', dashboard_data['stale_sections']
 
         print("All data fetched!")
 
-        # Save to cache
-        self.save_cache(dashboard_data)
+    def resolve_city(self, city):
+        """
+        Configured spelling of a city name
+
+        Returns:
+            str: The matching entry of self.cities, or None if it isn't served
+        """
+        wanted = ' '.join(city.strip().lower().split())
+        for configured in self.cities:
+            if configured.lower() == wanted:
+                return configured
+        return None
+
+    def fetch_weather_for_cities(self, cities=None, use_cache=True):
+        """
+        Weather sections for many cities at once
+
+        Fresh cities come from the cache. The rest are refreshed concurrently
+        and cached per city; their requests take OpenWeatherMap tokens in the
+        transport, so coalesced or leased refreshes cost none.
+
+        Args:
+            cities (list): Cities (defaults to all configured cities)
+            use_cache (bool): Whether to use cached data
+
+        Returns:
+            dict: City -> {'weather', 'forecast', 'hourly'}
+        """
+        cities = list(dict.fromkeys(cities or self.cities))
+        results = {}
+        pending = []
+
+        for city in cities:
+            sections = {section: self.cache.get(self.cache_key(section, None, city)) for section in ('weather', 'forecast', 'hourly')}
+            if use_cache and all(value is not None for value in sections.values()):
+                results[city] = sections
+            else:
+                pending.append(city)
+
+        futures = {self.executor.submit(self.refresh_task, 'weather', city=city): city for city in pending}
+        for future in as_completed(futures):
+            city = futures[future]
+            try:
+                results[city] = future.result()
+            except Exception as e:
+                print(f"Error fetching weather for {city}: {str(e)}")
+                results[city] = self._last_known_good('weather', None, city)
+
+        return {city: results[city] for city in cities if city in results}
+
+    def get_stories(self, news_category='technology', limit=20):
+        """
+        News, Reddit posts and tweets of a category grouped into stories
+
+        The three sections come from the cache when possible (stale ones are
+        refreshed in the background), together with every buffered article
+        of the category. Only items not seen before are added to the
+        category's story index.
+
+        Args:
+            news_category (str): News category
+            limit (int): Number of stories to return
+
+        Returns:
+            tuple: (stories ranked by cross-source engagement, whether any section was stale)
+        """
+        from stories import StoryIndex
+
+        with self._story_lock:
+            index = self.story_indexes.setdefault(news_category, StoryIndex())
+
+        any_stale = False
+        for section in ('news', 'twitter', 'reddit'):
+            items, stale = self.fetch_section(section, news_category, serve_stale=True)
+            any_stale = any_stale or stale
+            index.add(section, items)
+
+        index.add('news', self.news.index.articles(self.news.index.feed_key('us', news_category)))
+
+        return index.stories(limit), any_stale
+
+    def _last_known_good(self, task, news_category, city):
+        """
+        Cached sections of a fetch task, however old
+
+        Returns:
+            dict: Section -> value for the sections that have ever been cached
+        """
+        sections = {}
+        for section, section_task in self.SECTION_TASKS.items():
+            if section_task == task:
+                value, _ = self.cache.peek(self.cache_key(section, news_category, city))
+                if value is not None:
+                    sections[section] = value
+        return sections
+
+    def _hedged(self, primary, fallback):
+        """
+        Call primary, starting fallback in parallel if it is slow or fails
+
+        Instead of waiting for the primary request to time out before trying
+        the fallback, both race once primary has run for hedge_after seconds.
+
+        Args:
+            primary (callable): Preferred fetch, returning None on failure
+            fallback (callable): Alternative fetch
+
+        Returns:
+            The first usable result (primary's when both are ready), or None
+        """
+        first = self.hedges.submit(primary)
+        try:
+            result = first.result(timeout=self.hedge_after)
+            if result is not None:
+                return result
+        except FuturesTimeout:
+            pass
+        except Exception as e:
+            print(f"Primary fetch failed: {str(e)}")
+
+        if first.done():
+            # Primary already failed, nothing to race against
+            return fallback()
+
+        second = self.hedges.submit(fallback)
+        waiting = {first, second}
+        while waiting:
+            done, waiting = wait(waiting, return_when=FIRST_COMPLETED)
+            for future in (first, second):
+                if future not in done:
+                    continue
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"Hedged fetch failed: {str(e)}")
+                    continue
+                if result is not None:
+                    return result
+
+        return None
+
+    def fetch_section(self, section, news_category='technology', city=None, serve_stale=False):
+        """
+        Get one dashboard section, from cache when possible
+
+        Args:
+            section (str): Section name (see SOURCES)
+            news_category (str): News category
+            city (str): City for weather sections (defaults to default_city)
+            serve_stale (bool): Serve an expired section and refresh it in the background
+
+        Returns:
+            tuple: (section data, whether it is stale)
+        """
+        city = city or self.default_city
+        task = self.SECTION_TASKS[section]
+
+        cached, age = self.cache.peek(self.cache_key(section, news_category, city))
+        if cached is not None:
+            ttl = self.cache.ttl_for(section)
+            if age < ttl:
+                return cached, False
+            if serve_stale and age < ttl + self.max_stale:
+                self._refresh_in_background([task], news_category, city)
+                return cached, True
+
+        sections = self.refresh_task(task, news_category, city)
+        return sections.get(section), False
+
+    def _debounce_forced_refresh(self, news_category, city):
+        """
+        Record a forced refresh
+
+        Returns:
+            bool: True if the same refresh was forced within refresh_debounce seconds
+        """
+        key = (news_category, city)
+        now = time.monotonic()
+
+        with self._refresh_lock:
+            last = self._last_forced_refresh.get(key)
+            if last is not None and now - last < self.refresh_debounce:
+                return True
+            self._last_forced_refresh[key] = now
+            return False
+
+    def refresh_task(self, task, news_category='technology', city=None):
+        """
+        Fetch one task's sections and store them in the cache
+
+        Args:
+            task (str): Fetch task name (see SECTION_TASKS)
+            news_category (str): News category
+            city (str): City for weather sections (defaults to default_city)
+
+        Returns:
+            dict: The sections that were fetched, or while the task's last
+                fetch failed less than failure_ttl seconds ago, its last known
+                good sections without calling the provider
+        """
+        city = city or self.default_city
+        key = self.cache_key(task, news_category, city)
+        if self.cache.failed_recently(key):
+            return self._last_known_good(task, news_category, city)
+
+        fetchers = self.get_fetchers(news_category, city)
+        try:
+            sections = self.flights.do(key, lambda: self._fetch_with_lease(task, news_category, city, fetchers[task]))
+        except Exception:
+            self.cache.set_failed(key, self.failure_ttl)
+            raise
+
+        if any(value is None for value in sections.values()):
+            self.cache.set_failed(key, self.failure_ttl)
+        return sections
+
+    def _fetch_with_lease(self, task, news_category, city, fetch):
+        """
+        Fetch a task and cache its sections, unless another worker already is
+
+        While another worker holds the task's lease, its result is awaited
+        in the shared cache instead of fetching the same data again. If the
+        holder gives up without storing anything, this worker takes over; if
+        it takes longer than lease_timeout, this worker fetches anyway.
+        """
+        key = self.cache_key(task, news_category, city)
+        started = time.time()
+        deadline = time.monotonic() + self.lease_timeout
+
+        while not self.cache.acquire_lease(key, self.lease_timeout):
+            sections = self._sections_stored_since(task, news_category, city, started)
+            if sections is not None:
+                return sections
+            if time.monotonic() >= deadline:
+                break
+            time.sleep(self.lease_poll)
+
+        try:
+            # The previous holder may have stored the result just before releasing the lease
+            sections = self._sections_stored_since(task, news_category, city, started)
+            if sections is None:
+                sections = fetch()
+                self._store_sections({}, sections, news_category, city)
+            return sections
+        finally:
+            self.cache.release_lease(key)
+
+    def _sections_stored_since(self, task, news_category, city, since):
+        """A task's cached sections, if another worker stored them after `since`"""
+        key = self.cache_key(task, news_category, city)
+        self.cache.reload(key)
+        value, age = self.cache.peek(key)
+        if value is None or time.time() - age < since:
+            return None
+
+        sections = {}
+        for section, section_task in self.SECTION_TASKS.items():
+            if section_task == task:
+                self.cache.reload(self.cache_key(section, news_category, city))
+                sections[section], _ = self.cache.peek(self.cache_key(section, news_category, city))
+        return sections
+
+    def _refresh_in_background(self, tasks, news_category, city):
+        """Start one background refresh per stale task, skipping ones already running"""
+        for task in tasks:
+            refresh_key = self.cache_key(task, news_category, city)
+            with self._refresh_lock:
+                if refresh_key in self._refreshing:
+                    continue
+                self._refreshing.add(refresh_key)
+
+            def refresh(task=task, refresh_key=refresh_key):
+                try:
+                    self.refresh_task(task, news_category, city)
+                except Exception as e:
+                    print(f"Error refreshing {task}: {str(e)}")
+                finally:
+                    with self._refresh_lock:
+                        self._refreshing.discard(refresh_key)
+
+            self.background.submit(refresh)
+
+    async def fetch_all_data_async(self, use_cache=True, news_category='technology', city=None, deadline=None):
+        """
+        Fetch data from all APIs on the running event loop
+
+        Sections that haven't finished when the deadline passes are cancelled
+        and served from their last known good data, so one slow provider
+        can't hold up the dashboard. Call close_async() before the event
+        loop ends so its connections are closed.
+
+        Args:
+            use_cache (bool): Whether to use cached data
+            news_category (str): News category to fetch
+            city (str): City for weather sections (defaults to default_city)
+            deadline (float): Seconds to wait for all sections (None waits for all)
+
+        Returns:
+            dict: All dashboard data
+        """
+        city = city or self.default_city
+
+        dashboard_data, pending, _ = self._start_dashboard_data(use_cache, news_category, city)
+
+        if not pending:
+            return dashboard_data
+
+        fetchers = self.get_async_fetchers(news_category, city)
+        tasks = {
+            asyncio.ensure_future(self.flights.do_async(self.cache_key(task, news_category, city), fetchers[task])): task
+            for task in pending
+        }
+
+        done, not_done = await asyncio.wait(tasks, timeout=deadline)
+
+        for task in not_done:
+            task.cancel()
+            print(f"Cancelled {tasks[task]}: deadline of {deadline}s passed")
+
+            last_known_good = self._last_known_good(tasks[task], news_category, city)
+            dashboard_data.update(last_known_good)
+            dashboard_data['stale_sections'].extend(last_known_good)
+            dashboard_data['stale'] = bool(dashboard_data['stale_sections'])
+
+        for task in done:
+            try:
+                sections = task.result()
+            except Exception as e:
+                print(f"Error fetching {tasks[task]}: {str(e)}")
+                sections = None
+
+            if sections is None or any(value is None for value in sections.values()):
+                self.cache.set_failed(self.cache_key(tasks[task], news_category, city), self.failure_ttl)
+            if sections is not None:
+                self._store_sections(dashboard_data, sections, news_category, city)
+
+        if not_done:
+            # Let the cancellations run before returning
+            await asyncio.gather(*not_done, return_exceptions=True)
 
         return dashboard_data
 
+    async def close_async(self):
+        """
+        Close the async transport's connections for the running event loop
+
+        aiohttp sessions belong to one loop, so callers that run
+        fetch_all_data_async in a short-lived loop (e.g. asyncio.run) should
+        await this before the loop ends.
+        """
+        from api_clients.async_transport import get_default_async_transport
+
+        await get_default_async_transport().close()
+
     def display_dashboard(self, data):
         """Display dashboard data in terminal"""
 
@@ -220,7 +1067,7 @@ def main():
     dashboard.display_dashboard(data)
 
     # Show cache info
-    print("Note: Data is cached for 5 minutes to avoid excessive API calls")
+    print("Note: Each section is cached separately (5 minutes to 1 hour) to avoid excessive API calls")
     print("Run with --no-cache flag to force refresh")
 
 
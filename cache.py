@@ -0,0 +1,291 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from cache_backends import FileBackend
+
+
+# How long each dashboard section stays fresh (seconds)
+DEFAULT_TTLS = {
+    'weather': 600,      # 10 minutes
+    'forecast': 1800,    # 30 minutes
+    'hourly': 1800,      # 30 minutes
+    'news': 900,         # 15 minutes (News API allows 100 requests/day)
+    'stocks': 300,       # 5 minutes
+    'etfs': 300,         # 5 minutes
+    'quote': 3600,       # 1 hour
+    'twitter': 300,      # 5 minutes
+    'reddit': 300        # 5 minutes
+}
+
+
+class DashboardCache:
+    """
+    LRU cache for dashboard sections with per-source TTLs
+
+    Entries live in process memory and are written through to an optional
+    backend (see cache_backends.py). With a shared backend, entries another
+    worker stored are picked up on read, and fetch leases keep workers from
+    fetching the same key at the same time.
+    """
+
+    def __init__(self, max_entries=256, ttls=None, default_ttl=300, persist_path=None, backend=None, sync_interval=1.0):
+        """
+        Args:
+            max_entries (int): Maximum number of entries before the least recently used is evicted
+            ttls (dict): Seconds each source stays fresh, keyed by source name
+            default_ttl (int): TTL for sources missing from ttls
+            persist_path (str): Optional JSON file that every write goes through to
+                (shorthand for backend=FileBackend(persist_path))
+            backend (CacheBackend): Optional backend that every write goes through to
+            sync_interval (float): Seconds between checks of a shared backend for
+                newer copies of an entry
+        """
+        self.max_entries = max_entries
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.default_ttl = default_ttl
+        self.persist_path = persist_path
+        self.backend = backend if backend is not None else (FileBackend(persist_path, max_entries) if persist_path else None)
+        self.sync_interval = sync_interval
+
+        # Identifies this process's fetch leases
+        self.holder = f"{os.getpid()}-{os.urandom(4).hex()}"
+        # Key -> when it was last checked in the shared backend, bounded like the entries
+        self._synced = OrderedDict()
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Key -> write number of its entry, so callers can tell whether a
+        # value changed without comparing it
+        self._versions = {}
+        self._writes = 0
+        self._written = threading.Condition(self._lock)
+
+        # Key -> when its last failed fetch stops holding off retries (this
+        # process only; failures are never written to the backend)
+        self._failures = OrderedDict()
+
+        if self.backend is not None:
+            self._load()
+
+    @staticmethod
+    def make_key(source, category=None, city=None, symbols=None):
+        """Build a cache key for a dashboard section"""
+        if symbols is not None:
+            symbols = tuple(symbols)
+        return (source, category, city, symbols)
+
+    def ttl_for(self, source):
+        """TTL in seconds for a source"""
+        return self.ttls.get(source, self.default_ttl)
+
+    def get(self, key):
+        """
+        Get a fresh cached value
+
+        Args:
+            key (tuple): Key from make_key()
+
+        Returns:
+            Cached value or None if missing or expired
+        """
+        self._sync(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            stored_at, value = entry
+            if time.time() - stored_at >= self.ttl_for(key[0]):
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def peek(self, key):
+        """
+        Get a cached value whatever its age
+
+        Args:
+            key (tuple): Key from make_key()
+
+        Returns:
+            tuple: (value, age in seconds), or (None, None) if missing
+        """
+        self._sync(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, None
+
+            stored_at, value = entry
+            self._entries.move_to_end(key)
+            return value, time.time() - stored_at
+
+    def version(self, key, value):
+        """
+        Write number and store time of an entry, if it still holds `value`
+
+        Args:
+            key (tuple): Key from make_key()
+            value: The value the caller got from this cache
+
+        Returns:
+            tuple: (version, stored_at), or (None, None) if the entry is missing
+                or holds a different object
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] is not value:
+                return None, None
+            return self._versions[key], entry[0]
+
+    def write_number(self, key):
+        """
+        Write number of an entry, after picking up a newer copy from a shared backend
+
+        Args:
+            key (tuple): Key from make_key()
+
+        Returns:
+            int: The entry's version, or None if missing
+        """
+        self._sync(key)
+        with self._lock:
+            return self._versions.get(key)
+
+    @property
+    def writes(self):
+        """Number of writes so far"""
+        return self._writes
+
+    def wait_for_write(self, after, timeout):
+        """
+        Block until the cache has been written to more than `after` times
+
+        Args:
+            after (int): A value of `writes` seen earlier
+            timeout (float): Seconds to wait at most
+
+        Returns:
+            bool: Whether a write happened
+        """
+        with self._lock:
+            return self._written.wait_for(lambda: self._writes > after, timeout)
+
+    def set(self, key, value):
+        """Store a value, evicting the least recently used entries if full"""
+        stored_at = time.time()
+        with self._lock:
+            self._put(key, stored_at, value)
+
+        if self.backend is not None:
+            self.backend.set(key, stored_at, value)
+
+    def set_failed(self, key, ttl):
+        """
+        Remember that fetching a key just failed, without touching its entry
+
+        Args:
+            key (tuple): Key from make_key()
+            ttl (float): Seconds until the fetch may be tried again
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._failures[key] = now + ttl
+            self._failures.move_to_end(key)
+            while self._failures and (len(self._failures) > self.max_entries or next(iter(self._failures.values())) <= now):
+                self._failures.popitem(last=False)
+
+    def failed_recently(self, key):
+        """Whether fetching a key failed less than its set_failed ttl ago"""
+        with self._lock:
+            return self._failures.get(key, 0) > time.monotonic()
+
+    def reload(self, key):
+        """Pick up a newer copy of an entry from a shared backend right away"""
+        self._sync(key, force=True)
+
+    def acquire_lease(self, key, ttl):
+        """
+        Take the right to fetch a key, so other workers wait for its result
+
+        Args:
+            key (tuple): Key from make_key()
+            ttl (float): Seconds until the lease lapses if never released
+
+        Returns:
+            bool: Whether this process may fetch (always True without a shared backend)
+        """
+        if self.backend is None:
+            return True
+        return self.backend.acquire(key, self.holder, ttl)
+
+    def release_lease(self, key):
+        """Give up a lease taken with acquire_lease"""
+        if self.backend is not None:
+            self.backend.release(key, self.holder)
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self._failures.clear()
+            self._synced.clear()
+
+        if self.backend is not None:
+            self.backend.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _put(self, key, stored_at, value):
+        """Store an entry in memory (caller holds the lock)"""
+        self._entries[key] = (stored_at, value)
+        self._entries.move_to_end(key)
+        self._writes += 1
+        self._versions[key] = self._writes
+        self._written.notify_all()
+
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._versions.pop(evicted, None)
+            self._synced.pop(evicted, None)
+
+    def _sync(self, key, force=False):
+        """Adopt a newer copy of an entry that another worker stored in the shared backend"""
+        if self.backend is None or not self.backend.shared:
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._synced.get(key, float('-inf')) < self.sync_interval:
+                return
+            # Keys missing from the backend are never evicted with an entry,
+            # so drop the least recently checked beyond max_entries
+            self._synced[key] = now
+            self._synced.move_to_end(key)
+            while len(self._synced) > self.max_entries:
+                self._synced.popitem(last=False)
+
+        entry = self.backend.get(key)
+        if entry is None:
+            return
+
+        stored_at, value = entry
+        with self._lock:
+            local = self._entries.get(key)
+            if local is None or local[0] < stored_at:
+                self._put(key, stored_at, value)
+
+    def _load(self):
+        """Warm the cache from the backend"""
+        try:
+            for key, stored_at, value in self.backend.load(self.max_entries):
+                self._put(key, stored_at, value)
+        except Exception as e:
+            print(f"Could not load cache: {e}")
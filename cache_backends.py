@@ -0,0 +1,493 @@
+import os
+import json
+import time
+import stat
+import socket
+import sqlite3
+import threading
+import socketserver
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; file writes are then only atomic, not serialized
+    fcntl = None
+
+
+# Default locations, next to this file rather than the working directory
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_FILE_PATH = os.path.join(BASE_DIR, 'dashboard_cache.json')
+DEFAULT_SQLITE_PATH = os.path.join(BASE_DIR, 'dashboard_cache.sqlite3')
+DEFAULT_SOCKET_PATH = '/tmp/dashboard-cache.sock'
+
+
+def encode_key(key):
+    """Cache key tuple as a string"""
+    return json.dumps(list(key), separators=(',', ':'))
+
+
+def decode_key(text):
+    """Inverse of encode_key (the symbols element is a tuple again)"""
+    key = json.loads(text)
+    if len(key) > 3 and key[3] is not None:
+        key[3] = tuple(key[3])
+    return tuple(key)
+
+
+class CacheBackend:
+    """
+    Storage behind a DashboardCache
+
+    DashboardCache keeps recently used entries in memory and writes every
+    entry through to its backend. A shared backend is visible to every
+    worker process on the host, so an entry one worker fetches serves all
+    of them, and its leases let only one worker fetch a given key at a time.
+    """
+
+    # Whether other processes see this backend's writes
+    shared = False
+
+    def load(self, limit):
+        """Most recently stored entries, oldest first, as (key, stored_at, value)"""
+        return []
+
+    def get(self, key):
+        """(stored_at, value) of an entry, or None"""
+        return None
+
+    def set(self, key, stored_at, value):
+        """Store an entry"""
+
+    def clear(self):
+        """Remove every entry"""
+
+    def acquire(self, key, holder, ttl):
+        """
+        Take the fetch lease for a key
+
+        Args:
+            key (tuple): Cache key
+            holder (str): Id of the process asking
+            ttl (float): Seconds until the lease expires if never released
+
+        Returns:
+            bool: Whether the caller holds the lease (always True for
+                unshared backends)
+        """
+        return True
+
+    def release(self, key, holder):
+        """Give up a lease the holder took"""
+
+    def close(self):
+        """Release connections and files"""
+
+
+class FileBackend(CacheBackend):
+    """
+    Entries in one JSON file, rewritten atomically on each write
+
+    Writers take an exclusive lock on a side file, merge in entries other
+    processes wrote since and replace the file with a complete temporary
+    copy, so readers never see a partial write and no write is lost.
+
+    Every set rewrites the whole file, so this is meant for a single
+    worker; with several, use SQLiteBackend or SocketBackend.
+    """
+
+    def __init__(self, path=DEFAULT_FILE_PATH, max_entries=256):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def load(self, limit):
+        entries = self._read()
+        entries.sort(key=lambda entry: entry['stored_at'])
+        return [(decode_key(encode_key(entry['key'])), entry['stored_at'], entry['value']) for entry in entries[-limit:]]
+
+    def get(self, key):
+        wanted = encode_key(key)
+        for entry in self._read():
+            if encode_key(entry['key']) == wanted:
+                return entry['stored_at'], entry['value']
+        return None
+
+    def set(self, key, stored_at, value):
+        self._update(lambda entries: entries.__setitem__(encode_key(key), {'key': list(key), 'stored_at': stored_at, 'value': value}))
+
+    def clear(self):
+        self._update(lambda entries: entries.clear())
+
+    def _read(self):
+        """Entries in the file (empty if it is missing or unreadable)"""
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r') as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"Could not load cache: {e}")
+        return []
+
+    def _update(self, change):
+        """Apply change to the file's entries (keyed by encoded key) under the write lock"""
+        with self._lock, open(f"{self.path}.lock", 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                entries = {encode_key(entry['key']): entry for entry in self._read()}
+                change(entries)
+
+                newest = sorted(entries.values(), key=lambda entry: entry['stored_at'])[-self.max_entries:]
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w') as f:
+                    json.dump(newest, f, separators=(',', ':'))
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                print(f"Could not save cache: {e}")
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    Entries and leases in a SQLite database in WAL mode
+
+    Every worker on the host opens the same file; each thread gets its own
+    connection. Writes are single-row upserts, so they are atomic and never
+    rewrite other entries.
+    """
+
+    shared = True
+
+    def __init__(self, path=DEFAULT_SQLITE_PATH, max_age=86400):
+        """
+        Args:
+            path (str): Database file
+            max_age (float): Entries older than this many seconds are pruned
+        """
+        self.path = path
+        self.max_age = max_age
+        self._local = threading.local()
+
+        connection = self._connection()
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, stored_at REAL, value TEXT)')
+        connection.execute('CREATE TABLE IF NOT EXISTS leases (key TEXT PRIMARY KEY, holder TEXT, expires REAL)')
+        connection.commit()
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5)
+            self._local.connection = connection
+        return connection
+
+    def load(self, limit):
+        rows = self._connection().execute(
+            'SELECT key, stored_at, value FROM entries ORDER BY stored_at DESC LIMIT ?', (limit,)
+        ).fetchall()
+        return [(decode_key(key), stored_at, json.loads(value)) for key, stored_at, value in reversed(rows)]
+
+    def get(self, key):
+        row = self._connection().execute('SELECT stored_at, value FROM entries WHERE key = ?', (encode_key(key),)).fetchone()
+        return (row[0], json.loads(row[1])) if row else None
+
+    def set(self, key, stored_at, value):
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                'INSERT INTO entries (key, stored_at, value) VALUES (?, ?, ?) '
+                'ON CONFLICT(key) DO UPDATE SET stored_at = excluded.stored_at, value = excluded.value '
+                'WHERE excluded.stored_at >= entries.stored_at',
+                (encode_key(key), stored_at, json.dumps(value, separators=(',', ':')))
+            )
+            connection.execute('DELETE FROM entries WHERE stored_at < ?', (time.time() - self.max_age,))
+
+    def clear(self):
+        connection = self._connection()
+        with connection:
+            connection.execute('DELETE FROM entries')
+
+    def acquire(self, key, holder, ttl):
+        now = time.time()
+        connection = self._connection()
+        with connection:
+            cursor = connection.execute(
+                'INSERT INTO leases (key, holder, expires) VALUES (?, ?, ?) '
+                'ON CONFLICT(key) DO UPDATE SET holder = excluded.holder, expires = excluded.expires '
+                'WHERE leases.expires < ? OR leases.holder = excluded.holder',
+                (encode_key(key), holder, now + ttl, now)
+            )
+            return cursor.rowcount == 1
+
+    def release(self, key, holder):
+        connection = self._connection()
+        with connection:
+            connection.execute('DELETE FROM leases WHERE key = ? AND holder = ?', (encode_key(key), holder))
+
+    def close(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+class SocketBackend(CacheBackend):
+    """
+    Client of a CacheServer on a Unix socket
+
+    The server holds entries and leases in memory, so every worker reads
+    and writes one warm cache without touching the disk. If the server is
+    unreachable, reads miss and leases are granted, so workers carry on
+    with their own in-memory caches; while it is down, it is only tried
+    again after a back-off and the outage is reported once.
+    """
+
+    shared = True
+
+    def __init__(self, path=DEFAULT_SOCKET_PATH, timeout=2, retry_after=1, max_retry_after=60):
+        """
+        Args:
+            path (str): Socket of the CacheServer
+            timeout (float): Seconds to wait for a response
+            retry_after (float): Seconds before trying again after the server
+                couldn't be reached, doubling while it stays down
+            max_retry_after (float): Cap for that back-off
+        """
+        self.path = path
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self.max_retry_after = max_retry_after
+        self._local = threading.local()
+
+        self._lock = threading.Lock()
+        self._down_since = None
+        self._backoff = 0
+        self._retry_at = 0.0
+
+    def load(self, limit):
+        response = self._call({'op': 'load', 'limit': limit})
+        return [(decode_key(key), stored_at, value) for key, stored_at, value in (response or {}).get('entries', [])]
+
+    def get(self, key):
+        response = self._call({'op': 'get', 'key': encode_key(key)})
+        entry = (response or {}).get('entry')
+        return tuple(entry) if entry else None
+
+    def set(self, key, stored_at, value):
+        self._call({'op': 'set', 'key': encode_key(key), 'stored_at': stored_at, 'value': value})
+
+    def clear(self):
+        self._call({'op': 'clear'})
+
+    def acquire(self, key, holder, ttl):
+        response = self._call({'op': 'acquire', 'key': encode_key(key), 'holder': holder, 'ttl': ttl})
+        return True if response is None else response['ok']
+
+    def release(self, key, holder):
+        self._call({'op': 'release', 'key': encode_key(key), 'holder': holder})
+
+    def close(self):
+        stream = getattr(self._local, 'stream', None)
+        if stream is not None:
+            stream.close()
+            self._local.stream = None
+
+    def _call(self, request):
+        """Send one request and read its response (None if the server can't be reached)"""
+        if self._down_since is not None and time.monotonic() < self._retry_at:
+            return None
+
+        for attempt in range(2):
+            try:
+                stream = getattr(self._local, 'stream', None)
+                if stream is None:
+                    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                    sock.settimeout(self.timeout)
+                    sock.connect(self.path)
+                    stream = sock.makefile('rwb')
+                    self._local.stream = stream
+
+                stream.write(json.dumps(request, separators=(',', ':')).encode() + b'\n')
+                stream.flush()
+                line = stream.readline()
+                if not line:
+                    raise ConnectionError("Cache server closed the connection")
+                response = json.loads(line)
+                self._reachable()
+                return response
+
+            except (OSError, ValueError) as e:
+                # Reconnect once (the server may have restarted), then give up
+                self.close()
+                if attempt:
+                    self._unreachable(e)
+        return None
+
+    def _unreachable(self, error):
+        """Back off after a failed call, reporting the start of an outage"""
+        now = time.monotonic()
+        with self._lock:
+            started = self._down_since is None
+            if started:
+                self._down_since = now
+                self._backoff = self.retry_after
+            else:
+                self._backoff = min(self._backoff * 2, self.max_retry_after)
+            self._retry_at = now + self._backoff
+
+        if started:
+            print(f"Cache server unavailable: {error} - using this worker's in-memory cache until it is back")
+
+    def _reachable(self):
+        """Report the end of an outage"""
+        if self._down_since is None:
+            return
+
+        with self._lock:
+            down_since, self._down_since = self._down_since, None
+        if down_since is not None:
+            print(f"Cache server reachable again after {time.monotonic() - down_since:.0f}s")
+
+
+class CacheServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    In-memory cache shared by every worker on the host, over a Unix socket
+
+    Speaks newline-delimited JSON: one request object per line, one
+    response object per line. Run it with `python cache_backends.py [path]`.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path=DEFAULT_SOCKET_PATH, max_entries=1024):
+        """
+        Args:
+            path (str): Socket to listen on. A socket left behind by a server
+                that is gone is replaced; if a server still answers on it, or
+                something other than a socket is there, OSError is raised.
+            max_entries (int): Entries kept before the oldest is dropped
+        """
+        _remove_stale_socket(path)
+
+        self.max_entries = max_entries
+        self.entries = {}
+        self.leases = {}
+        self.lock = threading.Lock()
+        super().__init__(path, _CacheRequestHandler)
+
+    def handle_request_object(self, request):
+        """Response object for one request object"""
+        op = request.get('op')
+        key = request.get('key')
+
+        with self.lock:
+            if op == 'get':
+                return {'entry': self.entries.get(key)}
+
+            if op == 'set':
+                current = self.entries.get(key)
+                if current is None or current[0] <= request['stored_at']:
+                    self.entries[key] = [request['stored_at'], request['value']]
+                if len(self.entries) > self.max_entries:
+                    oldest = min(self.entries, key=lambda k: self.entries[k][0])
+                    del self.entries[oldest]
+                return {'ok': True}
+
+            if op == 'load':
+                newest = sorted(self.entries.items(), key=lambda item: item[1][0])[-request.get('limit', 256):]
+                return {'entries': [[k, stored_at, value] for k, (stored_at, value) in newest]}
+
+            if op == 'acquire':
+                now = time.time()
+                lease = self.leases.get(key)
+                if lease is None or lease[1] < now or lease[0] == request['holder']:
+                    self.leases[key] = (request['holder'], now + request['ttl'])
+                    return {'ok': True}
+                return {'ok': False}
+
+            if op == 'release':
+                if self.leases.get(key, (None,))[0] == request['holder']:
+                    del self.leases[key]
+                return {'ok': True}
+
+            if op == 'clear':
+                self.entries.clear()
+                return {'ok': True}
+
+        return {'error': f"Unknown op '{op}'"}
+
+
+def _remove_stale_socket(path):
+    """Unlink a socket no server listens on any more, refusing to touch anything else"""
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+
+    if not stat.S_ISSOCK(mode):
+        raise OSError(f"{path} exists and is not a socket")
+
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        # Nobody listening: left behind by a server that exited
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+
+    raise OSError(f"A cache server is already listening on {path}")
+
+
+class _CacheRequestHandler(socketserver.StreamRequestHandler):
+    """Serves one worker connection until it closes"""
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                response = self.server.handle_request_object(json.loads(line))
+            except Exception as e:
+                response = {'error': str(e)}
+            self.wfile.write(json.dumps(response, separators=(',', ':')).encode() + b'\n')
+            self.wfile.flush()
+
+
+def get_cache_backend(kind=None, max_entries=256):
+    """
+    Cache backend selected by CACHE_BACKEND
+
+    Args:
+        kind (str): 'file' (default, CACHE_PATH or dashboard_cache.json),
+            'sqlite' (CACHE_PATH or dashboard_cache.sqlite3), 'socket'
+            (CACHE_SOCKET, a running CacheServer) or 'memory' (none)
+        max_entries (int): Entries the file backend keeps
+
+    Returns:
+        CacheBackend: The backend, or None for 'memory'
+    """
+    kind = (kind or os.getenv('CACHE_BACKEND', 'file')).lower()
+
+    if kind == 'memory':
+        return None
+    if kind == 'sqlite':
+        return SQLiteBackend(os.getenv('CACHE_PATH', DEFAULT_SQLITE_PATH))
+    if kind == 'socket':
+        return SocketBackend(os.getenv('CACHE_SOCKET', DEFAULT_SOCKET_PATH))
+    if kind == 'file':
+        return FileBackend(os.getenv('CACHE_PATH', DEFAULT_FILE_PATH), max_entries)
+
+    raise ValueError(f"Unknown CACHE_BACKEND '{kind}' (expected file, sqlite, socket or memory)")
+
+
+if __name__ == '__main__':
+    import sys
+
+    path = sys.argv[1] if len(sys.argv) > 1 else os.getenv('CACHE_SOCKET', DEFAULT_SOCKET_PATH)
+    try:
+        server = CacheServer(path)
+    except OSError as e:
+        sys.exit(f"Could not start the cache server: {e}")
+    print(f"Dashboard cache server listening on {path}")
+    server.serve_forever()
@@ -0,0 +1,116 @@
+import gzip
+import json
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+
+try:
+    import brotli
+except ImportError:  # Optional: gzip is always available
+    brotli = None
+
+
+# An encoded response: the JSON body, its compressed forms (None if
+# unavailable) and the strong ETag of the body
+Payload = namedtuple('Payload', ['body', 'gzip', 'brotli', 'etag'])
+
+
+def encode_payload(data, compress_level=6):
+    """
+    Serialize data once into ready-to-send bytes
+
+    Keys are sorted and separators compact, matching jsonify, so equal
+    data always gives byte-identical bodies and the same ETag.
+    """
+    body = json.dumps(data, sort_keys=True, separators=(',', ':')).encode()
+    return Payload(
+        body=body,
+        gzip=gzip.compress(body, compresslevel=compress_level, mtime=0),
+        brotli=brotli.compress(body) if brotli is not None else None,
+        etag=hashlib.sha1(body).hexdigest()[:32]
+    )
+
+
+def choose_encoding(payload, accept_encoding):
+    """
+    Best representation of a payload for an Accept-Encoding header
+
+    Returns:
+        tuple: (bytes, Content-Encoding or None, ETag). Each encoding gets its
+            own strong ETag, since the bytes differ.
+    """
+    accepted = {part.split(';')[0].strip().lower() for part in (accept_encoding or '').split(',')}
+
+    if payload.brotli is not None and 'br' in accepted:
+        return payload.brotli, 'br', f'"{payload.etag}-br"'
+    if 'gzip' in accepted:
+        return payload.gzip, 'gzip', f'"{payload.etag}-gz"'
+    return payload.body, None, f'"{payload.etag}"'
+
+
+def etag_matches(payload, if_none_match):
+    """Whether an If-None-Match header names any representation of the payload"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+
+    tags = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+    return bool(tags & {f'"{payload.etag}"', f'"{payload.etag}-gz"', f'"{payload.etag}-br"'})
+
+
+class PayloadCache:
+    """
+    Encoded dashboard responses per (category, city)
+
+    Each entry remembers the fingerprint of the data it was built from
+    (which cache writes its sections came from). While the fingerprint is
+    unchanged the stored bytes are reused, so most requests skip JSON
+    encoding and compression entirely.
+    """
+
+    def __init__(self, max_entries=64, compress_level=6):
+        """
+        Args:
+            max_entries (int): Payloads kept before the least recently used is dropped
+            compress_level (int): gzip level used when a payload is built
+        """
+        self.max_entries = max_entries
+        self.compress_level = compress_level
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, fingerprint, build):
+        """
+        Payload for a key, rebuilt only when its fingerprint changed
+
+        Args:
+            key (tuple): Payload key, e.g. (category, city)
+            fingerprint (tuple): Identifies the data; None means it can't be
+                identified, so the payload is built and not stored
+            build (callable): Returns the data to encode
+
+        Returns:
+            Payload: The encoded response
+        """
+        if fingerprint is not None:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] == fingerprint:
+                    self._entries.move_to_end(key)
+                    return entry[1]
+
+        payload = encode_payload(build(), self.compress_level)
+
+        if fingerprint is not None:
+            with self._lock:
+                self._entries[key] = (fingerprint, payload)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        return payload
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,357 @@
+import time
+import heapq
+import itertools
+import threading
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from api_clients.providers import PROVIDER_LIMITS, TASK_PROVIDERS
+
+
+# News categories the dashboard offers
+CATEGORIES = ['technology', 'business', 'science', 'health', 'sports', 'entertainment', 'general']
+
+# Tasks whose data depends on the news category
+CATEGORY_TASKS = ('news', 'twitter', 'reddit')
+
+# Cache lease held by the one worker that runs the scheduler
+SCHEDULER_LEASE = ('scheduler', None, None, None)
+
+QUOTE_INTERVAL = 3600           # Quotes hourly
+MARKET_OPEN_INTERVAL = 60       # Stocks every minute while the market is open
+MARKET_CLOSED_INTERVAL = 3600   # ...and hourly otherwise
+
+
+def is_market_open(now=None):
+    """
+    Whether US stock markets are in regular trading hours (9:30-16:00 ET, Mon-Fri)
+
+    Args:
+        now (datetime): Time to check (defaults to now)
+
+    Returns:
+        bool: True during regular trading hours
+    """
+    try:
+        from zoneinfo import ZoneInfo
+        eastern = ZoneInfo('America/New_York')
+    except Exception:
+        # No tz database available; use standard time
+        eastern = timezone(timedelta(hours=-5))
+
+    now = (now or datetime.now(timezone.utc)).astimezone(eastern)
+    if now.weekday() >= 5:
+        return False
+
+    minutes = now.hour * 60 + now.minute
+    return 9 * 60 + 30 <= minutes < 16 * 60
+
+
+class RefreshScheduler:
+    """
+    Background scheduler that keeps every dashboard section warm in the cache
+
+    Rate limiters are per process, so only one process may run it. With a
+    shared cache backend (sqlite or socket) every worker can start one:
+    they compete for a lease and only the holder refreshes, the others
+    take over if it stops renewing. With an unshared backend (file or
+    memory) every worker holds the lease, so start it in one process only.
+    """
+
+    def __init__(self, dashboard, categories=None, cities=None, budget_share=0.8,
+                 refresh_ahead=0.9, demand_half_life=3600, max_workers=2, lease_ttl=60):
+        """
+        Args:
+            dashboard (Dashboard): Dashboard whose cache is kept warm
+            categories (list): News categories to pre-warm
+            cities (list): Cities to pre-warm weather for
+            budget_share (float): Share of each provider's quota the scheduler may
+                use; the rest is left for on-demand requests
+            refresh_ahead (float): Refresh once a section reaches this fraction of its interval
+            demand_half_life (int): Seconds for a category's request count to halve
+            max_workers (int): Refreshes run at the same time
+            lease_ttl (float): Seconds the scheduler lease lasts unless renewed; the
+                holder renews it every third of that
+        """
+        self.dashboard = dashboard
+        self.categories = list(categories or CATEGORIES)
+        self.cities = list(cities or dashboard.cities)
+        self.budget_share = budget_share
+        self.refresh_ahead = refresh_ahead
+        self.demand_half_life = demand_half_life
+        self.lease_ttl = lease_ttl
+
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='scheduler')
+
+        # Heap of (due_at, priority, seq, job); each job is (task, category, city)
+        self._queue = []
+        self._seq = itertools.count()
+        self._running = set()
+        self._last_runs = {}
+        self._demand = {}
+
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopped = False
+
+        self._leader = False
+        self._renewed = float('-inf')
+
+    def jobs(self):
+        """Every (task, category, city) the scheduler keeps warm"""
+        jobs = []
+        for city in self.cities:
+            jobs.append(('weather', None, city))
+        for task in CATEGORY_TASKS:
+            for category in self.categories:
+                jobs.append((task, category, None))
+        for task in ('quote', 'stocks'):
+            jobs.append((task, None, None))
+        return jobs
+
+    def start(self):
+        """Schedule every job now and start the scheduler thread"""
+        with self._cond:
+            if self._thread is not None:
+                return
+
+            now = time.monotonic()
+            for job in self.jobs():
+                self._push(now, job)
+
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name='refresh-scheduler', daemon=True)
+            self._thread.start()
+
+        print(f"Scheduler started with {len(self._queue)} jobs")
+
+    def stop(self):
+        """Stop the scheduler thread (refreshes already running finish)"""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+            thread = self._thread
+            self._thread = None
+
+        if thread is not None:
+            thread.join()
+
+        if self._leader:
+            self._leader = False
+            self.dashboard.cache.release_lease(SCHEDULER_LEASE)
+
+    def record_request(self, category, city=None):
+        """Count a dashboard request, so popular categories are refreshed more often"""
+        # Only known categories, so clients can't grow the demand table
+        if category not in self.categories:
+            return
+
+        now = time.monotonic()
+        with self._cond:
+            score, updated = self._demand.get(category, (0.0, now))
+            self._demand[category] = (self._decay(score, now - updated) + 1, now)
+
+    def demand_weights(self):
+        """
+        Share of demand per category
+
+        Every category keeps a floor of 25% spread evenly, so unrequested
+        categories stay reasonably warm too.
+
+        Returns:
+            dict: Category -> weight (weights sum to 1)
+        """
+        now = time.monotonic()
+        scores = {}
+        with self._cond:
+            for category in self.categories:
+                score, updated = self._demand.get(category, (0.0, now))
+                scores[category] = self._decay(score, now - updated)
+
+        total = sum(scores.values())
+        floor = 0.25 / len(self.categories)
+        if total == 0:
+            return {category: 1 / len(self.categories) for category in self.categories}
+
+        return {category: floor + 0.75 * score / total for category, score in scores.items()}
+
+    def interval_for(self, task, category=None):
+        """
+        Seconds between refreshes of a job
+
+        Quotes are hourly and stocks follow market hours. Everything else is
+        refreshed as often as its cache TTL needs, slowed down to fit the
+        scheduler's share of the provider's quota. Category jobs split that
+        share by demand.
+        """
+        if task == 'quote':
+            return QUOTE_INTERVAL
+        if task == 'stocks':
+            return MARKET_OPEN_INTERVAL if is_market_open() else MARKET_CLOSED_INTERVAL
+
+        provider, cost = TASK_PROVIDERS[task]
+        requests, seconds = PROVIDER_LIMITS[provider]
+        allowed_per_second = requests * self.budget_share / seconds
+
+        if task in CATEGORY_TASKS:
+            share = self.demand_weights().get(category, 1 / len(self.categories))
+        else:
+            share = 1 / len(self.cities)
+
+        budget_interval = cost / (allowed_per_second * share)
+        return max(self.dashboard.cache.ttl_for(task), budget_interval)
+
+    def priority_for(self, task, category=None):
+        """Lower runs first when several jobs are due; popular categories win"""
+        if task in CATEGORY_TASKS:
+            return -self.demand_weights().get(category, 0)
+        return -1
+
+    def status(self):
+        """Queue state for monitoring"""
+        from api_clients.rate_limiter import get_rate_limiter
+
+        now = time.monotonic()
+        with self._cond:
+            queue = sorted(self._queue)
+            running = sorted(self._running, key=str)
+            last_runs = dict(self._last_runs)
+            active = self._thread is not None
+
+        jobs = []
+        for due_at, priority, _, (task, category, city) in queue:
+            provider, _ = TASK_PROVIDERS[task]
+            jobs.append({
+                'task': task,
+                'category': category,
+                'city': city,
+                'due_in': round(max(0, due_at - now), 1),
+                'interval': round(self.interval_for(task, category)),
+                'priority': round(priority, 3),
+                'provider': provider
+            })
+
+        return {
+            'active': active,
+            'leader': self._leader,
+            'market_open': is_market_open(),
+            'queue': jobs,
+            'running': [{'task': task, 'category': category, 'city': city} for task, category, city in running],
+            'demand': {category: round(weight, 3) for category, weight in self.demand_weights().items()},
+            'rate_limits': {provider: get_rate_limiter(provider).status() for provider in sorted({p for p, _ in TASK_PROVIDERS.values()})},
+            'last_runs': [
+                {'task': task, 'category': category, 'city': city, **run}
+                for (task, category, city), run in last_runs.items()
+            ]
+        }
+
+    def _decay(self, score, elapsed):
+        """Exponentially decay a demand score"""
+        return score * 0.5 ** (elapsed / self.demand_half_life)
+
+    def _push(self, due_at, job):
+        """Queue a job (caller holds the lock)"""
+        task, category, _ = job
+        heapq.heappush(self._queue, (due_at, self.priority_for(task, category), next(self._seq), job))
+        self._cond.notify_all()
+
+    def _reschedule(self, job, delay):
+        """Queue a job again after delay seconds"""
+        with self._cond:
+            if not self._stopped:
+                self._push(time.monotonic() + delay, job)
+
+    def _hold_lease(self):
+        """Take or renew the scheduler lease; whether this process may refresh"""
+        now = time.monotonic()
+        if self._leader and now - self._renewed < self.lease_ttl / 3:
+            return True
+
+        try:
+            leader = self.dashboard.cache.acquire_lease(SCHEDULER_LEASE, self.lease_ttl)
+        except Exception as e:
+            print(f"Could not take scheduler lease: {str(e)}")
+            leader = False
+
+        if leader and not self._leader:
+            print("Scheduler lease taken; this process refreshes the cache")
+        self._leader = leader
+        if leader:
+            self._renewed = now
+        return leader
+
+    def _run(self):
+        """Scheduler thread: dispatch jobs as they come due, while holding the lease"""
+        renew_every = self.lease_ttl / 3
+        while True:
+            leader = self._hold_lease()
+            with self._cond:
+                if self._stopped:
+                    return
+
+                # Another worker runs the scheduler; check again later
+                if not leader or not self._queue:
+                    self._cond.wait(renew_every)
+                    continue
+
+                now = time.monotonic()
+                wait = self._queue[0][0] - now
+                if wait > 0:
+                    self._cond.wait(min(wait, renew_every))
+                    continue
+
+                due = []
+                while self._queue and self._queue[0][0] <= now:
+                    due.append(heapq.heappop(self._queue))
+
+            # Most wanted first when several jobs are due at once
+            due.sort(key=lambda entry: (entry[1], entry[0]))
+            for _, _, _, job in due:
+                self._dispatch(job)
+
+    def _dispatch(self, job):
+        """Refresh a due job if its section is getting old and the provider has quota"""
+        task, category, city = job
+        interval = self.interval_for(task, category)
+        refresh_at = interval * self.refresh_ahead
+
+        # Skip jobs whose section an on-demand request refreshed recently
+        key = self.dashboard.cache_key(task, category or 'technology', city or self.dashboard.default_city)
+        _, age = self.dashboard.cache.peek(key)
+        if age is not None and age < refresh_at:
+            self._reschedule(job, refresh_at - age)
+            return
+
+        # Leave (1 - budget_share) of the provider's bucket for on-demand
+        # requests; the transport takes the tokens when the refresh calls out
+        from api_clients.rate_limiter import get_rate_limiter
+
+        provider, cost = TASK_PROVIDERS[task]
+        limiter = get_rate_limiter(provider)
+        needed = cost + limiter.capacity * (1 - self.budget_share)
+        available = limiter.available()
+        if available < needed:
+            self._reschedule(job, (needed - available) / limiter.rate)
+            return
+
+        with self._cond:
+            self._running.add(job)
+
+        def refresh():
+            started = time.monotonic()
+            result = 'ok'
+            try:
+                self.dashboard.refresh_task(task, category or 'technology', city)
+            except Exception as e:
+                result = f"error: {e}"
+                print(f"Scheduled refresh of {task} failed: {str(e)}")
+            finally:
+                with self._cond:
+                    self._running.discard(job)
+                    self._last_runs[job] = {
+                        'finished_at': datetime.now().isoformat(),
+                        'duration': round(time.monotonic() - started, 2),
+                        'result': result
+                    }
+                self._reschedule(job, refresh_at)
+
+        self.executor.submit(refresh)
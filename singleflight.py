@@ -0,0 +1,94 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into one call"""
+
+    def __init__(self):
+        self._calls = {}
+        self._async_calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        """
+        Call fn, unless a call with the same key is already running
+
+        Callers that arrive while a call is in flight wait for it and share
+        its result (or its exception) instead of starting their own.
+
+        Args:
+            key: Hashable key identifying the call
+            fn (callable): Zero-argument function to run
+
+        Returns:
+            The result of fn
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._calls[key] = future
+
+        if not owner:
+            return future.result()
+
+        try:
+            result = fn()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    async def do_async(self, key, coro_fn):
+        """
+        Async version of do
+
+        Each caller can be cancelled on its own without affecting the others.
+        Once every caller waiting on a call has been cancelled, nobody wants
+        its result anymore, so the call itself is cancelled too (and with it
+        the upstream request).
+
+        Args:
+            key: Hashable key identifying the call
+            coro_fn (callable): Zero-argument coroutine function to run
+
+        Returns:
+            The result of coro_fn
+        """
+        # Tasks belong to one event loop, so coalesce per loop
+        call_key = (asyncio.get_running_loop(), key)
+        call = self._async_calls.get(call_key)
+        if call is None:
+            call = {'task': asyncio.ensure_future(coro_fn()), 'waiters': 0}
+            self._async_calls[call_key] = call
+            call['task'].add_done_callback(lambda _: self._forget_async(call_key, call))
+
+        task = call['task']
+        call['waiters'] += 1
+        try:
+            # Shield so one cancelled caller doesn't cancel the call for the others
+            return await asyncio.shield(task)
+        finally:
+            call['waiters'] -= 1
+            if call['waiters'] == 0 and not task.done():
+                # The last caller was cancelled; later callers start a fresh call
+                self._forget_async(call_key, call)
+                task.cancel()
+
+    def _forget_async(self, call_key, call):
+        """Stop coalescing onto an async call, unless a newer call has replaced it"""
+        if self._async_calls.get(call_key) is call:
+            del self._async_calls[call_key]
+
+    def in_flight(self):
+        """Keys of the calls currently running"""
+        with self._lock:
+            keys = list(self._calls)
+        return keys + [key for _, key in list(self._async_calls)]
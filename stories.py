@@ -0,0 +1,301 @@
+import re
+import math
+import zlib
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+
+
+# Words that say nothing about which story an item is about
+STOPWORDS = frozenset('''
+    a an and are as at be been by for from has have in into is it its of on or over says shows that the this
+    to was were will with new breaking just now after amid latest report reports update via rt amp
+'''.split())
+
+# Prime just above 2^32 for the hash family h(x) = (a * x + b) mod p; with
+# 32-bit x and a < 2^31, a * x + b never overflows uint64
+_PRIME = 4294967311
+
+
+def tokens(text):
+    """Lowercased content words of a text, with URLs, mentions and plural/verb 's' stripped"""
+    text = re.sub(r'https?://\S+|[@#]\w+', ' ', (text or '').lower())
+    words = re.findall(r"[a-z0-9$%.]+", text)
+    result = []
+    for word in words:
+        word = word.strip('.')
+        if len(word) < 2 or word in STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+            word = word[:-1]
+        result.append(word)
+    return result
+
+
+def shingles(text, size=4):
+    """
+    Character shingles of a text's content words
+
+    Character n-grams of each word (padded with spaces) match across
+    inflections and word order ("achieves ... correction" vs. "achieve
+    ... correction"), which word shingles of short headlines don't.
+    """
+    result = set()
+    for word in tokens(text):
+        padded = f" {word} "
+        if len(padded) <= size:
+            result.add(padded)
+        else:
+            result.update(padded[i:i + size] for i in range(len(padded) - size + 1))
+    return result
+
+
+class MinHasher:
+    """MinHash signatures: the fraction of equal positions estimates Jaccard similarity"""
+
+    def __init__(self, num_perm=64, seed=1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self._a = rng.integers(1, 1 << 31, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingle_set):
+        """Signature of a set of shingles (all-max for an empty set)"""
+        if not shingle_set:
+            return np.full(self.num_perm, np.iinfo(np.uint64).max, dtype=np.uint64)
+
+        hashes = np.fromiter((zlib.crc32(s.encode()) for s in shingle_set), dtype=np.uint64, count=len(shingle_set))
+        permuted = (hashes[:, None] * self._a[None, :] + self._b[None, :]) % np.uint64(_PRIME)
+        return permuted.min(axis=0)
+
+    @staticmethod
+    def similarity(sig_a, sig_b):
+        """Estimated Jaccard similarity of two signatures"""
+        return float(np.count_nonzero(sig_a == sig_b)) / len(sig_a)
+
+
+def normalize_item(source, item):
+    """
+    Common fields of a news article, Reddit post or tweet
+
+    Returns:
+        dict: 'source', 'id', 'text', 'url' and 'engagement' (raw interaction
+            count: Reddit score + comments, tweet likes + 2 x retweets + replies,
+            0 for news), or None if the item has no text
+    """
+    if source == 'news':
+        text = item.get('title') or ''
+        url = item.get('url') or ''
+        engagement = 0
+    elif source == 'reddit':
+        text = item.get('title') or ''
+        url = item.get('url') or ''
+        engagement = (item.get('score') or 0) + (item.get('num_comments') or 0)
+    elif source == 'twitter':
+        text = item.get('text') or ''
+        url = ''
+        engagement = (item.get('likes') or 0) + 2 * (item.get('retweets') or 0) + (item.get('replies') or 0)
+    else:
+        raise ValueError(f"Unknown source '{source}'")
+
+    if not text.strip():
+        return None
+
+    identity = f"{source}:{url or text}"
+    return {
+        'source': source,
+        'id': hashlib.sha1(identity.encode()).hexdigest()[:16],
+        'text': text,
+        'url': url,
+        'engagement': engagement
+    }
+
+
+class StoryIndex:
+    """
+    Incremental clustering of news, Reddit and Twitter items into stories
+
+    Each item gets a MinHash signature of its character shingles, which is
+    split into bands; items sharing any band bucket are candidates, and
+    candidates whose estimated similarity reaches `threshold` join the same
+    story. Adding an item only touches its own buckets, so indexing n items
+    is near-linear instead of comparing every pair. Items already indexed
+    (by source and URL or text) are skipped, and the least recently seen
+    items are dropped past `max_items`.
+    """
+
+    def __init__(self, num_perm=64, bands=16, threshold=0.35, max_items=5000):
+        """
+        Args:
+            num_perm (int): MinHash signature length
+            bands (int): LSH bands (num_perm must be divisible by it); more
+                bands find less similar candidates
+            threshold (float): Estimated Jaccard similarity for two items to be one story
+            max_items (int): Items kept before the least recently seen are dropped
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.max_items = max_items
+
+        self._items = OrderedDict()     # item id -> (normalized item, original item, signature or None)
+        self._buckets = {}              # (band, band hash) -> item ids
+        self._story_of = {}             # item id -> story id
+        self._stories = {}              # story id -> item ids
+        self._next_story = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def add(self, source, items):
+        """
+        Index items from one source
+
+        Args:
+            source (str): 'news', 'reddit' or 'twitter'
+            items (list): Items as returned by that source's client
+
+        Returns:
+            int: Number of items that were new to the index
+        """
+        new = 0
+        with self._lock:
+            for item in items or []:
+                normalized = normalize_item(source, item)
+                if normalized is None:
+                    continue
+
+                item_id = normalized['id']
+                if item_id in self._items:
+                    # Refresh engagement and recency, keep the signature
+                    _, _, signature = self._items[item_id]
+                    self._items[item_id] = (normalized, item, signature)
+                    self._items.move_to_end(item_id)
+                    continue
+
+                # Text with no shingles (only stopwords, mentions, links...)
+                # would get the all-max signature and match every other such
+                # item, so it becomes a story of its own
+                shingle_set = shingles(normalized['text'])
+                signature = self.hasher.signature(shingle_set) if shingle_set else None
+                self._items[item_id] = (normalized, item, signature)
+                if signature is None:
+                    self._new_story(item_id)
+                else:
+                    self._cluster(item_id, signature)
+                new += 1
+
+            while len(self._items) > self.max_items:
+                self._evict(next(iter(self._items)))
+
+        return new
+
+    def stories(self, limit=None, sources=None):
+        """
+        Stories ranked by cross-source engagement
+
+        A story's score is the sum, over the sources covering it, of
+        1 + log(1 + the source's best engagement), so a story seen in all
+        three sources beats a viral post seen in one.
+
+        Args:
+            limit (int): Return only the top `limit` stories
+            sources (set): Only count items from these sources (None for all)
+
+        Returns:
+            list: Dicts with 'id', 'title', 'sources', 'engagement', 'score'
+                and 'items' ({'source', 'item'} dicts, most engaging first)
+        """
+        with self._lock:
+            stories = []
+            for story_id, member_ids in self._stories.items():
+                members = [self._items[item_id] for item_id in member_ids]
+                if sources is not None:
+                    members = [member for member in members if member[0]['source'] in sources]
+                if not members:
+                    continue
+
+                best = {}
+                for normalized, _, _ in members:
+                    best[normalized['source']] = max(best.get(normalized['source'], 0), normalized['engagement'])
+
+                members.sort(key=lambda member: member[0]['engagement'], reverse=True)
+                # Headlines make the best titles; fall back to the most engaging item
+                headline = next((member for member in members if member[0]['source'] == 'news'), members[0])
+
+                stories.append({
+                    'id': story_id,
+                    'title': headline[0]['text'],
+                    'sources': sorted(best),
+                    'engagement': sum(member[0]['engagement'] for member in members),
+                    'score': round(sum(1 + math.log1p(value) for value in best.values()), 3),
+                    'items': [{'source': normalized['source'], 'item': item} for normalized, item, _ in members]
+                })
+
+        stories.sort(key=lambda story: (story['score'], story['engagement']), reverse=True)
+        return stories[:limit] if limit else stories
+
+    def status(self):
+        """Index size, for monitoring"""
+        with self._lock:
+            return {'items': len(self._items), 'stories': len(self._stories), 'buckets': len(self._buckets)}
+
+    def _band_keys(self, signature):
+        """LSH bucket keys of a signature"""
+        return [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes()) for band in range(self.bands)]
+
+    def _cluster(self, item_id, signature):
+        """Put a new item into the story of its similar items, merging stories it bridges (caller holds the lock)"""
+        candidates = set()
+        for key in self._band_keys(signature):
+            bucket = self._buckets.setdefault(key, set())
+            candidates.update(bucket)
+            bucket.add(item_id)
+
+        matched = {
+            self._story_of[other] for other in candidates
+            if self.hasher.similarity(signature, self._items[other][2]) >= self.threshold
+        }
+
+        if not matched:
+            self._new_story(item_id)
+            return
+
+        # Keep the largest story and move the others' members into it
+        story_id = max(matched, key=lambda story: len(self._stories[story]))
+        for other in matched - {story_id}:
+            for member in self._stories.pop(other):
+                self._story_of[member] = story_id
+                self._stories[story_id].add(member)
+
+        self._stories[story_id].add(item_id)
+        self._story_of[item_id] = story_id
+
+    def _new_story(self, item_id):
+        """Start a story holding just one item (caller holds the lock)"""
+        story_id = f"s{self._next_story}"
+        self._next_story += 1
+        self._stories[story_id] = {item_id}
+        self._story_of[item_id] = story_id
+
+    def _evict(self, item_id):
+        """Drop an item from its buckets and story (caller holds the lock)"""
+        _, _, signature = self._items.pop(item_id)
+        for key in self._band_keys(signature) if signature is not None else []:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(item_id)
+                if not bucket:
+                    del self._buckets[key]
+
+        story_id = self._story_of.pop(item_id)
+        members = self._stories[story_id]
+        members.discard(item_id)
+        if not members:
+            del self._stories[story_id]
@@ -0,0 +1,42 @@
+from datetime import datetime, timezone
+
+from api_clients.http_cache import seconds_until_market_close, seconds_until_prev_bar_changes
+
+HOUR = 3600
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+# March 2024: US clocks go forward on Sunday the 10th, so ET is UTC-5
+# before it and UTC-4 after it
+
+def test_market_close_just_after_the_close():
+    # Monday 16:05 ET -> Tuesday 16:00 ET
+    assert seconds_until_market_close(utc(2024, 3, 4, 21, 5)) == 23 * HOUR + 55 * 60
+
+
+def test_market_close_on_friday_evening():
+    # Friday 20:00 ET -> Monday 16:00 ET, one hour shorter across the DST change
+    assert seconds_until_market_close(utc(2024, 3, 9, 1, 0)) == 67 * HOUR
+
+
+def test_prev_bar_not_fresh_just_after_the_close():
+    # Monday 16:05 ET: /prev may still be the previous session's bar
+    assert seconds_until_prev_bar_changes(utc(2024, 3, 4, 21, 5)) == 0
+
+
+def test_prev_bar_fresh_until_the_next_open():
+    # Monday 16:45 ET -> Tuesday 9:30 ET
+    assert seconds_until_prev_bar_changes(utc(2024, 3, 4, 21, 45)) == 16 * HOUR + 45 * 60
+
+
+def test_prev_bar_on_friday_evening():
+    # Friday 20:00 ET -> Monday 9:30 ET, across the DST change
+    assert seconds_until_prev_bar_changes(utc(2024, 3, 9, 1, 0)) == 60 * HOUR + 30 * 60
+
+
+def test_prev_bar_during_the_session():
+    # Tuesday 10:00 ET -> Tuesday 16:30 ET, once the day's bar is out
+    assert seconds_until_prev_bar_changes(utc(2024, 3, 5, 15, 0)) == 6 * HOUR + 30 * 60
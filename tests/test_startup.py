@@ -0,0 +1,15 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_dashboard_starts_without_heavy_libraries():
+    # A fresh interpreter, since other tests may already have imported them
+    code = (
+        "import sys, app; app.Dashboard(); "
+        "print(sorted(m for m in ('requests', 'praw', 'numpy', 'aiohttp') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip().splitlines()[-1] == '[]'
@@ -0,0 +1,27 @@
+from stories import StoryIndex, shingles
+
+
+def test_items_without_shingles_stay_separate():
+    index = StoryIndex()
+    tweets = [
+        {'text': '@alice @bob #breaking https://t.co/abc', 'likes': 5},
+        {'text': 'and the of it', 'likes': 3}
+    ]
+    assert all(not shingles(tweet['text']) for tweet in tweets)
+
+    assert index.add('twitter', tweets) == 2
+
+    stories = index.stories()
+    assert len(stories) == 2
+    assert all(len(story['items']) == 1 for story in stories)
+    assert index.status()['buckets'] == 0
+
+
+def test_similar_headlines_still_cluster():
+    index = StoryIndex()
+    index.add('news', [{'title': 'Central bank raises interest rates again', 'url': 'https://a.example/1'}])
+    index.add('reddit', [{'title': 'Central bank raises interest rates again!', 'url': 'https://b.example/2', 'score': 10}])
+
+    stories = index.stories()
+    assert len(stories) == 1
+    assert stories[0]['sources'] == ['news', 'reddit']
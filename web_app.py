@@ -1,31 +1,326 @@
-from flask import Flask, render_template, jsonify, request
+import time
+
+# Taken before the other imports, so the startup report includes them
+STARTED = time.perf_counter()
+
+import os
+import json
+import threading
+from flask import Flask, Response, abort, make_response, render_template, jsonify, request, stream_with_context
 from app import Dashboard
+from scheduler import RefreshScheduler
+from payloads import choose_encoding, etag_matches
 
 app = Flask(__name__)
+
+# Cheap to build: API clients and their libraries load on first use
 dashboard = Dashboard()
 
+# Keep every category warm in the background so requests are served from cache.
+# Opt-in: see RefreshScheduler for running it with several workers
+scheduler = RefreshScheduler(dashboard)
+if os.getenv('SCHEDULER_ENABLED', 'false').lower() == 'true':
+    scheduler.start()
+
+startup_seconds = time.perf_counter() - STARTED
+print(f"Web app ready in {startup_seconds * 1000:.0f}ms (dashboard {dashboard.startup_times['dashboard'] * 1000:.0f}ms)")
+
+def requested_city():
+    """City from the ?city= argument (None for the default), or a 400 if it isn't served"""
+    city = request.args.get('city')
+    if not city:
+        return None
+
+    resolved = dashboard.resolve_city(city)
+    if resolved is None:
+        abort(make_response(jsonify({'error': f"Unknown city '{city}'", 'cities': dashboard.cities}), 400))
+    return resolved
+
 @app.route('/')
 def index():
     """Main dashboard page"""
-    return render_template('dashboard.html')
+    return render_template('dashboard.html', cities=dashboard.cities, push_updates=PUSH_UPDATES)
+
+def send_payload(payload):
+    """
+    Response for a pre-encoded payload
+
+    Sends the precompressed body the client accepts, or 304 Not Modified if
+    its If-None-Match names the current payload.
+    """
+    body, encoding, etag = choose_encoding(payload, request.headers.get('Accept-Encoding'))
+    headers = {
+        'ETag': etag,
+        'Vary': 'Accept-Encoding',
+        # Clients may keep the body but must revalidate it every time
+        'Cache-Control': 'no-cache'
+    }
+
+    if etag_matches(payload, request.headers.get('If-None-Match')):
+        return Response(status=304, headers=headers)
+
+    if encoding:
+        headers['Content-Encoding'] = encoding
+    return Response(body, mimetype='application/json', headers=headers)
+
+# Longest a ?since= request may wait for a change
+MAX_LONG_POLL = 60
+
+# Long-polls and /api/updates streams each hold a worker thread while they
+# wait, so the page only uses them when PUSH_UPDATES_ENABLED is set (which
+# needs threaded or async workers) and their number is capped
+PUSH_UPDATES = os.getenv('PUSH_UPDATES_ENABLED', 'false').lower() == 'true'
+push_streams = threading.BoundedSemaphore(int(os.getenv('PUSH_UPDATES_MAX_STREAMS', 16)))
+long_polls = threading.BoundedSemaphore(int(os.getenv('PUSH_UPDATES_MAX_POLLS', 16)))
+
+# Seconds a client is told to wait before asking again when no long-poll slot is free
+POLL_RETRY = 60
 
 @app.route('/api/data')
 def get_data():
-    """API endpoint to get dashboard data"""
+    """
+    API endpoint to get dashboard data
+
+    With ?since=<version> only the sections changed since that version are
+    returned (see Dashboard.get_changes); add &wait=<seconds> to long-poll
+    until something changes. Beyond PUSH_UPDATES_MAX_POLLS waiting requests
+    per worker, answers right away with a Retry-After header.
+    """
     category = request.args.get('category', 'technology')
-    data = dashboard.fetch_all_data(use_cache=True, news_category=category)
-    return jsonify(data)
+    city = requested_city()
+    scheduler.record_request(category, city)
+
+    since = request.args.get('since')
+    if since is not None:
+        wait = min(max(request.args.get('wait', 0, type=float), 0), MAX_LONG_POLL)
+        if wait <= 0:
+            return jsonify(dashboard.get_changes(since, category, city))
+
+        if not long_polls.acquire(blocking=False):
+            response = jsonify(dashboard.get_changes(since, category, city))
+            response.headers['Retry-After'] = str(POLL_RETRY)
+            return response
+        try:
+            return jsonify(dashboard.get_changes(since, category, city, wait=wait))
+        finally:
+            long_polls.release()
+
+    # Expired sections are returned immediately and refreshed in the background;
+    # the encoded body is reused until a section changes
+    return send_payload(dashboard.get_payload(category, city))
+
+@app.route('/api/stream')
+def stream_data():
+    """
+    Stream dashboard sections as each becomes available
+
+    Sends newline-delimited JSON objects ({"key": ..., "value": ...}) by
+    default, or server-sent events with ?format=sse or Accept: text/event-stream.
+    """
+    category = request.args.get('category', 'technology')
+    city = requested_city()
+    scheduler.record_request(category, city)
+
+    sse = request.args.get('format') == 'sse' or 'text/event-stream' in request.headers.get('Accept', '')
+
+    def generate():
+        data = {}
+        for key, value in dashboard.iter_dashboard_data(use_cache=True, news_category=category, city=city, serve_stale=True):
+            data[key] = value
+            line = json.dumps({'key': key, 'value': value})
+            yield f"data: {line}\n\n" if sse else line + '\n'
+
+        # Lets the client ask for just the changes later on
+        line = json.dumps({'key': 'version', 'value': dashboard.version_of(data, category, city)})
+        yield f"data: {line}\n\n" if sse else line + '\n'
+        yield 'event: done\ndata: {}\n\n' if sse else json.dumps({'key': 'done', 'value': True}) + '\n'
+
+    mimetype = 'text/event-stream' if sse else 'application/x-ndjson'
+    # Ask proxies not to buffer, so each section reaches the browser right away
+    headers = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    return Response(stream_with_context(generate()), mimetype=mimetype, headers=headers)
+
+@app.route('/api/updates')
+def push_updates():
+    """
+    Server-sent events with the dashboard's changes as they happen
+
+    Each event is a change set from Dashboard.get_changes, sent as soon as a
+    section changes (e.g. when the scheduler refreshes it). Query args:
+    category, city and since (the version the client already has; omit it
+    to get everything first). Comments are sent every 25 seconds to keep
+    the connection open. Beyond PUSH_UPDATES_MAX_STREAMS open streams per
+    worker, answers 503 and clients should long-poll /api/data?since= instead.
+    """
+    category = request.args.get('category', 'technology')
+    city = requested_city()
+    since = request.args.get('since')
+
+    if not push_streams.acquire(blocking=False):
+        response = jsonify({'error': 'Too many update streams, long-poll /api/data?since= instead'})
+        response.status_code = 503
+        response.headers['Retry-After'] = '60'
+        return response
+
+    def generate():
+        version = since
+        while True:
+            scheduler.record_request(category, city)
+            writes = dashboard.cache.writes
+            changes = dashboard.get_changes(version, category, city, wait=25)
+            if changes['sections'] or changes['full']:
+                yield f"data: {json.dumps(changes)}\n\n"
+            else:
+                yield ': keep-alive\n\n'
+
+            if changes['sections'] and changes['version'] == version:
+                # Sections that can't be identified show up as changed every
+                # time; wait for the next write instead of resending them
+                dashboard.cache.wait_for_write(writes, 25)
+            version = changes['version']
+
+    headers = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream', headers=headers)
+    # Also runs if the client leaves before the stream starts
+    response.call_on_close(push_streams.release)
+    return response
+
+@app.route('/api/data/<section>')
+def get_section(section):
+    """API endpoint to get one dashboard section"""
+    if section not in dashboard.SECTION_TASKS:
+        return jsonify({'error': f"Unknown section '{section}'"}), 404
+
+    category = request.args.get('category', 'technology')
+    data, stale = dashboard.fetch_section(section, news_category=category, city=requested_city(), serve_stale=True)
+    return jsonify({'section': section, 'data': data, 'stale': stale})
+
+@app.route('/api/stories')
+def get_stories():
+    """
+    News, Reddit posts and tweets of a category deduplicated into stories
+
+    Query args: category and limit (default 20)
+    """
+    category = request.args.get('category', 'technology')
+    stories, stale = dashboard.get_stories(category, request.args.get('limit', 20, type=int))
+    return jsonify({'category': category, 'stale': stale, 'stories': stories})
+
+@app.route('/api/stocks/<symbol>/history')
+def stock_history(symbol):
+    """
+    Locally recorded price history of a symbol (no upstream calls)
+
+    Query args: hours (default 24) and interval, the bucket width in
+    seconds (default 900; 0 returns every stored quote).
+    """
+    hours = request.args.get('hours', 24, type=float)
+    interval = request.args.get('interval', 900, type=float)
+    points = dashboard.stocks.get_price_history(symbol.upper(), start=time.time() - hours * 3600, interval=interval)
+    return jsonify({'symbol': symbol.upper(), 'interval': interval, 'points': points})
+
+@app.route('/api/weather')
+def multi_city_weather():
+    """
+    Weather for several cities at once
+
+    Query args: cities, a comma-separated list (defaults to every configured city)
+    """
+    names = [name for name in request.args.get('cities', '').split(',') if name.strip()]
+    cities = [dashboard.resolve_city(name) for name in names]
+    unknown = [name for name, city in zip(names, cities) if city is None]
+    if unknown:
+        return jsonify({'error': f"Unknown cities: {', '.join(unknown)}", 'cities': dashboard.cities}), 400
+
+    return jsonify(dashboard.fetch_weather_for_cities(cities or None))
+
+@app.route('/api/watchlists')
+def list_watchlists():
+    """Configured watchlists and their symbols"""
+    return jsonify(dashboard.watchlists)
+
+@app.route('/api/watchlists/<name>')
+def watchlist_quotes(name):
+    """
+    Quotes for one watchlist
+
+    Every watchlist is part of the dashboard's shared fetch plan, so this is
+    usually served from quotes fetched moments ago.
+    """
+    if name not in dashboard.watchlists:
+        return jsonify({'error': f"Unknown watchlist '{name}'"}), 404
+
+    symbols = dashboard.watchlists[name]
+    quotes = dashboard.stocks.get_watchlist_quotes({name: symbols})[name]
+    return jsonify({'name': name, 'quotes': [{'symbol': symbol, **quotes[symbol]} for symbol in symbols if symbol in quotes]})
+
+@app.route('/api/stocks/ranking')
+def stock_ranking():
+    """
+    Rank the stocks or ETFs section by a metric
+
+    Query args: section (stocks or etfs), by (see stock_analytics.METRICS),
+    order (desc or asc) and limit.
+    """
+    from api_clients import stock_analytics
+
+    section = request.args.get('section', 'stocks')
+    by = request.args.get('by', 'change_percent')
+    if section not in ('stocks', 'etfs'):
+        return jsonify({'error': f"Unknown section '{section}'"}), 404
+    if by not in stock_analytics.METRICS:
+        return jsonify({'error': f"Unknown metric '{by}'"}), 400
+
+    quotes, stale = dashboard.fetch_section(section, serve_stale=True)
+    quotes = quotes or {}
+    metrics = dashboard.stocks.get_metrics(quotes)
+    ranked = stock_analytics.rank(quotes, by, request.args.get('order', 'desc') != 'asc', metrics, request.args.get('limit', type=int))
+
+    return jsonify({
+        'section': section,
+        'by': by,
+        'stale': stale,
+        # A list, since JSON object key order isn't preserved
+        'ranking': [{'symbol': symbol, **quote, 'metrics': metrics[symbol]} for symbol, quote in ranked.items()],
+        'movers': stock_analytics.top_movers(quotes, metrics=metrics)
+    })
 
 @app.route('/api/refresh')
 def refresh_data():
     """Force refresh data"""
     category = request.args.get('category', 'technology')
-    data = dashboard.fetch_all_data(use_cache=False, news_category=category)
+    city = requested_city()
+    data = dashboard.fetch_all_data(use_cache=False, news_category=category, city=city)
+    data['version'] = dashboard.version_of(data, category, city)
     return jsonify(data)
 
+@app.route('/api/scheduler')
+def scheduler_status():
+    """Background refresh queue state"""
+    return jsonify(scheduler.status())
+
+@app.route('/api/circuits')
+def circuits_status():
+    """Circuit breaker state per upstream provider"""
+    from api_clients.circuit_breaker import circuit_breaker_status
+
+    return jsonify(circuit_breaker_status())
+
+@app.route('/api/http-cache')
+def http_cache_status():
+    """Upstream HTTP response cache size and hit counts"""
+    from api_clients.http_cache import get_default_http_cache
+
+    cache = get_default_http_cache()
+    return jsonify(cache.status() if cache is not None else {'enabled': False})
+
+@app.route('/api/startup')
+def startup_status():
+    """How long this worker took to start and which clients have been loaded"""
+    return jsonify({'ready_seconds': startup_seconds, **dashboard.startup_report()})
+
 if __name__ == '__main__':
     # For local development only
     # In production, use a WSGI server like Gunicorn or uWSGI
-    import os
     debug_mode = os.getenv('FLASK_DEBUG', 'False').lower() == 'true'
     app.run(debug=debug_mode, port=7000)